@@ -3,11 +3,15 @@
 from fastapi import APIRouter
 from .health import router as health_router
 from .tryon import router as tryon_router
+from .garments import router as garments_router
 from .api_keys import router as api_keys_router
+from .metrics import router as metrics_router
+from .results import router as results_router
 
 api_router = APIRouter()
 
 # Include all routers
 api_router.include_router(health_router)
 api_router.include_router(tryon_router)
+api_router.include_router(garments_router)
 api_router.include_router(api_keys_router)
@@ -1,55 +1,97 @@
 """API key management endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional
 
-from ..models import APIKeyCreate, APIKeyResponse
+from ..models import APIKeyCreate, APIKeyCreated, APIKeyUpdate, APIKeyResponse
 from ..models.database import APIKey
-from ..services import get_db
-from ..utils import generate_api_key
+from ..services import api_key_index, get_db, rate_limiter
+from ..core.config import settings
+from ..utils import generate_api_key, keyset_page, next_cursor, set_next_page
+from .deps import require_admin_key
 
-router = APIRouter(prefix="/api-keys", tags=["API Keys"])
+router = APIRouter(
+    prefix="/api-keys",
+    tags=["API Keys"],
+    dependencies=[Depends(require_admin_key)]
+)
 
 
-@router.post("/", response_model=APIKeyResponse)
+@router.post("/", response_model=APIKeyCreated)
 async def create_api_key(
     api_key_data: APIKeyCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new API key for integration."""
+    """
+    Create a new API key for integration.
+    
+    The key is only returned here; store it, it cannot be retrieved later.
+    """
     key = generate_api_key()
     
     db_api_key = APIKey(
         key=key,
         name=api_key_data.name,
-        is_active=True
+        is_active=True,
+        rate_limit_per_minute=api_key_data.rate_limit_per_minute,
+        rate_limit_burst=api_key_data.rate_limit_burst,
+        weight=api_key_data.weight
     )
     
     db.add(db_api_key)
     await db.commit()
     await db.refresh(db_api_key)
+    api_key_index.add(db_api_key)
     
-    return APIKeyResponse.model_validate(db_api_key)
+    return APIKeyCreated.model_validate(db_api_key)
 
 
 @router.get("/", response_model=List[APIKeyResponse])
 async def list_api_keys(
-    skip: int = 0,
-    limit: int = 10,
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor"),
+    limit: int = Query(10, ge=1, le=settings.LIST_MAX_LIMIT),
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all API keys."""
-    result = await db.execute(
-        select(APIKey)
-        .order_by(APIKey.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
+    """List all API keys, newest first, paged by cursor."""
+    if after and skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with after")
+    try:
+        statement = keyset_page(select(APIKey), APIKey, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    result = await db.execute(statement.offset(skip))
     api_keys = result.scalars().all()
+    set_next_page(request, response, next_cursor(api_keys, limit))
+    
+    return [APIKeyResponse.model_validate(key) for key in api_keys[:limit]]
+
+
+@router.patch("/{key_id}", response_model=APIKeyResponse)
+async def update_api_key(
+    key_id: int,
+    quota: APIKeyUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Change an API key's rate limit or fair-share weight."""
+    api_key = await db.get(APIKey, key_id)
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    
+    for field, value in quota.model_dump(exclude_unset=True).items():
+        setattr(api_key, field, value)
+    await db.commit()
+    await db.refresh(api_key)
+    if api_key.is_active:
+        api_key_index.add(api_key)
+        rate_limiter.reset(api_key.id)
     
-    return [APIKeyResponse.model_validate(key) for key in api_keys]
+    return APIKeyResponse.model_validate(api_key)
 
 
 @router.delete("/{key_id}")
@@ -68,5 +110,6 @@ async def delete_api_key(
     
     api_key.is_active = False
     await db.commit()
+    api_key_index.remove(api_key.key)
     
     return {"message": "API key deactivated successfully"}
@@ -0,0 +1,80 @@
+"""Shared API dependencies."""
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException, Query
+
+from ..core.config import settings
+from ..services import api_key_index
+from ..services.api_key_index import APIKeyInfo
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    scheme, _, credentials = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return credentials.strip()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+async def require_api_key(
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+    api_key: Optional[str] = Query(None, include_in_schema=False)
+) -> Optional[APIKeyInfo]:
+    """
+    Authenticate the caller by API key when `API_KEY_AUTH_ENABLED` is set.
+    
+    The key is read from `X-API-Key`, `Authorization: Bearer <key>` or, for
+    EventSource and WebSocket clients that cannot set headers, the
+    `api_key` query parameter.
+    
+    Returns:
+        The authenticated key, or None when authentication is disabled
+    """
+    if not settings.API_KEY_AUTH_ENABLED:
+        return None
+    
+    key = x_api_key or api_key or _bearer_token(authorization)
+    
+    if not api_key_index.loaded:
+        await api_key_index.load()
+    info = api_key_index.authenticate(key)
+    if info is None:
+        raise _unauthorized("Invalid or missing API key")
+    return info
+
+
+async def require_admin_key(
+    x_admin_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Guard API key management when `API_KEY_AUTH_ENABLED` is set.
+    
+    The caller must present `ADMIN_API_KEY` in `X-Admin-Key` or
+    `Authorization: Bearer <key>`. Client API keys are not accepted, and
+    without an `ADMIN_API_KEY` key management is closed entirely.
+    """
+    if not settings.API_KEY_AUTH_ENABLED:
+        return
+    
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=403,
+            detail="API key management is disabled; set ADMIN_API_KEY"
+        )
+    
+    key = x_admin_key or _bearer_token(authorization)
+    if key is None or not hmac.compare_digest(key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise _unauthorized("Invalid or missing admin key")
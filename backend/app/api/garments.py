@@ -0,0 +1,207 @@
+"""Garment catalog endpoints."""
+
+import asyncio
+import os
+from datetime import datetime
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+
+from ..models import GarmentResponse
+from ..models.database import Garment
+from ..services import get_db, inference_executor, garment_cache
+from ..services.inference_executor import run_preprocess_garments
+from ..utils import ImageProcessor, UploadTooLargeError, UnsupportedImageError, stage_upload
+from ..core.config import settings
+from .deps import require_api_key
+
+router = APIRouter(
+    prefix="/garments",
+    tags=["Garments"],
+    dependencies=[Depends(require_api_key)]
+)
+
+image_processor = ImageProcessor()
+
+
+async def preprocess_garments_background(garment_ids: List[int]):
+    """Background task to preprocess newly registered garments in bulk."""
+    from ..services.database_service import db_service
+    
+    async for session in db_service.get_session():
+        result = await session.execute(
+            select(Garment).where(Garment.id.in_(garment_ids))
+        )
+        garments = result.scalars().all()
+        
+        # A few garments per pool job amortizes the dispatch cost, while
+        # small chunks keep a large import from holding a worker and let
+        # try-on requests in between chunks
+        chunk_size = max(1, settings.GARMENT_PREPROCESS_CHUNK_SIZE)
+        for start in range(0, len(garments), chunk_size):
+            chunk = garments[start:start + chunk_size]
+            inference_executor.reserve(force=True)
+            try:
+                errors = await inference_executor.run(
+                    run_preprocess_garments,
+                    [garment.content_hash for garment in chunk],
+                    reserved=True
+                )
+            except Exception as e:
+                errors = [str(e)] * len(chunk)
+            
+            for garment, error in zip(chunk, errors):
+                garment.status = "failed" if error else "ready"
+                garment.error_message = error
+                garment.preprocessed_at = datetime.utcnow()
+            await session.commit()
+
+
+async def _register_garment(
+    image: UploadFile,
+    name: Optional[str],
+    sku: Optional[str],
+    db: AsyncSession
+) -> Garment:
+    """Validate, store and record one garment upload."""
+    if image.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid image type: {image.filename}")
+    
+    try:
+        staged = await stage_upload(
+            image,
+            settings.MAX_UPLOAD_SIZE,
+            os.path.join(settings.UPLOAD_DIR, "tmp")
+        )
+    except UploadTooLargeError:
+        raise HTTPException(status_code=400, detail=f"Image too large: {image.filename}")
+    except UnsupportedImageError:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {image.filename}")
+    
+    try:
+        garment_hash = staged.content_hash
+        image_path = garment_cache.image_path(garment_hash)
+        if not os.path.exists(image_path):
+            await asyncio.to_thread(
+                image_processor.normalize_image_file, staged.path, image_path
+            )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {image.filename}")
+    finally:
+        staged.discard()
+    
+    garment = Garment(
+        name=name or image.filename or garment_hash[:12],
+        sku=sku,
+        content_hash=garment_hash,
+        image_path=image_path,
+        status="pending"
+    )
+    db.add(garment)
+    return garment
+
+
+@router.post("/", response_model=GarmentResponse)
+async def create_garment(
+    background_tasks: BackgroundTasks,
+    image: UploadFile = File(..., description="Image of the garment"),
+    name: Optional[str] = Form(default=None, description="Display name"),
+    sku: Optional[str] = Form(default=None, description="Shop SKU"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Register a garment in the catalog.
+    
+    The garment is preprocessed in the background; once it is `ready`,
+    try-on requests can reference it by `garment_id` instead of uploading it.
+    """
+    garment = await _register_garment(image, name, sku, db)
+    await db.commit()
+    await db.refresh(garment)
+    
+    background_tasks.add_task(preprocess_garments_background, [garment.id])
+    
+    return GarmentResponse.model_validate(garment)
+
+
+@router.post("/bulk", response_model=List[GarmentResponse])
+async def create_garments_bulk(
+    background_tasks: BackgroundTasks,
+    images: List[UploadFile] = File(..., description="Garment images"),
+    names: List[str] = Form(default=[], description="Display names, in upload order"),
+    skus: List[str] = Form(default=[], description="Shop SKUs, in upload order"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Register several garments at once.
+    
+    They are preprocessed in chunks of `GARMENT_PREPROCESS_CHUNK_SIZE`,
+    each chunk as one pool job.
+    """
+    garments = []
+    for index, image in enumerate(images):
+        name = names[index] if index < len(names) else None
+        sku = skus[index] if index < len(skus) else None
+        garments.append(await _register_garment(image, name, sku, db))
+    
+    await db.commit()
+    for garment in garments:
+        await db.refresh(garment)
+    
+    background_tasks.add_task(
+        preprocess_garments_background,
+        [garment.id for garment in garments]
+    )
+    
+    return [GarmentResponse.model_validate(garment) for garment in garments]
+
+
+@router.get("/{garment_id}", response_model=GarmentResponse)
+async def get_garment(
+    garment_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a catalog garment."""
+    garment = await db.get(Garment, garment_id)
+    
+    if not garment:
+        raise HTTPException(status_code=404, detail="Garment not found")
+    
+    return GarmentResponse.model_validate(garment)
+
+
+@router.get("/", response_model=List[GarmentResponse])
+async def list_garments(
+    skip: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_db)
+):
+    """List active catalog garments."""
+    result = await db.execute(
+        select(Garment)
+        .where(Garment.is_active.is_(True))
+        .order_by(Garment.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    garments = result.scalars().all()
+    
+    return [GarmentResponse.model_validate(garment) for garment in garments]
+
+
+@router.delete("/{garment_id}")
+async def delete_garment(
+    garment_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove a garment from the catalog."""
+    garment = await db.get(Garment, garment_id)
+    
+    if not garment:
+        raise HTTPException(status_code=404, detail="Garment not found")
+    
+    garment.is_active = False
+    await db.commit()
+    
+    return {"message": "Garment removed successfully"}
@@ -2,8 +2,22 @@
 
 from fastapi import APIRouter
 
-from ..models.schemas import HealthResponse
+from ..models.schemas import HealthResponse, ModelStatus
 from ..core.config import settings
+from ..services import (
+    api_key_index,
+    db_service,
+    inference_executor,
+    batch_scheduler,
+    garment_cache,
+    person_cache,
+    rate_limiter,
+    result_cache,
+    result_delivery,
+    status_broker,
+    status_cache,
+    status_writer,
+)
 
 router = APIRouter(tags=["Health"])
 
@@ -14,10 +28,31 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         version=settings.VERSION,
-        supported_poses=settings.SUPPORTED_POSES
+        supported_poses=settings.SUPPORTED_POSES,
+        model=ModelStatus(**inference_executor.model_stats())
     )
 
 
+@router.get("/health/inference")
+async def inference_stats():
+    """Inference pool, micro-batching and cache metrics."""
+    return {
+        "executor": inference_executor.stats(),
+        "model": inference_executor.model_stats(),
+        "batching": batch_scheduler.stats(),
+        "garment_cache": garment_cache.stats(),
+        "person_cache": person_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "result_delivery": result_delivery.stats(),
+        "status_stream": status_broker.stats(),
+        "status_writer": status_writer.stats(),
+        "status_cache": status_cache.stats(),
+        "database": db_service.stats(),
+        "api_keys": api_key_index.stats(),
+        "rate_limits": rate_limiter.stats()
+    }
+
+
 @router.get("/")
 async def root():
     """Root endpoint with API information."""
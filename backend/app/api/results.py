@@ -0,0 +1,37 @@
+"""Delivery of try-on result images."""
+
+import os
+import re
+
+from fastapi import APIRouter, HTTPException, Request
+
+from ..core.config import settings
+from ..services import result_delivery
+from ..utils import RENDITION_FORMATS
+
+router = APIRouter(tags=["Virtual Try-On"])
+
+# result_<token>.jpg and its renditions such as result_<token>.thumb.webp
+_RESULT_NAME = re.compile(r"^result_[0-9a-f]{32}(?:\.[A-Za-z0-9_-]+)?\.(jpg|webp)$")
+
+_MEDIA_TYPES = {extension: media_type for _, extension, media_type in RENDITION_FORMATS.values()}
+
+
+@router.api_route("/uploads/results/{filename}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_result_file(filename: str, request: Request):
+    """
+    Serve a result image by its `result_image_url`.
+    
+    Result files are immutable, so they are cached by browsers and CDNs
+    for a year and revalidations are answered with 304 from the name alone.
+    Only results are served; uploaded person and garment photos are not.
+    """
+    match = _RESULT_NAME.match(filename)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    
+    path = os.path.join(settings.UPLOAD_DIR, "results", filename)
+    response = await result_delivery.respond(request, path, _MEDIA_TYPES[match.group(1)])
+    if response is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return response
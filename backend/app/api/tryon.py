@@ -1,177 +1,855 @@
 """API endpoints for virtual try-on system."""
 
+import asyncio
+import math
 import os
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    Query,
+    HTTPException,
+    Depends,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
 from ..models import (
     TryOnRequestSchema,
     TryOnResponse,
     TryOnRequestDetail,
     PoseType,
+    TryOnPriority,
     TryOnStatus,
+    TryOnStatusEvent,
+    TryOnBatchItem,
+    TryOnBatchResponse,
+)
+from ..models.database import TryOnRequest as TryOnRequestDB, TryOnBatch, Garment
+from ..services import (
+    get_db,
+    db_service,
+    inference_executor,
+    QueueFullError,
+    rate_limiter,
+    tryon_worker,
+    garment_cache,
+    result_cache,
+    result_delivery,
+    status_broker,
+    status_cache,
+)
+from ..services.api_key_index import APIKeyInfo
+from ..services.result_delivery import etag_matches
+from ..services.status_broker import TERMINAL_STATUSES, status_event
+from ..utils import (
+    ImageProcessor,
+    StagedUpload,
+    UploadTooLargeError,
+    UnsupportedImageError,
+    stage_upload,
+    result_image_url,
+    RENDITION_FORMATS,
+    ensure_rendition,
+    rendition_path,
+    rendition_sizes,
+    keyset_page,
+    next_cursor,
+    set_next_page,
 )
-from ..models.database import TryOnRequest as TryOnRequestDB
-from ..services import get_db, VirtualTryOnService
-from ..utils import ImageProcessor, generate_filename
 from ..core.config import settings
+from ..core.metrics import REQUESTS_TOTAL, STAGE_SECONDS
+from .deps import require_api_key
 
-router = APIRouter(prefix="/tryon", tags=["Virtual Try-On"])
+router = APIRouter(
+    prefix="/tryon",
+    tags=["Virtual Try-On"],
+    dependencies=[Depends(require_api_key)]
+)
 
-tryon_service = VirtualTryOnService()
 image_processor = ImageProcessor()
 
 
-async def process_tryon_background(
-    request_id: int,
-    person_image_path: str,
-    garment_image_path: str,
-    pose: str,
-    output_path: str
-):
-    """Background task to process virtual try-on."""
-    from ..services.database_service import db_service
-    
-    # Create a new database session for the background task
-    async for session in db_service.get_session():
-        try:
-            # Update status to processing
-            result = await session.execute(
-                select(TryOnRequestDB).where(TryOnRequestDB.id == request_id)
+async def _stage_image(upload: UploadFile, label: str) -> StagedUpload:
+    """Stream an upload to a staging file, mapping failures to HTTP 400."""
+    try:
+        with STAGE_SECONDS.time(stage="upload_read"):
+            return await stage_upload(
+                upload,
+                settings.MAX_UPLOAD_SIZE,
+                os.path.join(settings.UPLOAD_DIR, "tmp")
             )
-            request_obj = result.scalar_one_or_none()
+    except UploadTooLargeError:
+        raise HTTPException(status_code=400, detail=f"{label} image too large")
+    except UnsupportedImageError:
+        raise HTTPException(status_code=400, detail=f"Invalid {label.lower()} image")
+
+
+async def _store_image(staged: StagedUpload, save_path: str, label: str):
+    """Decode and normalize a staged upload into its content-addressed path."""
+    try:
+        await asyncio.to_thread(
+            image_processor.normalize_image_file, staged.path, save_path
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {label.lower()} image")
+
+
+def _person_path(person_hash: str) -> str:
+    """Content-addressed storage path of a person photo."""
+    return os.path.join(settings.UPLOAD_DIR, "persons", f"person_{person_hash}.jpg")
+
+
+async def _catalog_garment(db: AsyncSession, garment_id: int) -> Garment:
+    """
+    Look up a usable catalog garment.
+    
+    A garment that is still `pending` can be used: its normalized image is
+    stored at registration, and the worker preprocesses it like an upload
+    if the background job has not finished yet.
+    
+    Raises:
+        HTTPException: 404 for unknown or removed garments, 409 for
+            garments whose preprocessing failed
+    """
+    garment = await db.get(Garment, garment_id)
+    if garment is None or not garment.is_active:
+        raise HTTPException(status_code=404, detail="Garment not found")
+    if garment.status == "failed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Garment {garment_id} failed preprocessing: {garment.error_message}"
+        )
+    return garment
+
+
+def _reserve_slots(count: int, pose: PoseType):
+    """Admit `count` jobs to the inference queue, all or none, or raise 429."""
+    reserved = 0
+    try:
+        for _ in range(count):
+            inference_executor.reserve()
+            reserved += 1
+    except QueueFullError as e:
+        for _ in range(reserved):
+            inference_executor.release()
+        REQUESTS_TOTAL.inc(status="rejected", pose=pose.value)
+        raise HTTPException(
+            status_code=429,
+            detail="Try-on queue is full, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+def _check_rate_limit(api_key: Optional[APIKeyInfo], cost: int, pose: PoseType):
+    """Charge `cost` try-ons to the caller's quota, or raise 429."""
+    if api_key is None:
+        return
+    retry_after = rate_limiter.acquire(api_key.id, api_key.rate_limit, api_key.burst, cost)
+    if retry_after == math.inf:
+        REQUESTS_TOTAL.inc(status="rate_limited", pose=pose.value)
+        raise HTTPException(
+            status_code=429,
+            detail=f"{cost} try-ons exceed this API key's burst of {api_key.burst}"
+        )
+    if retry_after:
+        REQUESTS_TOTAL.inc(status="rate_limited", pose=pose.value)
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded for this API key",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+def _refund_rate_limit(api_key: Optional[APIKeyInfo], cost: int):
+    """Give back quota charged for a request that was then rejected."""
+    if api_key is not None:
+        rate_limiter.refund(api_key.id, api_key.burst, cost)
+
+
+async def _submit_tryon(
+    person_image: UploadFile,
+    garment_image: Optional[UploadFile],
+    garment_id: Optional[int],
+    pose: PoseType,
+    db: AsyncSession,
+    api_key: Optional[APIKeyInfo] = None,
+    priority: TryOnPriority = TryOnPriority.STANDARD
+) -> Tuple[TryOnRequestDB, Optional[str]]:
+    """
+    Validate and store the inputs, record the request and schedule it.
+    
+    Returns:
+        Tuple of (request row, path of a reusable cached result or None)
+    """
+    run_locally = settings.JOB_QUEUE_MODE == "local"
+    
+    if (garment_image is None) == (garment_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of garment_image or garment_id"
+        )
+    
+    # Validate image types
+    if person_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid person image type")
+    if garment_image is not None and garment_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid garment image type")
+    
+    _check_rate_limit(api_key, 1, pose)
+    
+    staged: List[StagedUpload] = []
+    try:
+        # Stream uploads to disk, enforcing the size limit as chunks arrive
+        person_upload = await _stage_image(person_image, "Person")
+        staged.append(person_upload)
+        
+        # Person photos are content-addressed, so a repeat upload is free
+        person_hash = person_upload.content_hash
+        person_path = _person_path(person_hash)
+        person_stored = os.path.exists(person_path)
+        
+        if garment_id is not None:
+            garment = await _catalog_garment(db, garment_id)
+            garment_upload = None
+            garment_hash = garment.content_hash
+            garment_path = garment.image_path
+            garment_stored = True
+        else:
+            garment_upload = await _stage_image(garment_image, "Garment")
+            staged.append(garment_upload)
             
-            if request_obj:
-                request_obj.status = "processing"
-                await session.commit()
+            # Garments are content-addressed; a known garment needs no further work
+            garment_hash = garment_upload.content_hash
+            garment_path = garment_cache.image_path(garment_hash)
+            garment_stored = os.path.exists(garment_path)
+        
+        # Identical inputs can reuse an existing result without scheduling a job
+        result_key = result_cache.make_key(person_hash, garment_hash, pose.value)
+        cached_result = None
+        if settings.RESULT_CACHE_ENABLED:
+            cached_result = await result_cache.get(result_key, db)
+        
+        # Apply backpressure before doing any more work
+        reserved = run_locally and cached_result is None
+        if reserved:
+            _reserve_slots(1, pose)
+        
+        try:
+            # Save uploaded images with a single decode-and-normalize pass
+            if not person_stored:
+                await _store_image(person_upload, person_path, "Person")
+            if not garment_stored:
+                await _store_image(garment_upload, garment_path, "Garment")
             
-            # Process the try-on
-            success, error_msg, proc_time = tryon_service.process_tryon(
-                person_image_path,
-                garment_image_path,
-                pose,
-                output_path
+            # Create database record
+            db_request = TryOnRequestDB(
+                user_image_path=person_path,
+                garment_image_path=garment_path,
+                garment_id=garment_id,
+                api_key_id=api_key.id if api_key else None,
+                result_key=result_key,
+                pose=pose.value,
+                priority=priority.value,
+                status="pending"
             )
+            if cached_result is not None:
+                db_request.status = "completed"
+                db_request.result_image_path = cached_result
+                db_request.processing_time = 0.0
             
-            # Update request with results
-            if request_obj:
-                request_obj.status = "completed" if success else "failed"
-                request_obj.result_image_path = output_path if success else None
-                request_obj.error_message = error_msg
-                request_obj.processing_time = proc_time
-                await session.commit()
-        finally:
-            await session.close()
+            db.add(db_request)
+            with STAGE_SECONDS.time(stage="db_commit"):
+                await db.commit()
+            await db.refresh(db_request)
+        except BaseException:
+            if reserved:
+                inference_executor.release()
+            raise
+    except BaseException:
+        # Rejected uploads and unusable garments do not use up the quota
+        _refund_rate_limit(api_key, 1)
+        raise
+    finally:
+        for upload in staged:
+            upload.discard()
+    
+    REQUESTS_TOTAL.inc(status=db_request.status, pose=pose.value)
+    
+    # Run the job in this process; in worker mode a worker will claim it
+    if cached_result is None and run_locally:
+        tryon_worker.dispatch(db_request.id, reserved=True)
+    
+    return db_request, cached_result
+
+
+def _accepted_response(db_request: TryOnRequestDB, cached_result: Optional[str]) -> TryOnResponse:
+    """Response for a newly created request."""
+    if cached_result is not None:
+        return TryOnResponse(
+            request_id=db_request.id,
+            status=TryOnStatus.COMPLETED,
+            result_image_url=result_image_url(cached_result),
+            message="Identical try-on already processed. Returning cached result.",
+            created_at=db_request.created_at,
+            processing_time=0.0
+        )
+    
+    return TryOnResponse(
+        request_id=db_request.id,
+        status=TryOnStatus.PENDING,
+        message="Try-on request created successfully. Processing in background.",
+        created_at=db_request.created_at
+    )
 
 
 @router.post("/", response_model=TryOnResponse)
 async def create_tryon_request(
-    background_tasks: BackgroundTasks,
     person_image: UploadFile = File(..., description="Image of the person"),
-    garment_image: UploadFile = File(..., description="Image of the garment"),
+    garment_image: Optional[UploadFile] = File(default=None, description="Image of the garment"),
+    garment_id: Optional[int] = Form(default=None, description="ID of a catalog garment"),
     pose: PoseType = Form(default=PoseType.FRONT, description="Pose type"),
-    db: AsyncSession = Depends(get_db)
+    priority: TryOnPriority = Form(
+        default=TryOnPriority.STANDARD,
+        description="Scheduling priority: interactive, standard or bulk"
+    ),
+    db: AsyncSession = Depends(get_db),
+    api_key: Optional[APIKeyInfo] = Depends(require_api_key)
 ):
     """
     Create a new virtual try-on request.
     
-    Upload a person image and a garment image, and receive a try-on result.
+    Upload a person image and either a garment image or the `garment_id` of
+    a registered catalog garment, and receive a try-on result.
     Processing happens in the background, use the request_id to check status.
+    The request is stored as a durable job, so it survives restarts.
+    Use `priority=interactive` when a shopper is waiting on the result and
+    `bulk` for pre-rendering that can wait.
     """
-    # Validate image types
-    if person_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
-        raise HTTPException(status_code=400, detail="Invalid person image type")
-    if garment_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
-        raise HTTPException(status_code=400, detail="Invalid garment image type")
+    db_request, cached_result = await _submit_tryon(
+        person_image, garment_image, garment_id, pose, db, api_key, priority
+    )
+    return _accepted_response(db_request, cached_result)
+
+
+async def _wait_for_terminal(
+    queue: asyncio.Queue,
+    request_id: int,
+    timeout: float
+) -> Optional[TryOnStatusEvent]:
+    """Wait up to `timeout` seconds for a request to complete or fail."""
+    event = status_broker.latest(request_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while event is None or event.status not in TERMINAL_STATUSES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        try:
+            event = await asyncio.wait_for(queue.get(), remaining)
+        except asyncio.TimeoutError:
+            return None
+    return event
+
+
+def _result_file_response(request_id: int, result_path: str, processing_time: Optional[float]):
+    """Return a result image directly as the response body."""
+    headers = {"X-Request-ID": str(request_id)}
+    if processing_time is not None:
+        headers["X-Processing-Time"] = f"{processing_time:.3f}"
+    return FileResponse(
+        result_path,
+        media_type=f"image/{settings.OUTPUT_IMAGE_FORMAT.lower()}",
+        headers=headers
+    )
+
+
+@router.post(
+    "/sync",
+    response_model=TryOnResponse,
+    responses={
+        200: {"content": {"image/jpeg": {}}, "description": "The try-on result image"},
+        202: {"model": TryOnResponse, "description": "Still running after the deadline"},
+    }
+)
+async def create_tryon_sync(
+    person_image: UploadFile = File(..., description="Image of the person"),
+    garment_image: Optional[UploadFile] = File(default=None, description="Image of the garment"),
+    garment_id: Optional[int] = Form(default=None, description="ID of a catalog garment"),
+    pose: PoseType = Form(default=PoseType.FRONT, description="Pose type"),
+    priority: TryOnPriority = Form(
+        default=TryOnPriority.STANDARD,
+        description="Scheduling priority: interactive, standard or bulk"
+    ),
+    timeout: Optional[float] = Form(
+        default=None,
+        gt=0,
+        description="Seconds to wait for the result, capped at SYNC_TRYON_TIMEOUT"
+    ),
+    db: AsyncSession = Depends(get_db),
+    api_key: Optional[APIKeyInfo] = Depends(require_api_key)
+):
+    """
+    Create a try-on request and wait for its result image.
     
-    # Read and validate images
-    person_bytes = await person_image.read()
-    garment_bytes = await garment_image.read()
-    
-    if len(person_bytes) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail="Person image too large")
-    if len(garment_bytes) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=400, detail="Garment image too large")
-    
-    if not image_processor.validate_image(person_bytes):
-        raise HTTPException(status_code=400, detail="Invalid person image")
-    if not image_processor.validate_image(garment_bytes):
-        raise HTTPException(status_code=400, detail="Invalid garment image")
-    
-    # Save uploaded images
-    person_filename = generate_filename("person", "jpg")
-    garment_filename = generate_filename("garment", "jpg")
-    result_filename = generate_filename("result", "jpg")
-    
-    person_path = os.path.join(settings.UPLOAD_DIR, "persons", person_filename)
-    garment_path = os.path.join(settings.UPLOAD_DIR, "garments", garment_filename)
-    result_path = os.path.join(settings.UPLOAD_DIR, "results", result_filename)
-    
-    image_processor.save_uploaded_image(person_bytes, person_path)
-    image_processor.save_uploaded_image(garment_bytes, garment_path)
-    
-    # Create database record
-    db_request = TryOnRequestDB(
-        user_image_path=person_path,
-        garment_image_path=garment_path,
-        pose=pose.value,
-        status="pending"
+    If the job finishes within the deadline, the response body is the
+    result image and `X-Request-ID` identifies the request. Otherwise a
+    `202` with the usual `TryOnResponse` is returned and the request keeps
+    processing; follow it with `GET /tryon/{request_id}` or `/events`.
+    """
+    db_request, cached_result = await _submit_tryon(
+        person_image, garment_image, garment_id, pose, db, api_key, priority
     )
+    if cached_result is not None:
+        return _result_file_response(db_request.id, cached_result, 0.0)
+    
+    deadline = min(timeout or settings.SYNC_TRYON_TIMEOUT, settings.SYNC_TRYON_TIMEOUT)
+    queue = status_broker.subscribe(db_request.id)
+    try:
+        event = await _wait_for_terminal(queue, db_request.id, deadline)
+    finally:
+        status_broker.unsubscribe(db_request.id, queue)
     
-    db.add(db_request)
-    await db.commit()
-    await db.refresh(db_request)
-    
-    # Schedule background processing
-    background_tasks.add_task(
-        process_tryon_background,
-        db_request.id,
-        person_path,
-        garment_path,
-        pose.value,
-        result_path
+    if event is None:
+        latest = status_broker.latest(db_request.id)
+        response = TryOnResponse(
+            request_id=db_request.id,
+            status=latest.status if latest else TryOnStatus.PENDING,
+            message=f"Try-on did not finish within {deadline:g}s. Processing in background.",
+            created_at=db_request.created_at
+        )
+        return JSONResponse(status_code=202, content=response.model_dump(mode="json"))
+    
+    if event.status == TryOnStatus.FAILED:
+        return TryOnResponse(
+            request_id=db_request.id,
+            status=TryOnStatus.FAILED,
+            message=event.error_message or "Try-on failed",
+            created_at=db_request.created_at,
+            processing_time=event.processing_time
+        )
+    
+    result_path = os.path.join(
+        settings.UPLOAD_DIR, "results", os.path.basename(event.result_image_url)
     )
+    return _result_file_response(db_request.id, result_path, event.processing_time)
+
+
+def _batch_response(batch: TryOnBatch, children: List[TryOnRequestDB]) -> TryOnBatchResponse:
+    """Aggregate the progress of a batch from its child requests."""
+    items = [
+        TryOnBatchItem(
+            request_id=child.id,
+            garment_id=child.garment_id,
+            status=child.status,
+            result_image_url=result_image_url(child.result_image_path),
+            error_message=child.error_message,
+            processing_time=child.processing_time
+        )
+        for child in children
+    ]
+    completed = sum(item.status == TryOnStatus.COMPLETED for item in items)
+    failed = sum(item.status == TryOnStatus.FAILED for item in items)
     
-    return TryOnResponse(
-        request_id=db_request.id,
-        status=TryOnStatus.PENDING,
-        message="Try-on request created successfully. Processing in background.",
-        created_at=db_request.created_at
+    if completed + failed == batch.total:
+        status = TryOnStatus.FAILED if completed == 0 else TryOnStatus.COMPLETED
+    elif any(item.status != TryOnStatus.PENDING for item in items):
+        status = TryOnStatus.PROCESSING
+    else:
+        status = TryOnStatus.PENDING
+    
+    return TryOnBatchResponse(
+        batch_id=batch.id,
+        status=status,
+        pose=batch.pose,
+        total=batch.total,
+        completed=completed,
+        failed=failed,
+        progress=(completed + failed) / batch.total,
+        items=items,
+        created_at=batch.created_at
     )
 
 
+@router.post("/batch", response_model=TryOnBatchResponse)
+async def create_tryon_batch(
+    person_image: UploadFile = File(..., description="Image of the person"),
+    garment_images: List[UploadFile] = File(default=[], description="Images of the garments"),
+    garment_ids: List[int] = Form(default=[], description="IDs of catalog garments"),
+    pose: PoseType = Form(default=PoseType.FRONT, description="Pose type"),
+    priority: TryOnPriority = Form(
+        default=TryOnPriority.STANDARD,
+        description="Scheduling priority: interactive, standard or bulk"
+    ),
+    db: AsyncSession = Depends(get_db),
+    api_key: Optional[APIKeyInfo] = Depends(require_api_key)
+):
+    """
+    Try one person photo on with several garments.
+    
+    Garments can be uploads, catalog IDs or a mix of both, up to
+    `BATCH_TRYON_MAX_ITEMS`. Each garment becomes a child try-on request
+    that is processed, retried and cached like any other; the person image
+    is stored once and, since the children are scheduled together, decoded
+    once per inference batch. Follow progress with
+    `GET /tryon/batch/{batch_id}`, or each child with its own status stream.
+    """
+    total = len(garment_images) + len(garment_ids)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="Provide at least one garment")
+    if total > settings.BATCH_TRYON_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_TRYON_MAX_ITEMS} garments per batch"
+        )
+    
+    if person_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid person image type")
+    for garment_image in garment_images:
+        if garment_image.content_type not in settings.ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=400, detail="Invalid garment image type")
+    
+    _check_rate_limit(api_key, total, pose)
+    
+    run_locally = settings.JOB_QUEUE_MODE == "local"
+    
+    staged: List[StagedUpload] = []
+    try:
+        person_upload = await _stage_image(person_image, "Person")
+        staged.append(person_upload)
+        person_path = _person_path(person_upload.content_hash)
+        
+        # (garment_id, content hash, stored path, staged upload or None)
+        garments: List[Tuple[Optional[int], str, str, Optional[StagedUpload]]] = []
+        for garment_id in garment_ids:
+            garment = await _catalog_garment(db, garment_id)
+            garments.append((garment_id, garment.content_hash, garment.image_path, None))
+        for garment_image in garment_images:
+            garment_upload = await _stage_image(garment_image, "Garment")
+            staged.append(garment_upload)
+            garment_hash = garment_upload.content_hash
+            garments.append(
+                (None, garment_hash, garment_cache.image_path(garment_hash), garment_upload)
+            )
+        
+        result_keys = [
+            result_cache.make_key(person_upload.content_hash, garment_hash, pose.value)
+            for _, garment_hash, _, _ in garments
+        ]
+        cached_results: List[Optional[str]] = [None] * total
+        if settings.RESULT_CACHE_ENABLED:
+            cached_results = [await result_cache.get(key, db) for key in result_keys]
+        
+        # Admit the whole batch or none of it
+        reserved = sum(cached is None for cached in cached_results) if run_locally else 0
+        _reserve_slots(reserved, pose)
+        
+        try:
+            if not os.path.exists(person_path):
+                await _store_image(person_upload, person_path, "Person")
+            for _, _, garment_path, garment_upload in garments:
+                if garment_upload is not None and not os.path.exists(garment_path):
+                    await _store_image(garment_upload, garment_path, "Garment")
+            
+            batch = TryOnBatch(user_image_path=person_path, pose=pose.value, total=total)
+            db.add(batch)
+            await db.flush()
+            
+            children = []
+            for (garment_id, _, garment_path, _), key, cached_result in zip(
+                garments, result_keys, cached_results
+            ):
+                child = TryOnRequestDB(
+                    user_image_path=person_path,
+                    garment_image_path=garment_path,
+                    garment_id=garment_id,
+                    batch_id=batch.id,
+                    api_key_id=api_key.id if api_key else None,
+                    result_key=key,
+                    pose=pose.value,
+                    priority=priority.value,
+                    status="pending"
+                )
+                if cached_result is not None:
+                    child.status = "completed"
+                    child.result_image_path = cached_result
+                    child.processing_time = 0.0
+                db.add(child)
+                children.append(child)
+            
+            with STAGE_SECONDS.time(stage="db_commit"):
+                await db.commit()
+        except BaseException:
+            for _ in range(reserved):
+                inference_executor.release()
+            raise
+    except BaseException:
+        _refund_rate_limit(api_key, total)
+        raise
+    finally:
+        for upload in staged:
+            upload.discard()
+    
+    for child in children:
+        REQUESTS_TOTAL.inc(status=child.status, pose=pose.value)
+        # Dispatched together, the children share micro-batches
+        if run_locally and child.status == "pending":
+            tryon_worker.dispatch(child.id, reserved=True)
+    
+    return _batch_response(batch, children)
+
+
+@router.get("/batch/{batch_id}", response_model=TryOnBatchResponse)
+async def get_tryon_batch(
+    batch_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the aggregate progress and per-garment results of a batch."""
+    batch = await db.get(TryOnBatch, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Try-on batch not found")
+    
+    result = await db.execute(
+        select(TryOnRequestDB)
+        .where(TryOnRequestDB.batch_id == batch_id)
+        .order_by(TryOnRequestDB.id)
+    )
+    return _batch_response(batch, list(result.scalars()))
+
+
 @router.get("/{request_id}", response_model=TryOnRequestDetail)
 async def get_tryon_request(
     request_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get details of a specific try-on request."""
-    result = await db.execute(
-        select(TryOnRequestDB).where(TryOnRequestDB.id == request_id)
+    """
+    Get details of a specific try-on request.
+    
+    Pollers should send the last `ETag` in `If-None-Match`; unchanged
+    requests are answered with 304.
+    """
+    entry = await status_cache.get(request_id, db)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Try-on request not found")
+    
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def _negotiate_format(requested: Optional[str], accept: str) -> Tuple[str, bool]:
+    """
+    Pick the rendition format for a result image request.
+    
+    Returns:
+        Tuple of (format name, whether it depended on the Accept header)
+    """
+    if requested is not None:
+        if requested not in RENDITION_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {requested}")
+        return requested, False
+    if "webp" in settings.RESULT_RENDITION_FORMATS and "image/webp" in accept:
+        return "webp", True
+    return "jpeg", True
+
+
+@router.get(
+    "/{request_id}/image",
+    responses={
+        200: {"content": {"image/jpeg": {}, "image/webp": {}}, "description": "Result image"}
+    }
+)
+async def get_tryon_image(
+    request: Request,
+    request_id: int,
+    size: str = Query(default="full", description="Rendition: full or a RESULT_RENDITIONS name"),
+    image_format: Optional[str] = Query(
+        default=None,
+        alias="format",
+        description="jpeg or webp; negotiated from Accept when omitted"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the result image of a completed try-on at a given size.
+    
+    Renditions are written when the result is produced, so serving one is
+    a plain file read. Responses carry a strong ETag and `Cache-Control`,
+    a matching `If-None-Match` returns `304 Not Modified` and byte ranges
+    are supported.
+    """
+    if size not in rendition_sizes():
+        raise HTTPException(status_code=400, detail=f"Unknown size: {size}")
+    image_format, negotiated = _negotiate_format(
+        image_format, request.headers.get("accept", "")
     )
-    request_obj = result.scalar_one_or_none()
     
-    if not request_obj:
+    request_obj = await db.get(TryOnRequestDB, request_id)
+    if request_obj is None:
         raise HTTPException(status_code=404, detail="Try-on request not found")
+    if request_obj.status != "completed" or not request_obj.result_image_path:
+        raise HTTPException(status_code=404, detail="Try-on result not available")
+    
+    path = rendition_path(request_obj.result_image_path, size, image_format)
+    media_type = RENDITION_FORMATS[image_format][2]
+    
+    # The URL is stable but its format may depend on Accept, so it is not immutable
+    headers = {"Cache-Control": f"public, max-age={settings.RESULT_IMAGE_MAX_AGE}"}
+    if negotiated:
+        headers["Vary"] = "Accept"
     
-    return TryOnRequestDetail.model_validate(request_obj)
+    response = await result_delivery.respond(request, path, media_type, headers)
+    if response is None:
+        # Results from before renditions were enabled are rendered on first use
+        rendered = await asyncio.to_thread(
+            ensure_rendition, request_obj.result_image_path, size, image_format
+        )
+        if rendered is not None:
+            response = await result_delivery.respond(request, path, media_type, headers)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Try-on result not available")
+    return response
+
+
+async def _open_status_stream(request_id: int) -> Tuple[asyncio.Queue, TryOnStatusEvent]:
+    """Subscribe to a request's transitions and get its current status."""
+    queue = status_broker.subscribe(request_id)
+    try:
+        current = status_broker.latest(request_id)
+        if current is None:
+            # One read per connection; waiting afterwards costs no queries
+            async with db_service.async_session_maker() as session:
+                request_obj = await session.get(TryOnRequestDB, request_id)
+            if request_obj is None:
+                raise HTTPException(status_code=404, detail="Try-on request not found")
+            current = status_event(request_obj)
+    except BaseException:
+        status_broker.unsubscribe(request_id, queue)
+        raise
+    return queue, current
+
+
+async def _status_events(
+    queue: asyncio.Queue,
+    current: TryOnStatusEvent
+) -> AsyncIterator[Optional[TryOnStatusEvent]]:
+    """
+    Yield the current status, then each transition until a terminal one.
+    
+    Yields None whenever `STATUS_STREAM_KEEPALIVE` passes without an event.
+    """
+    yield current
+    while current.status not in TERMINAL_STATUSES:
+        try:
+            current = await asyncio.wait_for(queue.get(), settings.STATUS_STREAM_KEEPALIVE)
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        yield current
+
+
+@router.get("/{request_id}/events")
+async def stream_tryon_status(request_id: int):
+    """
+    Stream status changes of a try-on request as Server-Sent Events.
+    
+    Sends the current status immediately, then one `status` event per
+    transition; the stream ends after `completed` or `failed`.
+    """
+    queue, current = await _open_status_stream(request_id)
+    
+    async def event_stream():
+        try:
+            async for event in _status_events(queue, current):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: status\ndata: {event.model_dump_json()}\n\n"
+        finally:
+            status_broker.unsubscribe(request_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{request_id}/ws")
+async def tryon_status_websocket(websocket: WebSocket, request_id: int):
+    """
+    Push status changes of a try-on request over a WebSocket.
+    
+    Each message is a JSON status event. The server closes the socket after
+    `completed` or `failed`, or with code 4404 for an unknown request.
+    """
+    await websocket.accept()
+    try:
+        queue, current = await _open_status_stream(request_id)
+    except HTTPException as e:
+        await websocket.close(code=4404, reason=e.detail)
+        return
+    
+    # Watch for the client going away while we wait for transitions
+    receiver = asyncio.create_task(websocket.receive())
+    try:
+        async for event in _status_events(queue, current):
+            if receiver.done():
+                if receiver.result()["type"] == "websocket.disconnect":
+                    return
+                receiver = asyncio.create_task(websocket.receive())
+            if event is not None:
+                await websocket.send_json(event.model_dump(mode="json"))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        status_broker.unsubscribe(request_id, queue)
 
 
 @router.get("/", response_model=List[TryOnRequestDetail])
 async def list_tryon_requests(
-    skip: int = 0,
-    limit: int = 10,
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor"),
+    status: Optional[TryOnStatus] = None,
+    pose: Optional[PoseType] = None,
+    limit: int = Query(10, ge=1, le=settings.LIST_MAX_LIMIT),
+    skip: int = Query(0, ge=0, deprecated=True),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all try-on requests."""
-    result = await db.execute(
-        select(TryOnRequestDB)
-        .order_by(TryOnRequestDB.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
+    """
+    List try-on requests, newest first.
+    
+    Pages are chained with the cursor returned in the `X-Next-Cursor`
+    header (and a `Link: rel="next"` header), which stays fast at any
+    depth unlike `skip`. The two cannot be combined.
+    """
+    if after and skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with after")
+    statement = select(TryOnRequestDB)
+    if status is not None:
+        statement = statement.where(TryOnRequestDB.status == status.value)
+    if pose is not None:
+        statement = statement.where(TryOnRequestDB.pose == pose.value)
+    
+    try:
+        statement = keyset_page(statement, TryOnRequestDB, after, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    result = await db.execute(statement.offset(skip))
     requests = result.scalars().all()
+    set_next_page(request, response, next_cursor(requests, limit))
     
-    return [TryOnRequestDetail.model_validate(req) for req in requests]
+    return [TryOnRequestDetail.model_validate(req) for req in requests[:limit]]
@@ -1,7 +1,7 @@
 """Application configuration and settings."""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,25 +12,101 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Virtual Try-On AI"
     VERSION: str = "0.1.0"
     DESCRIPTION: str = "AI-powered virtual try-on system for clothes and shoes"
+    LIST_MAX_LIMIT: int = 100  # largest page a listing endpoint returns
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
     
     # Database
-    DATABASE_URL: str = "sqlite+aiosqlite:///./virtual_tryon.db"
+    DATABASE_URL: str = "sqlite+aiosqlite:///./virtual_tryon.db"  # or postgresql+asyncpg://...
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds; server databases only
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
     
     # Upload Configuration
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_IMAGE_TYPES: List[str] = ["image/jpeg", "image/png", "image/jpg"]
+    IMAGE_BACKEND: str = "pil"  # pil or opencv (model input preprocessing)
     
     # Model Configuration
     MODEL_WEIGHTS_DIR: str = "./models/weights"
+    MODEL_VERSION: str = "placeholder-0.1"  # part of result cache keys; bump when weights change
+    MODEL_BACKEND: str = "auto"  # auto (from MODEL_WEIGHTS_DIR), placeholder, onnx or torchscript
+    MODEL_PRELOAD: bool = True  # start pool workers at startup, not on first use
+    MODEL_WARMUP_RUNS: int = 1  # synthetic inference passes as each worker starts, 0 to skip
+    MODEL_NUM_THREADS: int = 0  # intra-op threads per pool worker, 0 for the library default
     SUPPORTED_POSES: List[str] = ["front", "side", "three-quarter"]
     
     # Try-On Configuration
     OUTPUT_IMAGE_FORMAT: str = "JPEG"
     OUTPUT_IMAGE_QUALITY: int = 90
+    SYNC_TRYON_TIMEOUT: float = 10.0  # max seconds POST /tryon/sync waits for a result
+    BATCH_TRYON_MAX_ITEMS: int = 20  # garments per POST /tryon/batch
+    RESULT_RENDITIONS: Dict[str, int] = {"thumb": 256, "preview": 768}  # name -> longest edge (px)
+    RESULT_RENDITION_FORMATS: List[str] = ["jpeg"]  # add "webp" for smaller downloads
+    RESULT_IMAGE_MAX_AGE: int = 86400  # Cache-Control max-age of GET /tryon/{id}/image
+    RESULT_HOT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # served results kept in memory, 0 disables
+    RESULT_HOT_CACHE_MAX_FILE_BYTES: int = 1024 * 1024  # larger files are always streamed from disk
+    
+    # Garment Cache
+    GARMENT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # in-memory tensor budget
+    GARMENT_PREPROCESS_CHUNK_SIZE: int = 8  # garments per pool job during catalog imports
+    
+    # Person Feature Cache (a customer photo reused across garments)
+    PERSON_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    PERSON_CACHE_TTL: int = 1800  # seconds since last use before a session ends
+    
+    # Result Cache (identical try-on inputs reuse an existing result)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL: int = 7 * 24 * 3600  # seconds
+    RESULT_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024  # size of uploads/results
+    RESULT_CACHE_SWEEP_INTERVAL: int = 300
+    
+    # Inference Executor
+    INFERENCE_EXECUTOR: str = "thread"  # thread or process
+    INFERENCE_WORKERS: int = 2
+    INFERENCE_QUEUE_SIZE: int = 32
+    INFERENCE_RETRY_AFTER: int = 5  # seconds, sent with 429 responses
+    INFERENCE_BATCH_SIZE: int = 1  # 1 disables micro-batching
+    INFERENCE_BATCH_MAX_WAIT_MS: int = 10
+    
+    # Job Queue
+    JOB_QUEUE_MODE: str = "local"  # local (API process runs jobs) or worker (run.py + worker.py)
+    JOB_LEASE_SECONDS: int = 60
+    JOB_HEARTBEAT_INTERVAL: int = 15
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF: float = 2.0  # seconds, doubled after each attempt
+    JOB_RETRY_BACKOFF_MAX: float = 60.0
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_RECOVERY_INTERVAL: int = 30
+    JOB_STATUS_FLUSH_INTERVAL_MS: int = 20  # coalesce job status writes for this long
+    JOB_STATUS_FLUSH_BATCH: int = 200  # flush early once this many are waiting
+    
+    # API key authentication (/tryon and /garments routes)
+    API_KEY_AUTH_ENABLED: bool = False
+    ADMIN_API_KEY: Optional[str] = None  # required for /api-keys when auth is enabled
+    API_KEY_USAGE_FLUSH_INTERVAL: float = 10.0  # seconds between usage counter writes
+    API_KEY_INDEX_REFRESH_INTERVAL: float = 60.0  # seconds; picks up other processes' changes
+    
+    # Per-API-key quotas (defaults; each key may override them)
+    RATE_LIMIT_PER_MINUTE: int = 60  # try-on requests per key, 0 for unlimited
+    RATE_LIMIT_BURST: int = 30
+    FAIR_SHARE_WEIGHT: float = 1.0  # relative share of inference capacity
+    # Waiting jobs move up one priority class per interval, 0 disables
+    PRIORITY_AGING_SECONDS: float = 30.0
+    
+    # Status Streaming (SSE / WebSocket)
+    STATUS_STREAM_KEEPALIVE: int = 15  # seconds between keep-alive comments
+    
+    # Status polling cache
+    STATUS_CACHE_MAX_ENTRIES: int = 10000
+    STATUS_CACHE_TTL: float = 1.0  # seconds an unfinished status is served unchecked
     
     class Config:
         env_file = ".env"
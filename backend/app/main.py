@@ -2,13 +2,20 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import os
 
 from .core.config import settings
-from .api import api_router
-from .services import db_service
+from .api import api_router, metrics_router, results_router
+from .services import (
+    api_key_index,
+    db_service,
+    inference_executor,
+    tryon_worker,
+    result_cache,
+    status_broker,
+    status_writer,
+)
 
 
 @asynccontextmanager
@@ -22,10 +29,36 @@ async def lifespan(app: FastAPI):
     os.makedirs(os.path.join(settings.UPLOAD_DIR, "garments"), exist_ok=True)
     os.makedirs(os.path.join(settings.UPLOAD_DIR, "results"), exist_ok=True)
     
+    # Start inference workers (each loads its own model)
+    inference_executor.start()
+    if settings.MODEL_PRELOAD:
+        # Start workers, which load and warm up their model, before taking traffic
+        await inference_executor.load_models()
+    
+    # Recover jobs orphaned by a previous process and keep sweeping for them
+    if settings.JOB_QUEUE_MODE == "local":
+        await tryon_worker.start()
+    else:
+        await tryon_worker.recover()
+        # Transitions happen in worker processes; watch for them centrally
+        await status_broker.start()
+    
+    # Evict expired and excess cached results in the background
+    await result_cache.start()
+    
+    # Authenticate API keys from memory and write usage in batches
+    await api_key_index.start()
+    
     yield
     
     # Shutdown
-    pass
+    await api_key_index.shutdown()
+    await result_cache.shutdown()
+    await status_broker.shutdown()
+    await tryon_worker.shutdown()
+    await status_writer.shutdown()
+    await inference_executor.shutdown()
+    await db_service.close()
 
 
 def create_app() -> FastAPI:
@@ -49,9 +82,11 @@ def create_app() -> FastAPI:
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
-    # Mount static files for serving results
-    if os.path.exists(settings.UPLOAD_DIR):
-        app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+    # Metrics live at the conventional unversioned path for scrapers
+    app.include_router(metrics_router)
+    
+    # Result images are served at their public URL; other uploads stay private
+    app.include_router(results_router)
     
     return app
 
@@ -1,27 +1,47 @@
 """Models module initialization."""
 
-from .database import Base, TryOnRequest, APIKey
+from .database import Base, TryOnRequest, TryOnBatch, Garment, APIKey
 from .schemas import (
     PoseType,
     TryOnStatus,
+    TryOnPriority,
     TryOnRequest as TryOnRequestSchema,
     TryOnResponse,
     TryOnRequestDetail,
+    TryOnStatusEvent,
+    TryOnBatchItem,
+    TryOnBatchResponse,
+    GarmentStatus,
+    GarmentResponse,
     APIKeyCreate,
+    APIKeyUpdate,
     APIKeyResponse,
+    APIKeyCreated,
+    ModelStatus,
     HealthResponse,
 )
 
 __all__ = [
     "Base",
     "TryOnRequest",
+    "TryOnBatch",
+    "Garment",
     "APIKey",
     "PoseType",
     "TryOnStatus",
+    "TryOnPriority",
     "TryOnRequestSchema",
     "TryOnResponse",
     "TryOnRequestDetail",
+    "TryOnStatusEvent",
+    "TryOnBatchItem",
+    "TryOnBatchResponse",
+    "GarmentStatus",
+    "GarmentResponse",
     "APIKeyCreate",
+    "APIKeyUpdate",
     "APIKeyResponse",
+    "APIKeyCreated",
+    "ModelStatus",
     "HealthResponse",
 ]
@@ -1,6 +1,6 @@
 """Database models for virtual try-on system."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -16,13 +16,66 @@ class TryOnRequest(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_image_path = Column(String, nullable=False)
     garment_image_path = Column(String, nullable=False)
+    garment_id = Column(Integer, ForeignKey("garments.id"), nullable=True)
+    batch_id = Column(Integer, ForeignKey("tryon_batches.id"), nullable=True, index=True)
+    api_key_id = Column(Integer, ForeignKey("api_keys.id"), nullable=True)  # fair-share flow
     result_image_path = Column(String, nullable=True)
+    result_key = Column(String, nullable=True, index=True)  # result cache key
     pose = Column(String, nullable=False)
+    # interactive, standard, bulk
+    priority = Column(String, nullable=False, default="standard", server_default="standard")
     status = Column(String, default="pending")  # pending, processing, completed, failed
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=func.now())
     error_message = Column(String, nullable=True)
     processing_time = Column(Float, nullable=True)
+    
+    # Job queue bookkeeping
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime, nullable=True)  # earliest time a retry may run
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    
+    # Newest-first listings, optionally filtered, page by (created_at, id)
+    __table_args__ = (
+        Index("ix_tryon_requests_created_at_id", "created_at", "id"),
+        Index("ix_tryon_requests_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tryon_requests_pose_created_at_id", "pose", "created_at", "id"),
+        # Oldest pending job per priority and API key, for fair claiming
+        Index(
+            "ix_tryon_requests_status_priority_api_key_id_id",
+            "status", "priority", "api_key_id", "id"
+        ),
+    )
+
+
+class TryOnBatch(Base):
+    """Model for a batch of try-ons of one person photo with many garments."""
+    
+    __tablename__ = "tryon_batches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_image_path = Column(String, nullable=False)
+    pose = Column(String, nullable=False)
+    total = Column(Integer, nullable=False)  # number of child try-on requests
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+
+
+class Garment(Base):
+    """Model for garments registered in a shop's catalog."""
+    
+    __tablename__ = "garments"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    sku = Column(String, nullable=True, index=True)
+    content_hash = Column(String, nullable=False, index=True)
+    image_path = Column(String, nullable=False)
+    status = Column(String, default="pending")  # pending, ready, failed
+    error_message = Column(String, nullable=True)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    preprocessed_at = Column(DateTime, nullable=True)
 
 
 class APIKey(Base):
@@ -37,3 +90,12 @@ class APIKey(Base):
     created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     last_used_at = Column(DateTime, nullable=True)
     usage_count = Column(Integer, default=0)
+    
+    # Quotas; NULL uses the defaults from settings
+    rate_limit_per_minute = Column(Integer, nullable=True)
+    rate_limit_burst = Column(Integer, nullable=True)
+    weight = Column(Float, nullable=True)  # fair share of inference capacity
+    
+    __table_args__ = (
+        Index("ix_api_keys_created_at_id", "created_at", "id"),
+    )
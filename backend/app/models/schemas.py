@@ -21,9 +21,20 @@ class TryOnStatus(str, Enum):
     FAILED = "failed"
 
 
+class TryOnPriority(str, Enum):
+    """Scheduling priority of a try-on request, highest first."""
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BULK = "bulk"
+
+
 class TryOnRequest(BaseModel):
     """Schema for try-on request."""
     pose: PoseType = Field(default=PoseType.FRONT, description="Pose type for the try-on")
+    priority: TryOnPriority = Field(
+        default=TryOnPriority.STANDARD,
+        description="interactive for shoppers waiting on the result, bulk for pre-rendering"
+    )
     
     class Config:
         use_enum_values = True
@@ -42,13 +53,48 @@ class TryOnResponse(BaseModel):
         from_attributes = True
 
 
+class TryOnStatusEvent(BaseModel):
+    """Status transition pushed to streaming clients."""
+    request_id: int
+    status: TryOnStatus
+    result_image_url: Optional[str] = None
+    error_message: Optional[str] = None
+    processing_time: Optional[float] = None
+
+
+class TryOnBatchItem(BaseModel):
+    """One garment's try-on within a batch."""
+    request_id: int
+    garment_id: Optional[int] = None
+    status: TryOnStatus
+    result_image_url: Optional[str] = None
+    error_message: Optional[str] = None
+    processing_time: Optional[float] = None
+
+
+class TryOnBatchResponse(BaseModel):
+    """Schema for a batch try-on and its aggregate progress."""
+    batch_id: int
+    status: TryOnStatus
+    pose: str
+    total: int
+    completed: int
+    failed: int
+    progress: float = Field(..., description="Fraction of items that finished")
+    items: List[TryOnBatchItem]
+    created_at: datetime
+
+
 class TryOnRequestDetail(BaseModel):
     """Detailed try-on request schema."""
     id: int
     user_image_path: str
     garment_image_path: str
+    garment_id: Optional[int] = None
+    batch_id: Optional[int] = None
     result_image_path: Optional[str]
     pose: str
+    priority: str
     status: str
     created_at: datetime
     updated_at: datetime
@@ -59,26 +105,83 @@ class TryOnRequestDetail(BaseModel):
         from_attributes = True
 
 
-class APIKeyCreate(BaseModel):
+class GarmentStatus(str, Enum):
+    """Garment preprocessing status."""
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class GarmentResponse(BaseModel):
+    """Schema for a catalog garment."""
+    id: int
+    name: str
+    sku: Optional[str]
+    status: GarmentStatus
+    error_message: Optional[str]
+    is_active: bool
+    created_at: datetime
+    preprocessed_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class APIKeyQuota(BaseModel):
+    """Per-key quotas; unset fields use the server defaults."""
+    rate_limit_per_minute: Optional[int] = Field(
+        default=None, ge=0, description="Try-on requests per minute, 0 for unlimited"
+    )
+    rate_limit_burst: Optional[int] = Field(
+        default=None, ge=1, description="Requests allowed in a burst"
+    )
+    weight: Optional[float] = Field(
+        default=None, gt=0, description="Relative share of inference capacity"
+    )
+
+
+class APIKeyCreate(APIKeyQuota):
     """Schema for creating API key."""
     name: str = Field(..., description="Name/description for the API key")
 
 
+class APIKeyUpdate(APIKeyQuota):
+    """Schema for changing an API key's quotas."""
+
+
 class APIKeyResponse(BaseModel):
-    """Schema for API key response."""
+    """Schema for API key response; the key itself is never listed."""
     id: int
-    key: str
     name: str
     is_active: bool
     created_at: datetime
     usage_count: int
+    rate_limit_per_minute: Optional[int] = None
+    rate_limit_burst: Optional[int] = None
+    weight: Optional[float] = None
     
     class Config:
         from_attributes = True
 
 
+class APIKeyCreated(APIKeyResponse):
+    """Schema for a newly created API key, the only time the key is returned."""
+    key: str
+
+
+class ModelStatus(BaseModel):
+    """Try-on model backend and its readiness."""
+    backend: Optional[str] = None
+    version: str
+    preloaded: bool
+    workers_ready: int
+    load_seconds: Optional[float] = Field(None, description="Slowest worker's model load time")
+    warmup_seconds: Optional[float] = Field(None, description="Slowest worker's warm-up time")
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     version: str
     supported_poses: List[str]
+    model: Optional[ModelStatus] = None
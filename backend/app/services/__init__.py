@@ -1,11 +1,58 @@
 """Services module initialization."""
 
+from .api_key_index import APIKeyIndex, api_key_index
+from .garment_cache import GarmentCache, garment_cache
+from .person_cache import PersonFeatureCache, person_cache
+from .model_backends import MODEL_BACKENDS, ModelBackend, create_model_backend
 from .tryon_service import VirtualTryOnService
 from .database_service import DatabaseService, db_service, get_db
+from .fair_queue import FairQueue, FairShare
+from .rate_limiter import RateLimiter, rate_limiter
+from .inference_executor import InferenceExecutor, QueueFullError, inference_executor
+from .batch_scheduler import BatchScheduler, batch_scheduler
+from .status_writer import StatusWriter, status_writer
+from .job_queue import JobQueue, job_queue
+from .result_cache import ResultCache, result_cache
+from .result_delivery import ResultDelivery, result_delivery
+from .status_broker import StatusBroker, status_broker
+from .status_cache import StatusCache, status_cache
+from .job_worker import TryOnWorker, tryon_worker
 
 __all__ = [
+    "APIKeyIndex",
+    "api_key_index",
+    "GarmentCache",
+    "garment_cache",
+    "PersonFeatureCache",
+    "person_cache",
+    "MODEL_BACKENDS",
+    "ModelBackend",
+    "create_model_backend",
     "VirtualTryOnService",
     "DatabaseService",
     "db_service",
     "get_db",
+    "FairQueue",
+    "FairShare",
+    "RateLimiter",
+    "rate_limiter",
+    "InferenceExecutor",
+    "QueueFullError",
+    "inference_executor",
+    "BatchScheduler",
+    "batch_scheduler",
+    "StatusWriter",
+    "status_writer",
+    "JobQueue",
+    "job_queue",
+    "ResultCache",
+    "result_cache",
+    "ResultDelivery",
+    "result_delivery",
+    "StatusBroker",
+    "status_broker",
+    "StatusCache",
+    "status_cache",
+    "TryOnWorker",
+    "tryon_worker",
 ]
@@ -0,0 +1,221 @@
+"""In-memory API key lookup with batched usage accounting."""
+
+import asyncio
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, func, select, update
+
+from ..core.config import settings
+from ..models.database import APIKey
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(key: str) -> str:
+    """Digest under which a key is indexed."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class APIKeyInfo:
+    """The caller identified by an API key, with its quotas."""
+    id: int
+    name: str
+    rate_limit_per_minute: Optional[int] = None  # None: RATE_LIMIT_PER_MINUTE
+    rate_limit_burst: Optional[int] = None  # None: RATE_LIMIT_BURST
+    weight: Optional[float] = None  # None: FAIR_SHARE_WEIGHT
+    
+    @classmethod
+    def from_row(cls, api_key: APIKey) -> "APIKeyInfo":
+        return cls(
+            api_key.id,
+            api_key.name,
+            api_key.rate_limit_per_minute,
+            api_key.rate_limit_burst,
+            api_key.weight
+        )
+    
+    @property
+    def rate_limit(self) -> float:
+        """Try-on requests allowed per minute; 0 is unlimited."""
+        if self.rate_limit_per_minute is None:
+            return settings.RATE_LIMIT_PER_MINUTE
+        return self.rate_limit_per_minute
+    
+    @property
+    def burst(self) -> int:
+        if self.rate_limit_burst is None:
+            return settings.RATE_LIMIT_BURST
+        return self.rate_limit_burst
+    
+    @property
+    def share(self) -> float:
+        """Fair-share weight of the key's jobs."""
+        return settings.FAIR_SHARE_WEIGHT if self.weight is None else self.weight
+
+
+class APIKeyIndex:
+    """
+    Authenticates API keys without touching the database.
+    
+    Active keys are indexed by their SHA-256 digest, so a lookup is one hash
+    and one dict access and the index holds no usable keys. The API key
+    endpoints update the index when keys are created or deactivated; it is
+    also reloaded every `API_KEY_INDEX_REFRESH_INTERVAL` to pick up changes
+    made by other processes.
+    
+    Usage is counted in memory and added to `usage_count` and
+    `last_used_at` every `API_KEY_USAGE_FLUSH_INTERVAL` seconds in one
+    transaction, instead of one UPDATE per request.
+    """
+    
+    def __init__(self, session_maker=None):
+        self._session_maker = session_maker
+        
+        self._keys: Dict[str, APIKeyInfo] = {}
+        self._by_id: Dict[int, APIKeyInfo] = {}
+        self._loaded = False
+        self._usage: Dict[int, int] = defaultdict(int)
+        self._last_used: Dict[int, datetime] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        self.authenticated = 0
+        self.rejected = 0
+    
+    @property
+    def session_maker(self):
+        if self._session_maker is None:
+            from .database_service import db_service
+            self._session_maker = db_service.async_session_maker
+        return self._session_maker
+    
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+    
+    async def load(self):
+        """Rebuild the index from the active keys in the database."""
+        async with self.session_maker() as session:
+            result = await session.execute(select(APIKey).where(APIKey.is_active.is_(True)))
+            keys = {
+                hash_api_key(api_key.key): APIKeyInfo.from_row(api_key)
+                for api_key in result.scalars()
+            }
+        self._keys = keys
+        self._by_id = {info.id: info for info in keys.values()}
+        self._loaded = True
+    
+    def add(self, api_key: APIKey):
+        """Index a newly created or updated key."""
+        info = APIKeyInfo.from_row(api_key)
+        self._keys[hash_api_key(api_key.key)] = info
+        self._by_id[info.id] = info
+    
+    def remove(self, key: str):
+        """Stop accepting a deactivated key."""
+        info = self._keys.pop(hash_api_key(key), None)
+        if info is not None:
+            self._by_id.pop(info.id, None)
+    
+    def get(self, key_id: Optional[int]) -> Optional[APIKeyInfo]:
+        """Active key by ID."""
+        return self._by_id.get(key_id) if key_id is not None else None
+    
+    def weight(self, key_id: Optional[int]) -> float:
+        """Fair-share weight of a key's jobs, the default for unknown keys."""
+        info = self.get(key_id)
+        return info.share if info is not None else settings.FAIR_SHARE_WEIGHT
+    
+    def authenticate(self, key: Optional[str]) -> Optional[APIKeyInfo]:
+        """
+        Look up a key and count its use.
+        
+        Returns:
+            The key's owner, or None if the key is unknown or inactive
+        """
+        info = self._keys.get(hash_api_key(key)) if key else None
+        if info is None:
+            self.rejected += 1
+            return None
+        
+        self.authenticated += 1
+        self._usage[info.id] += 1
+        self._last_used[info.id] = datetime.utcnow()
+        return info
+    
+    async def flush(self):
+        """Add the usage counted since the last flush to the database."""
+        if not self._usage:
+            return
+        usage, self._usage = self._usage, defaultdict(int)
+        last_used, self._last_used = self._last_used, {}
+        
+        try:
+            async with self.session_maker() as session:
+                await session.execute(
+                    update(APIKey)
+                    .where(APIKey.id.in_(list(usage)))
+                    .values(
+                        usage_count=(
+                            func.coalesce(APIKey.usage_count, 0)
+                            + case(usage, value=APIKey.id, else_=0)
+                        ),
+                        last_used_at=case(last_used, value=APIKey.id, else_=APIKey.last_used_at)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except Exception:
+            # Keep the counts for the next attempt
+            for key_id, count in usage.items():
+                self._usage[key_id] += count
+            for key_id, used_at in last_used.items():
+                self._last_used.setdefault(key_id, used_at)
+            raise
+    
+    async def _flush_loop(self):
+        since_refresh = 0.0
+        while True:
+            await asyncio.sleep(settings.API_KEY_USAGE_FLUSH_INTERVAL)
+            since_refresh += settings.API_KEY_USAGE_FLUSH_INTERVAL
+            try:
+                await self.flush()
+                if since_refresh >= settings.API_KEY_INDEX_REFRESH_INTERVAL:
+                    since_refresh = 0.0
+                    await self.load()
+            except Exception as e:
+                logger.warning("API key usage flush failed: %s", e)
+    
+    async def start(self):
+        """Load the index and start flushing usage periodically."""
+        await self.load()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def shutdown(self):
+        """Stop the flush loop and write the remaining usage."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("API key usage flush failed: %s", e)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Index size and authentication counters."""
+        return {
+            "active_keys": len(self._keys),
+            "authenticated": self.authenticated,
+            "rejected": self.rejected,
+            "pending_usage": sum(self._usage.values()),
+        }
+
+
+api_key_index = APIKeyIndex()
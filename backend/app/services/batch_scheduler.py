@@ -0,0 +1,269 @@
+"""Micro-batching scheduler that groups try-on jobs for batched inference."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Hashable, List, Optional, Sequence
+
+from ..core.config import settings
+from ..core.metrics import QUEUE_WAIT_SECONDS
+from ..models.schemas import TryOnPriority
+from .fair_queue import PriorityFairQueue
+from .inference_executor import (
+    InferenceExecutor,
+    inference_executor,
+    run_process_tryon,
+    run_process_tryon_batch,
+)
+from .tryon_service import TryOnJob, TryOnResult
+
+
+PRIORITIES = tuple(priority.value for priority in TryOnPriority)
+
+# Recent queue waits kept per priority for percentiles in `stats`
+WAIT_WINDOW = 1000
+
+
+@dataclass
+class _PendingJob:
+    job: TryOnJob
+    future: asyncio.Future
+    priority: str = TryOnPriority.STANDARD.value
+    waited: float = 0.0  # seconds spent queued before reaching the scheduler
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of `values`, 0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+class BatchScheduler:
+    """
+    Gathers try-on jobs into batches for `process_tryon_batch`.
+
+    A batch is dispatched as soon as `max_batch_size` jobs are waiting or
+    the oldest job has waited `max_wait_ms`, whichever comes first. Each
+    submitted job must hold an executor reservation; a batch runs on a
+    single pool worker and gives back every reservation it carries.
+
+    Jobs wait here until a pool worker is free and are then taken by
+    priority class, and within a class in weighted fair order across flows
+    (API keys), so one client's backlog does not delay everyone else's
+    jobs. Running jobs are never preempted, and waiting jobs move up a
+    class every `PRIORITY_AGING_SECONDS` so bulk work still gets through.
+    Interactive jobs do not wait for a batch to fill. With
+    `max_batch_size` of 1 every job is dispatched on its own.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[InferenceExecutor] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+        aging_seconds: Optional[float] = None
+    ):
+        self.executor = executor or inference_executor
+        self.max_batch_size = max(1, max_batch_size or settings.INFERENCE_BATCH_SIZE)
+        self.max_wait = (
+            settings.INFERENCE_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        ) / 1000.0
+
+        self._pending: PriorityFairQueue[_PendingJob] = PriorityFairQueue(
+            PRIORITIES,
+            settings.PRIORITY_AGING_SECONDS if aging_seconds is None else aging_seconds
+        )
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._batch_tasks = set()
+
+        # Metrics
+        self._batches = 0
+        self._batched_jobs = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._waits: Dict[str, Deque[float]] = {
+            priority: deque(maxlen=WAIT_WINDOW) for priority in PRIORITIES
+        }
+        self._wait_counts: Dict[str, int] = dict.fromkeys(PRIORITIES, 0)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1
+
+    async def submit(
+        self,
+        job: TryOnJob,
+        flow: Hashable = None,
+        weight: float = 1.0,
+        priority: str = TryOnPriority.STANDARD.value,
+        waited: float = 0.0
+    ) -> TryOnResult:
+        """
+        Run a job, batching it with others when batching is enabled.
+
+        Args:
+            job: Try-on job arguments
+            flow: Who the job is for, e.g. an API key ID; flows share the
+                pool in proportion to their `weight`
+            priority: `TryOnPriority` value of the job
+            waited: Seconds the job already waited, e.g. in the database
+                queue; counted in queue wait metrics and aging
+
+        The caller's executor reservation is consumed either way.
+        """
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        item = _PendingJob(job, future, priority, waited)
+        self._pending.push(
+            item, priority, flow, weight, enqueued_at=item.enqueued_at - waited
+        )
+        self._wakeup.set()
+        return await future
+
+    def _ensure_running(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._wakeup = asyncio.Event()
+            self._loop_task = asyncio.create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self):
+        """Form batches from pending jobs and hand them to the executor."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._pending:
+                while self._pending and len(self._pending) < self.max_batch_size:
+                    remaining = self._batch_deadline() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    self._wakeup.clear()
+
+                # Pick the batch only once it can run, so the choice is fair
+                await self.executor.acquire_worker()
+                batch = []
+                while self._pending and len(batch) < self.max_batch_size:
+                    item = self._pending.pop()
+                    if item.future.cancelled():
+                        self.executor.release()
+                    else:
+                        batch.append(item)
+
+                if not batch:
+                    self.executor.release_worker()
+                    continue
+                task = asyncio.create_task(self._run_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    def _batch_deadline(self) -> float:
+        """When the waiting jobs must be dispatched, full batch or not."""
+        if self._pending.count(TryOnPriority.INTERACTIVE.value):
+            return 0.0
+        return min(item.enqueued_at for item in self._pending) + self.max_wait
+
+    async def _run_batch(self, batch: List[_PendingJob]):
+        """Run one batch and fan results back out to each waiter."""
+        now = time.monotonic()
+        self._batches += 1
+        self._batched_jobs += len(batch)
+        for item in batch:
+            wait = now - item.enqueued_at
+            self._queue_wait_total += wait
+            self._queue_wait_max = max(self._queue_wait_max, wait)
+
+            total_wait = item.waited + wait
+            self._waits[item.priority].append(total_wait)
+            self._wait_counts[item.priority] += 1
+            QUEUE_WAIT_SECONDS.observe(total_wait, priority=item.priority)
+
+        # The batch runs under one reservation; return the others afterwards
+        try:
+            if len(batch) == 1:
+                results = [await self.executor.run(
+                    run_process_tryon,
+                    *batch[0].job,
+                    reserved=True,
+                    queued_since=[batch[0].enqueued_at],
+                    worker_held=True
+                )]
+            else:
+                results = await self.executor.run(
+                    run_process_tryon_batch,
+                    [item.job for item in batch],
+                    reserved=True,
+                    queued_since=[item.enqueued_at for item in batch],
+                    worker_held=True
+                )
+        except Exception as e:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+        else:
+            for item, result in zip(batch, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+        finally:
+            for _ in range(len(batch) - 1):
+                self.executor.release()
+
+    async def shutdown(self):
+        """Stop forming batches and cancel jobs still waiting for one."""
+        tasks = list(self._batch_tasks)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+
+        while self._pending:
+            item = self._pending.pop()
+            item.future.cancel()
+            self.executor.release()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def queue_wait_stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue wait percentiles per priority over recent jobs."""
+        return {
+            priority: {
+                "jobs": self._wait_counts[priority],
+                "p50_ms": _percentile(waits, 0.5) * 1000.0,
+                "p95_ms": _percentile(waits, 0.95) * 1000.0,
+                "max_ms": max(waits, default=0.0) * 1000.0,
+            }
+            for priority, waits in self._waits.items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch fill ratio and queue wait metrics."""
+        batches = self._batches
+        jobs = self._batched_jobs
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending": len(self._pending),
+            "pending_by_priority": self._pending.depth(),
+            "pending_by_flow": {
+                str(flow): count for flow, count in self._pending.backlog().items()
+            },
+            "batches": batches,
+            "jobs": jobs,
+            "avg_batch_size": jobs / batches if batches else 0.0,
+            "fill_ratio": jobs / (batches * self.max_batch_size) if batches else 0.0,
+            "avg_queue_wait_ms": self._queue_wait_total / jobs * 1000.0 if jobs else 0.0,
+            "max_queue_wait_ms": self._queue_wait_max * 1000.0,
+            "queue_wait_by_priority": self.queue_wait_stats(),
+        }
+
+
+batch_scheduler = BatchScheduler()
@@ -1,23 +1,96 @@
 """Database service for managing database operations."""
 
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from ..core.config import settings
 from ..models.database import Base
 
+logger = logging.getLogger(__name__)
+
+# Synchronous URL schemes mapped to their async drivers
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Use the async driver for plain `sqlite://` or `postgresql://` URLs."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Pool settings for an async database URL.
+    
+    SQLite files get a small queue pool instead of aiosqlite's default of
+    a new connection per session; in-memory databases must share a single
+    connection. Server databases are sized from the `DATABASE_POOL_*`
+    settings and pre-ping connections so restarts do not surface as errors.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return {"poolclass": StaticPool}
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        }
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection for concurrent jobs.
+    
+    WAL lets readers proceed while a job commits, `synchronous=NORMAL` is
+    durable under WAL without an fsync per commit, and the busy timeout
+    makes writers wait for the lock instead of failing with
+    "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
 
 class DatabaseService:
     """Service for database operations."""
     
-    def __init__(self):
+    def __init__(self, database_url: Optional[str] = None):
+        url = async_database_url(database_url or settings.DATABASE_URL)
         self.engine = create_async_engine(
-            settings.DATABASE_URL,
+            url,
             echo=False,
-            future=True
+            future=True,
+            **engine_options(url)
         )
         
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
+        
         self.async_session_maker = sessionmaker(
             self.engine,
             class_=AsyncSession,
@@ -25,8 +98,24 @@ class DatabaseService:
         )
     
     async def init_db(self):
-        """Initialize database tables."""
+        """
+        Create the tables of an empty database.
+        
+        Once a database has tables, Alembic owns its schema: creating the
+        missing tables of an older database would leave its existing tables
+        without their new columns and break `alembic upgrade`. A database
+        created here is at the latest schema; run `alembic stamp head` on it
+        before applying later migrations.
+        """
         async with self.engine.begin() as conn:
+            tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+            if tables:
+                if "alembic_version" not in tables:
+                    logger.warning(
+                        "Database is not under Alembic; run `alembic stamp` as described "
+                        "in docs/DEPLOYMENT.md, then `alembic upgrade head`"
+                    )
+                return
             await conn.run_sync(Base.metadata.create_all)
     
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -36,6 +125,25 @@ class DatabaseService:
                 yield session
             finally:
                 await session.close()
+    
+    async def close(self):
+        """Close all pooled connections."""
+        await self.engine.dispose()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Connection pool occupancy."""
+        pool = self.engine.pool
+        stats: Dict[str, Any] = {
+            "dialect": self.engine.dialect.name,
+            "pool": type(pool).__name__,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return stats
 
 
 db_service = DatabaseService()
@@ -0,0 +1,190 @@
+"""Weighted fair queuing across API keys, with priority classes."""
+
+import heapq
+import itertools
+import time
+from typing import (
+    Any, Dict, Generic, Hashable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+)
+
+T = TypeVar("T")
+
+
+class FairShare:
+    """
+    Start-time fair queuing clock.
+    
+    Every flow (an API key) is charged `cost / weight` of virtual time per
+    job. The next job to serve is the one with the smallest start tag, so
+    backlogged flows share capacity in proportion to their weights while
+    a flow that was idle starts at the current virtual time instead of
+    cashing in credit it did not use.
+    """
+    
+    def __init__(self):
+        self.virtual_time = 0.0
+        self._finish: Dict[Hashable, float] = {}
+    
+    def start_tag(self, flow: Hashable) -> float:
+        """Virtual time at which the flow's next job would start."""
+        return max(self.virtual_time, self._finish.get(flow, 0.0))
+    
+    def charge(self, flow: Hashable, weight: float = 1.0, cost: float = 1.0) -> float:
+        """Account one job to a flow and return its start tag."""
+        start = self.start_tag(flow)
+        self._finish[flow] = start + cost / max(weight, 1e-6)
+        return start
+    
+    def advance(self, start: float):
+        """Move virtual time to the start tag of the job being served."""
+        self.virtual_time = max(self.virtual_time, start)
+        if len(self._finish) > 1024:
+            # Flows that caught up with virtual time have no state to keep
+            self._finish = {
+                flow: finish for flow, finish in self._finish.items()
+                if finish > self.virtual_time
+            }
+
+
+class FairQueue(Generic[T]):
+    """Queue that releases items in weighted fair order across flows."""
+    
+    def __init__(self):
+        self.clock = FairShare()
+        self._heap: List[Tuple[float, int, Hashable, T]] = []
+        self._sequence = itertools.count()
+        self._per_flow: Dict[Hashable, int] = {}
+    
+    def push(self, item: T, flow: Hashable = None, weight: float = 1.0, cost: float = 1.0):
+        """Queue an item for a flow; within a flow items stay in FIFO order."""
+        start = self.clock.charge(flow, weight, cost)
+        heapq.heappush(self._heap, (start, next(self._sequence), flow, item))
+        self._per_flow[flow] = self._per_flow.get(flow, 0) + 1
+    
+    def pop(self) -> T:
+        """Remove the item that is next in fair order."""
+        start, _, flow, item = heapq.heappop(self._heap)
+        self.clock.advance(start)
+        remaining = self._per_flow[flow] - 1
+        if remaining:
+            self._per_flow[flow] = remaining
+        else:
+            del self._per_flow[flow]
+        return item
+    
+    def peek(self) -> Optional[T]:
+        """The item `pop` would return, if any."""
+        return self._heap[0][3] if self._heap else None
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+    
+    def __iter__(self) -> Iterator[T]:
+        """Queued items in no particular order."""
+        return (entry[3] for entry in self._heap)
+    
+    def backlog(self) -> Dict[Any, int]:
+        """Number of queued items per flow."""
+        return dict(self._per_flow)
+
+
+def aged_rank(rank: int, waited: float, aging: float) -> int:
+    """
+    Rank of a priority class after aging; lower ranks are served first.
+    
+    A class moves up one rank for every `aging` seconds its oldest job has
+    waited, so lower classes cannot starve. An `aging` of 0 disables it.
+    """
+    if aging <= 0:
+        return rank
+    return rank - int(waited // aging)
+
+
+class PriorityFairQueue(Generic[T]):
+    """
+    Fair queues per priority class, served highest class first.
+    
+    Priorities only decide which waiting item goes next; nothing that has
+    been popped is preempted. Within a class items are released in weighted
+    fair order across flows. Classes age by `aged_rank`, with ties going to
+    the class whose oldest item has waited longest.
+    """
+    
+    def __init__(self, levels: Sequence[Hashable], aging: float = 0.0):
+        self.levels = tuple(levels)
+        self.aging = aging
+        self._queues: Dict[Hashable, FairQueue[Tuple[float, T]]] = {
+            level: FairQueue() for level in self.levels
+        }
+    
+    def push(
+        self,
+        item: T,
+        priority: Hashable,
+        flow: Hashable = None,
+        weight: float = 1.0,
+        cost: float = 1.0,
+        enqueued_at: Optional[float] = None
+    ):
+        """
+        Queue an item in a priority class.
+        
+        Args:
+            enqueued_at: `time.monotonic()` at which the item started
+                waiting, for aging; defaults to now
+        """
+        if enqueued_at is None:
+            enqueued_at = time.monotonic()
+        self._queues[priority].push((enqueued_at, item), flow, weight, cost)
+    
+    def next_level(self) -> Optional[Hashable]:
+        """The class `pop` would serve, if any item is queued."""
+        now = time.monotonic()
+        best = None
+        for rank, level in enumerate(self.levels):
+            queue = self._queues[level]
+            if not queue:
+                continue
+            oldest = min(enqueued_at for enqueued_at, _ in queue)
+            key = (aged_rank(rank, now - oldest, self.aging), oldest)
+            if best is None or key < best[0]:
+                best = (key, level)
+        return best[1] if best else None
+    
+    def pop(self) -> T:
+        """Remove the next item by aged priority, then fair order."""
+        level = self.next_level()
+        if level is None:
+            raise IndexError("pop from an empty queue")
+        return self._queues[level].pop()[1]
+    
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+    
+    def __bool__(self) -> bool:
+        return any(self._queues.values())
+    
+    def __iter__(self) -> Iterator[T]:
+        """Queued items in no particular order."""
+        for queue in self._queues.values():
+            for _, item in queue:
+                yield item
+    
+    def count(self, priority: Hashable) -> int:
+        """Number of queued items in a class."""
+        return len(self._queues[priority])
+    
+    def depth(self) -> Dict[Any, int]:
+        """Number of queued items per class."""
+        return {level: len(queue) for level, queue in self._queues.items()}
+    
+    def backlog(self) -> Dict[Any, int]:
+        """Number of queued items per flow, across classes."""
+        totals: Dict[Any, int] = {}
+        for queue in self._queues.values():
+            for flow, count in queue.backlog().items():
+                totals[flow] = totals.get(flow, 0) + count
+        return totals
@@ -0,0 +1,132 @@
+"""Content-addressed storage and preprocessing cache for garment images."""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..core.config import settings
+from ..utils import ImageProcessor
+
+_GARMENT_NAME = re.compile(r"^garment_([0-9a-f]{64})\.jpg$")
+
+
+class GarmentCache:
+    """
+    Stores each distinct garment image once, keyed by its SHA-256.
+
+    Model-ready tensors from `prepare_for_model` are kept in an LRU memory
+    tier bounded by `max_bytes`, backed by `.npy` files on disk that are
+    opened memory-mapped. A garment seen before therefore skips decoding,
+    validation, re-encoding and resizing entirely.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._root = root
+        self.max_bytes = settings.GARMENT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self._tensors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def root(self) -> str:
+        return self._root or os.path.join(settings.UPLOAD_DIR, "garments")
+
+    @property
+    def tensor_dir(self) -> str:
+        return os.path.join(self.root, "tensors")
+
+    def image_path(self, garment_hash: str) -> str:
+        """Path of the stored JPEG for a garment hash."""
+        return os.path.join(self.root, f"garment_{garment_hash}.jpg")
+
+    def tensor_path(self, garment_hash: str) -> str:
+        """Path of the preprocessed `.npy` tensor for a garment hash."""
+        return os.path.join(self.tensor_dir, f"{garment_hash}.npy")
+
+    @staticmethod
+    def hash_from_path(image_path: str) -> Optional[str]:
+        """Extract the content hash from a stored garment path, if any."""
+        match = _GARMENT_NAME.match(os.path.basename(image_path))
+        return match.group(1) if match else None
+
+    def get_tensor(self, garment_hash: str) -> Optional[np.ndarray]:
+        """
+        Get the model-ready CHW float32 tensor for a stored garment.
+
+        Returns:
+            Read-only tensor, or None if the garment image cannot be loaded
+        """
+        with self._lock:
+            tensor = self._tensors.get(garment_hash)
+            if tensor is not None:
+                self._tensors.move_to_end(garment_hash)
+                self.memory_hits += 1
+                return tensor
+
+        tensor_path = self.tensor_path(garment_hash)
+        try:
+            tensor = np.ascontiguousarray(np.load(tensor_path, mmap_mode="r"))
+            self.disk_hits += 1
+        except (OSError, ValueError):
+            tensor = self._build_tensor(garment_hash)
+            if tensor is None:
+                return None
+            self.misses += 1
+
+        tensor.setflags(write=False)
+        self._remember(garment_hash, tensor)
+        return tensor
+
+    def _build_tensor(self, garment_hash: str) -> Optional[np.ndarray]:
+        """Decode and preprocess a garment, persisting the tensor to disk."""
+        try:
+            tensor = ImageProcessor.pipeline(self.image_path(garment_hash)).to_model_input()
+        except ValueError:
+            return None
+
+        os.makedirs(self.tensor_dir, exist_ok=True)
+        tensor_path = self.tensor_path(garment_hash)
+        tmp_path = f"{tensor_path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        np.save(tmp_path, tensor)
+        os.replace(tmp_path, tensor_path)
+        return tensor
+
+    def _remember(self, garment_hash: str, tensor: np.ndarray):
+        """Insert a tensor into the memory tier, evicting to fit the budget."""
+        if tensor.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._tensors.pop(garment_hash, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            while self._tensors and self._bytes + tensor.nbytes > self.max_bytes:
+                _, evicted = self._tensors.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+            self._tensors[garment_hash] = tensor
+            self._bytes += tensor.nbytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit counters."""
+        return {
+            "entries": len(self._tensors),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+garment_cache = GarmentCache()
@@ -0,0 +1,304 @@
+"""Bounded worker pool for running try-on inference off the event loop."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from ..core.config import settings
+from ..core.metrics import INFLIGHT_JOBS, QUEUE_DEPTH, STAGE_SECONDS, WORKER_UTILIZATION
+
+logger = logging.getLogger(__name__)
+
+# Each pool worker (thread or process) keeps its own service and model
+_worker_state = threading.local()
+
+
+def _init_worker(warmup_runs: int = 0):
+    """Load and warm up a dedicated service and model for the current pool worker."""
+    from .tryon_service import VirtualTryOnService
+
+    service = VirtualTryOnService()
+    _worker_state.service = service
+    try:
+        service.load_model()
+        if warmup_runs:
+            service.warm_up(warmup_runs)
+    except Exception as e:
+        # A failed initializer breaks the whole pool; retry on first use instead
+        logger.error("Loading the try-on model failed: %s", e)
+
+
+def get_worker_service():
+    """Get the try-on service owned by the current pool worker."""
+    if getattr(_worker_state, "service", None) is None:
+        _init_worker()
+    return _worker_state.service
+
+
+def run_process_tryon(
+    person_image_path: str,
+    garment_image_path: str,
+    pose: str,
+    output_path: str
+):
+    """Run `VirtualTryOnService.process_tryon` inside a pool worker."""
+    return get_worker_service().process_tryon(
+        person_image_path,
+        garment_image_path,
+        pose,
+        output_path
+    )
+
+
+def run_process_tryon_batch(jobs):
+    """Run `VirtualTryOnService.process_tryon_batch` inside a pool worker."""
+    return get_worker_service().process_tryon_batch(jobs)
+
+
+def run_model_info():
+    """Report the model of a pool worker, loading it if its initializer could not."""
+    service = get_worker_service()
+    service.load_model()
+    return service.model_info()
+
+
+def run_preprocess_garments(garment_hashes):
+    """Preprocess catalog garments inside a pool worker."""
+    service = get_worker_service()
+    return [service.preprocess_garment(garment_hash) for garment_hash in garment_hashes]
+
+
+class QueueFullError(Exception):
+    """Raised when the executor cannot admit any more jobs."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Runs blocking inference work on a thread or process pool.
+
+    At most `max_workers` jobs run at once; up to `max_queue_size` more may
+    wait for a free worker. Anything beyond that is rejected with
+    `QueueFullError` so callers can apply backpressure.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        retry_after: Optional[int] = None,
+        warmup_runs: Optional[int] = None
+    ):
+        self.mode = mode or settings.INFERENCE_EXECUTOR
+        if self.mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported inference executor: {self.mode}")
+
+        self.max_workers = max_workers or settings.INFERENCE_WORKERS
+        self.max_queue_size = (
+            settings.INFERENCE_QUEUE_SIZE if max_queue_size is None else max_queue_size
+        )
+        self.retry_after = (
+            settings.INFERENCE_RETRY_AFTER if retry_after is None else retry_after
+        )
+        self.warmup_runs = (
+            settings.MODEL_WARMUP_RUNS if warmup_runs is None else warmup_runs
+        )
+
+        self._pool: Optional[Executor] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._running = 0
+        self._admitted = 0
+        self._models: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of running plus queued jobs."""
+        return self.max_workers + self.max_queue_size
+
+    def start(self):
+        """Create the worker pool."""
+        if self._pool is not None:
+            return
+
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.warmup_runs,)
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="tryon-worker",
+                initializer=_init_worker,
+                initargs=(self.warmup_runs,)
+            )
+
+    async def shutdown(self):
+        """Wait for running jobs and tear down the worker pool."""
+        pool, self._pool = self._pool, None
+        self._models.clear()
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, True)
+
+    def reserve(self, force: bool = False):
+        """
+        Admit one job, raising `QueueFullError` if the queue is full.
+
+        Every successful reservation must be followed by `run(..., reserved=True)`
+        or `release()`. With `force`, the job is admitted even past capacity;
+        this is used for jobs that were already accepted earlier, such as
+        recovered or retried ones.
+        """
+        if not force and self._admitted >= self.capacity:
+            raise QueueFullError(self.retry_after)
+        self._admitted += 1
+
+    def release(self):
+        """Give back a reservation."""
+        self._admitted = max(0, self._admitted - 1)
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        reserved: bool = False,
+        queued_since: Optional[Sequence[float]] = None,
+        worker_held: bool = False
+    ) -> Any:
+        """
+        Run `func(*args)` on the pool once a worker is free.
+
+        Args:
+            func: Picklable module-level callable
+            *args: Positional arguments for `func`
+            reserved: Whether `reserve()` was already called for this job
+            queued_since: `time.monotonic()` at which each job carried by
+                this call was queued; defaults to now
+            worker_held: Whether the caller already got a worker from
+                `acquire_worker()`; it is released when the call ends
+        """
+        if not reserved:
+            self.reserve()
+
+        try:
+            entered = time.monotonic()
+            if not worker_held:
+                await self.acquire_worker()
+            started = time.monotonic()
+            for queued_at in queued_since or (entered,):
+                STAGE_SECONDS.observe(started - queued_at, stage="queue_wait")
+            try:
+                self.start()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, func, *args)
+            finally:
+                self.release_worker()
+        finally:
+            self.release()
+
+    async def acquire_worker(self):
+        """Wait until a pool worker is available; pair with `release_worker`."""
+        if self._running < self.max_workers and not self._waiters:
+            self._running += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The worker slot was already handed to us, pass it on
+                self.release_worker()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release_worker(self):
+        """Hand the worker slot to the next waiter or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+    async def load_models(self) -> List[Dict[str, Any]]:
+        """
+        Start pool workers and wait for their models to be ready.
+
+        Workers load and warm up their model in the pool initializer, so any
+        worker the pool starts later is also ready before its first job.
+        One call is submitted per worker slot, but an idle worker may pick
+        up several of them, so fewer than `max_workers` workers can report.
+
+        Holds all worker slots while it runs, so it should be called before
+        jobs are submitted, e.g. at startup.
+
+        Returns:
+            Model info reported by each distinct worker
+        """
+        self.start()
+        reports = await asyncio.gather(
+            *(self._report_worker() for _ in range(self.max_workers))
+        )
+        for report in reports:
+            self._models[report["worker"]] = report
+        return list({report["worker"]: report for report in reports}.values())
+
+    async def _report_worker(self) -> Dict[str, Any]:
+        await self.acquire_worker()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, run_model_info)
+        finally:
+            self.release_worker()
+
+    def model_stats(self) -> Dict[str, Any]:
+        """Backend and the slowest load and warm-up times over reported workers."""
+        reports = list(self._models.values())
+
+        def slowest(field: str) -> Optional[float]:
+            values = [report[field] for report in reports if report[field] is not None]
+            return max(values) if values else None
+
+        return {
+            "backend": reports[0]["backend"] if reports else None,
+            "version": settings.MODEL_VERSION,
+            "preloaded": bool(reports),
+            "workers_ready": len(reports),
+            "load_seconds": slowest("load_seconds"),
+            "warmup_seconds": slowest("warmup_seconds"),
+            "workers": reports,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of executor utilisation."""
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "running": self._running,
+            "queued": len(self._waiters),
+            "admitted": self._admitted,
+            "capacity": self.capacity,
+        }
+
+
+inference_executor = InferenceExecutor()
+
+QUEUE_DEPTH.set_function(
+    lambda: max(0, inference_executor._admitted - inference_executor._running)
+)
+INFLIGHT_JOBS.set_function(lambda: inference_executor._admitted)
+WORKER_UTILIZATION.set_function(
+    lambda: inference_executor._running / inference_executor.max_workers
+)
@@ -0,0 +1,344 @@
+"""Durable try-on job queue backed by the `tryon_requests` table."""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update, or_
+
+from ..core.config import settings
+from ..core.metrics import STAGE_SECONDS
+from ..models.database import TryOnRequest
+from ..models.schemas import TryOnPriority
+from .api_key_index import api_key_index
+from .fair_queue import FairShare, aged_rank
+from .status_writer import StatusWriter, status_writer
+
+
+class JobQueue:
+    """
+    Persistent job queue using `TryOnRequest` rows as jobs.
+
+    A job is claimed by atomically flipping its status from `pending` to
+    `processing` and stamping a lease owner and expiry. Workers extend the
+    lease with heartbeats; leases that expire (for example because the
+    process died) are returned to `pending` by `recover_stale_leases`, or
+    marked `failed` once the job has used up `JOB_MAX_ATTEMPTS`.
+
+    Claims are written immediately; final transitions go through a
+    `StatusWriter` that commits them in batches. Workers that poll for
+    work claim the highest priority class first, aged by
+    `PRIORITY_AGING_SECONDS`, and within a class in weighted fair order
+    across API keys rather than strictly oldest first.
+    """
+
+    def __init__(self, session_maker=None, writer: Optional[StatusWriter] = None):
+        self._session_maker = session_maker
+        if writer is None:
+            writer = StatusWriter(session_maker) if session_maker is not None else status_writer
+        self.writer = writer
+        self.fair_shares: Dict[str, FairShare] = {
+            priority.value: FairShare() for priority in TryOnPriority
+        }
+
+    @property
+    def session_maker(self):
+        if self._session_maker is None:
+            from .database_service import db_service
+            self._session_maker = db_service.async_session_maker
+        return self._session_maker
+
+    @staticmethod
+    def _lease_expiry(now: datetime) -> datetime:
+        return now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """Exponential backoff delay in seconds before the next attempt."""
+        delay = settings.JOB_RETRY_BACKOFF * (2 ** max(0, attempts - 1))
+        return min(delay, settings.JOB_RETRY_BACKOFF_MAX)
+
+    async def claim(
+        self,
+        worker_id: str,
+        request_id: Optional[int] = None
+    ) -> Optional[TryOnRequest]:
+        """
+        Claim a pending job for `worker_id`.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            request_id: Claim this specific job instead of the oldest one
+
+        Returns:
+            The claimed request, or None if nothing could be claimed
+        """
+        # A requeue of this job may still be buffered
+        if request_id is not None and self.writer.pending(request_id):
+            await self.writer.flush()
+
+        async with self.session_maker() as session:
+            returning = session.get_bind().dialect.update_returning
+
+            # Another worker may win the race for a candidate; try the next one
+            for _ in range(5):
+                now = datetime.utcnow()
+                if request_id is None:
+                    picked = await self._fair_candidate(session, now)
+                    if picked is None:
+                        return None
+                    priority, flow, candidate = picked
+                else:
+                    priority, flow, candidate = None, None, request_id
+
+                statement = (
+                    update(TryOnRequest)
+                    .where(TryOnRequest.id == candidate)
+                    .where(TryOnRequest.status == "pending")
+                    .where(or_(
+                        TryOnRequest.available_at.is_(None),
+                        TryOnRequest.available_at <= now
+                    ))
+                    .values(
+                        status="processing",
+                        lease_owner=worker_id,
+                        lease_expires_at=self._lease_expiry(now),
+                        attempts=TryOnRequest.attempts + 1,
+                        updated_at=now
+                    )
+                )
+                if returning:
+                    # Claim and read the job in one statement
+                    result = await session.execute(
+                        statement.returning(TryOnRequest),
+                        execution_options={"populate_existing": True}
+                    )
+                    job = result.scalar_one_or_none()
+                    with STAGE_SECONDS.time(stage="db_commit"):
+                        await session.commit()
+                    if job is not None:
+                        self._charge(priority, flow, request_id)
+                        return job
+                else:
+                    result = await session.execute(statement)
+                    with STAGE_SECONDS.time(stage="db_commit"):
+                        await session.commit()
+                    if result.rowcount == 1:
+                        self._charge(priority, flow, request_id)
+                        result = await session.execute(
+                            select(TryOnRequest).where(TryOnRequest.id == candidate)
+                        )
+                        return result.scalar_one()
+
+                if request_id is not None:
+                    return None
+
+        return None
+
+    async def _fair_candidate(
+        self,
+        session,
+        now: datetime
+    ) -> Optional[Tuple[str, Optional[int], int]]:
+        """
+        Pick the next job to claim by priority, then fairly across API keys.
+
+        Looks at the oldest ready job of every priority and key, picks the
+        class with the best aged rank and, within it, the key furthest
+        behind its fair share.
+
+        Returns:
+            Tuple of (priority, API key ID, request ID), or None if no job
+            is ready
+        """
+        result = await session.execute(
+            select(
+                TryOnRequest.priority,
+                TryOnRequest.api_key_id,
+                func.min(TryOnRequest.id),
+                func.min(func.coalesce(TryOnRequest.available_at, TryOnRequest.created_at))
+            )
+            .where(TryOnRequest.status == "pending")
+            .where(or_(
+                TryOnRequest.available_at.is_(None),
+                TryOnRequest.available_at <= now
+            ))
+            .group_by(TryOnRequest.priority, TryOnRequest.api_key_id)
+        )
+        heads = result.all()
+        if not heads:
+            return None
+
+        # Oldest ready time per class, for aging
+        ranks = {priority.value: rank for rank, priority in enumerate(TryOnPriority)}
+        oldest: Dict[str, datetime] = {}
+        for priority, _, _, ready_at in heads:
+            ready_at = ready_at or now
+            if priority not in oldest or ready_at < oldest[priority]:
+                oldest[priority] = ready_at
+        level = min(oldest, key=lambda priority: (
+            aged_rank(
+                ranks.get(priority, len(ranks)),
+                (now - oldest[priority]).total_seconds(),
+                settings.PRIORITY_AGING_SECONDS
+            ),
+            oldest[priority]
+        ))
+
+        fair_share = self._fair_share(level)
+        _, flow, candidate, _ = min(
+            (head for head in heads if head[0] == level),
+            key=lambda head: (fair_share.start_tag(head[1]), head[2])
+        )
+        return level, flow, candidate
+
+    def _fair_share(self, priority: str) -> FairShare:
+        if priority not in self.fair_shares:
+            self.fair_shares[priority] = FairShare()
+        return self.fair_shares[priority]
+
+    def _charge(self, priority: Optional[str], flow: Optional[int], request_id: Optional[int]):
+        """Account a claimed job to its key's fair share within its class."""
+        if request_id is None:
+            fair_share = self._fair_share(priority)
+            fair_share.advance(fair_share.charge(flow, api_key_index.weight(flow)))
+
+    async def heartbeat(self, request_id: int, worker_id: str) -> bool:
+        """Extend the lease on a job. Returns False if the lease was lost."""
+        async with self.session_maker() as session:
+            result = await session.execute(
+                update(TryOnRequest)
+                .where(TryOnRequest.id == request_id)
+                .where(TryOnRequest.status == "processing")
+                .where(TryOnRequest.lease_owner == worker_id)
+                .values(lease_expires_at=self._lease_expiry(datetime.utcnow()))
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def complete(
+        self,
+        request_id: int,
+        worker_id: str,
+        result_image_path: str,
+        processing_time: Optional[float]
+    ) -> bool:
+        """Mark a leased job as completed."""
+        return await self._finish(
+            request_id,
+            worker_id,
+            status="completed",
+            result_image_path=result_image_path,
+            error_message=None,
+            processing_time=processing_time
+        )
+
+    async def fail(
+        self,
+        request_id: int,
+        worker_id: str,
+        error_message: Optional[str],
+        processing_time: Optional[float] = None,
+        retry: bool = False,
+        attempts: Optional[int] = None
+    ) -> bool:
+        """
+        Record a failed attempt.
+
+        If `retry` is set and the job has attempts left, it goes back to
+        `pending` with a backoff delay; otherwise it is marked `failed`.
+        Pass the claimed job's `attempts` to save a query.
+
+        Returns:
+            True if the job was requeued for another attempt
+        """
+        if retry and attempts is None:
+            async with self.session_maker() as session:
+                result = await session.execute(
+                    select(TryOnRequest.attempts)
+                    .where(TryOnRequest.id == request_id)
+                    .where(TryOnRequest.lease_owner == worker_id)
+                )
+                attempts = result.scalar_one_or_none()
+
+        if retry and attempts is not None and attempts < settings.JOB_MAX_ATTEMPTS:
+            now = datetime.utcnow()
+            requeued = await self._finish(
+                request_id,
+                worker_id,
+                status="pending",
+                error_message=error_message,
+                available_at=now + timedelta(seconds=self.retry_delay(attempts))
+            )
+            return requeued
+
+        await self._finish(
+            request_id,
+            worker_id,
+            status="failed",
+            result_image_path=None,
+            error_message=error_message,
+            processing_time=processing_time
+        )
+        return False
+
+    async def _finish(self, request_id: int, worker_id: str, **values) -> bool:
+        """Release the lease on a job and apply final column values in the next batch."""
+        return await self.writer.write(request_id, worker_id, **values)
+
+    async def recover_stale_leases(self) -> int:
+        """
+        Release jobs whose lease has expired.
+
+        Jobs with attempts left go back to `pending`; jobs that have used up
+        `JOB_MAX_ATTEMPTS` are marked `failed`, so a job that keeps killing
+        its worker is not retried forever.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        now = datetime.utcnow()
+        stale = update(TryOnRequest).where(
+            TryOnRequest.status == "processing",
+            or_(
+                TryOnRequest.lease_expires_at.is_(None),
+                TryOnRequest.lease_expires_at < now
+            )
+        )
+        released = dict(lease_owner=None, lease_expires_at=None, updated_at=now)
+        async with self.session_maker() as session:
+            failed = await session.execute(
+                stale
+                .where(TryOnRequest.attempts >= settings.JOB_MAX_ATTEMPTS)
+                .values(
+                    status="failed",
+                    result_image_path=None,
+                    error_message="Lease expired after the maximum number of attempts",
+                    **released
+                )
+            )
+            requeued = await session.execute(
+                stale
+                .where(TryOnRequest.attempts < settings.JOB_MAX_ATTEMPTS)
+                .values(status="pending", available_at=now, **released)
+            )
+            await session.commit()
+            return failed.rowcount + requeued.rowcount
+
+    async def ready_job_ids(self, limit: int = 100) -> List[int]:
+        """IDs of pending jobs that may be claimed now."""
+        now = datetime.utcnow()
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(TryOnRequest.id)
+                .where(TryOnRequest.status == "pending")
+                .where(or_(
+                    TryOnRequest.available_at.is_(None),
+                    TryOnRequest.available_at <= now
+                ))
+                .order_by(TryOnRequest.id)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+
+
+job_queue = JobQueue()
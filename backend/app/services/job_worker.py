@@ -0,0 +1,286 @@
+"""Try-on workers that claim and execute jobs from the durable queue."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, Set
+
+from ..core.config import settings
+from ..core.metrics import REQUESTS_TOTAL
+from ..models.database import TryOnRequest
+from ..models.schemas import TryOnStatus, TryOnStatusEvent
+from ..utils import generate_filename, result_image_url
+from .api_key_index import api_key_index
+from .batch_scheduler import BatchScheduler, batch_scheduler
+from .inference_executor import InferenceExecutor, inference_executor
+from .job_queue import JobQueue, job_queue
+from .result_cache import result_cache
+from .status_broker import StatusBroker, status_broker, status_event
+from .status_cache import status_cache
+
+logger = logging.getLogger(__name__)
+
+
+def make_worker_id() -> str:
+    """Build a worker identifier unique across hosts and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class TryOnWorker:
+    """
+    Executes try-on jobs claimed from a `JobQueue`.
+
+    In `local` queue mode the API process dispatches each new request to
+    `dispatch()` right after it is created. In `worker` mode standalone
+    processes (see `worker.py`) call `run_forever()` to poll for jobs.
+    Either way, jobs hold a lease that is renewed by heartbeats while the
+    inference runs.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        executor: Optional[InferenceExecutor] = None,
+        scheduler: Optional[BatchScheduler] = None,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        broker: Optional[StatusBroker] = None
+    ):
+        self.queue = queue or job_queue
+        self.broker = broker or status_broker
+        self.executor = executor or inference_executor
+        if scheduler is None:
+            scheduler = (
+                batch_scheduler if self.executor is inference_executor
+                else BatchScheduler(self.executor)
+            )
+        self.scheduler = scheduler
+        self.worker_id = worker_id or make_worker_id()
+        # Claim enough jobs to keep every worker busy with full batches
+        self.concurrency = concurrency or (
+            self.executor.max_workers * self.scheduler.max_batch_size
+        )
+
+        self._tasks: Set[asyncio.Task] = set()
+        self._active: Set[int] = set()
+        self._recovery_task: Optional[asyncio.Task] = None
+
+    async def process_job(self, job: TryOnRequest) -> bool:
+        """
+        Run a claimed job to completion.
+
+        Consumes one executor reservation, which the caller must hold.
+
+        Returns:
+            True if the job failed transiently and was requeued
+        """
+        output_path = os.path.join(
+            settings.UPLOAD_DIR, "results", generate_filename("result", "jpg")
+        )
+
+        status_cache.invalidate(job.id)
+        self.broker.publish(status_event(job))
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            success, error_msg, proc_time = await self.scheduler.submit(
+                (job.user_image_path, job.garment_image_path, job.pose, output_path),
+                flow=job.api_key_id,
+                weight=api_key_index.weight(job.api_key_id),
+                priority=job.priority,
+                waited=self._ready_for(job)
+            )
+        except Exception as e:
+            # Pool failures are infrastructure errors and worth retrying
+            logger.warning("Try-on job %s failed on the pool: %s", job.id, e)
+            requeued = await self.queue.fail(
+                job.id, self.worker_id, str(e), retry=True, attempts=job.attempts
+            )
+            REQUESTS_TOTAL.inc(status="retried" if requeued else "failed", pose=job.pose)
+            self._publish(
+                job.id,
+                TryOnStatus.PENDING if requeued else TryOnStatus.FAILED,
+                error_message=None if requeued else str(e)
+            )
+            return requeued
+        finally:
+            heartbeat.cancel()
+
+        if success:
+            await self.queue.complete(job.id, self.worker_id, output_path, proc_time)
+            if job.result_key:
+                result_cache.put(job.result_key, output_path)
+            REQUESTS_TOTAL.inc(status="completed", pose=job.pose)
+            self._publish(
+                job.id,
+                TryOnStatus.COMPLETED,
+                result_image_url=result_image_url(output_path),
+                processing_time=proc_time
+            )
+        else:
+            await self.queue.fail(job.id, self.worker_id, error_msg, proc_time)
+            REQUESTS_TOTAL.inc(status="failed", pose=job.pose)
+            self._publish(
+                job.id,
+                TryOnStatus.FAILED,
+                error_message=error_msg,
+                processing_time=proc_time
+            )
+        return False
+
+    @staticmethod
+    def _ready_for(job: TryOnRequest) -> float:
+        """Seconds a claimed job waited in the queue since it became ready."""
+        ready_at = job.available_at or job.created_at
+        if ready_at is None:
+            return 0.0
+        return max(0.0, (datetime.utcnow() - ready_at).total_seconds())
+
+    def _publish(self, request_id: int, status: TryOnStatus, **fields):
+        """Push a status transition to streaming and polling clients."""
+        status_cache.invalidate(request_id)
+        self.broker.publish(TryOnStatusEvent(request_id=request_id, status=status, **fields))
+
+    async def _heartbeat(self, request_id: int):
+        """Renew the lease on a job until cancelled."""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                if not await self.queue.heartbeat(request_id, self.worker_id):
+                    logger.warning("Lost lease on try-on job %s", request_id)
+                    return
+            except Exception as e:
+                logger.warning("Heartbeat for try-on job %s failed: %s", request_id, e)
+
+    async def process_request(self, request_id: int, reserved: bool = False):
+        """
+        Claim and run a specific job, retrying in place with backoff.
+
+        Args:
+            request_id: ID of the try-on request to run
+            reserved: Whether an executor slot was already reserved for it
+        """
+        if not reserved:
+            self.executor.reserve(force=True)
+
+        holding = True
+        self._active.add(request_id)
+        try:
+            while True:
+                job = await self.queue.claim(self.worker_id, request_id)
+                if job is None:
+                    return
+
+                holding = False
+                if not await self.process_job(job):
+                    return
+
+                await asyncio.sleep(self.queue.retry_delay(job.attempts))
+                self.executor.reserve(force=True)
+                holding = True
+        finally:
+            self._active.discard(request_id)
+            if holding:
+                self.executor.release()
+
+    def dispatch(self, request_id: int, reserved: bool = False) -> asyncio.Task:
+        """Process a request in the background of the current event loop."""
+        task = asyncio.create_task(self.process_request(request_id, reserved))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def recover(self) -> int:
+        """
+        Requeue expired leases and, in local mode, pick up ready jobs.
+
+        Returns:
+            Number of leases recovered
+        """
+        recovered = await self.queue.recover_stale_leases()
+        if recovered:
+            logger.info("Recovered %d stale try-on jobs", recovered)
+
+        if settings.JOB_QUEUE_MODE == "local":
+            for request_id in await self.queue.ready_job_ids():
+                if request_id not in self._active:
+                    self.dispatch(request_id)
+
+        return recovered
+
+    async def _recovery_loop(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                logger.warning("Try-on job recovery failed: %s", e)
+            await asyncio.sleep(settings.JOB_RECOVERY_INTERVAL)
+
+    async def start(self):
+        """Start periodic lease recovery for local mode."""
+        if self._recovery_task is None:
+            self._recovery_task = asyncio.create_task(self._recovery_loop())
+
+    async def shutdown(self):
+        """Stop recovery and cancel in-flight jobs; their leases will expire."""
+        await self.scheduler.shutdown()
+        tasks = list(self._tasks)
+        if self._recovery_task is not None:
+            tasks.append(self._recovery_task)
+            self._recovery_task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_claimed(self, job: TryOnRequest, slots: asyncio.Semaphore):
+        try:
+            await self.process_job(job)
+        except Exception as e:
+            logger.exception("Try-on job %s crashed: %s", job.id, e)
+        finally:
+            slots.release()
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None):
+        """Poll the queue and run jobs until `stop` is set."""
+        stop = stop or asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        last_recovery = 0.0
+
+        logger.info("Try-on worker %s started", self.worker_id)
+        while not stop.is_set():
+            if time.monotonic() - last_recovery >= settings.JOB_RECOVERY_INTERVAL:
+                await self.recover()
+                last_recovery = time.monotonic()
+
+            await slots.acquire()
+            self.executor.reserve(force=True)
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception:
+                self.executor.release()
+                slots.release()
+                raise
+
+            if job is None:
+                self.executor.release()
+                slots.release()
+                try:
+                    await asyncio.wait_for(stop.wait(), settings.JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_claimed(job, slots))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info("Try-on worker %s stopped", self.worker_id)
+
+
+tryon_worker = TryOnWorker()
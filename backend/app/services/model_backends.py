@@ -0,0 +1,206 @@
+"""Try-on model backends and the registry that selects one from config."""
+
+import abc
+import os
+from typing import Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+from ..core.config import settings
+
+
+class ModelBackend(abc.ABC):
+    """
+    Runs try-on inference on prepared batches.
+    
+    Backends take person and garment batches as NCHW float32 in [0, 1] and
+    return an NCHW float32 batch in [0, 1]. Exported models receive the
+    pose as a third int64 input, an index into `SUPPORTED_POSES`, if they
+    declare one.
+    """
+    
+    name = "base"
+    filename: Optional[str] = None  # weights file inside MODEL_WEIGHTS_DIR
+    
+    def __init__(self, weights_dir: Optional[str] = None):
+        self.weights_dir = weights_dir or settings.MODEL_WEIGHTS_DIR
+    
+    @property
+    def weights_path(self) -> Optional[str]:
+        if self.filename is None:
+            return None
+        return os.path.join(self.weights_dir, self.filename)
+    
+    def load(self):
+        """Load weights; called once per pool worker."""
+    
+    @abc.abstractmethod
+    def inference(
+        self,
+        person_batch: np.ndarray,
+        garment_batch: np.ndarray,
+        poses: Sequence[str]
+    ) -> np.ndarray:
+        """Run the model on one batch."""
+    
+    def _require_weights(self) -> str:
+        path = self.weights_path
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"{self.name} model weights not found: {path}")
+        return path
+
+
+def pose_indices(poses: Sequence[str]) -> np.ndarray:
+    """Poses as int64 indices into `SUPPORTED_POSES`."""
+    return np.array([settings.SUPPORTED_POSES.index(pose) for pose in poses], dtype=np.int64)
+
+
+class PlaceholderBackend(ModelBackend):
+    """
+    Compositor standing in for a real model.
+    
+    Places the half-size person and garment side by side to demonstrate
+    the API workflow without any weights.
+    """
+    
+    name = "placeholder"
+    
+    def inference(self, person_batch, garment_batch, poses):
+        return self.composite(person_batch, garment_batch)
+    
+    @staticmethod
+    def composite(person_batch: np.ndarray, garment_batch: np.ndarray) -> np.ndarray:
+        """Place half-size person and garment side by side with a white gap."""
+        n, c, h, w = person_batch.shape
+        gap = 20
+        
+        result = np.empty((n, c, h // 2, w + gap), dtype=np.float32)
+        result[:, :, :, w // 2:w // 2 + gap] = 1.0
+        
+        # 2x2 mean pooling down to half the model input size, written
+        # directly into each half of the canvas
+        PlaceholderBackend._pool_into(person_batch, result[:, :, :, :w // 2])
+        PlaceholderBackend._pool_into(garment_batch, result[:, :, :, w // 2 + gap:])
+        return result
+    
+    @staticmethod
+    def _pool_into(batch: np.ndarray, out: np.ndarray):
+        """2x2 mean-pool an NCHW batch into `out` without temporaries."""
+        np.add(batch[:, :, 0::2, 0::2], batch[:, :, 0::2, 1::2], out=out)
+        out += batch[:, :, 1::2, 0::2]
+        out += batch[:, :, 1::2, 1::2]
+        out *= np.float32(0.25)
+
+
+class OnnxRuntimeBackend(ModelBackend):
+    """ONNX model run with ONNX Runtime on the CPU."""
+    
+    name = "onnx"
+    filename = "model.onnx"
+    
+    def __init__(self, weights_dir: Optional[str] = None):
+        super().__init__(weights_dir)
+        self.session = None
+        self._inputs: List[str] = []
+        self._output: Optional[str] = None
+    
+    def load(self):
+        path = self._require_weights()
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError(
+                "MODEL_BACKEND=onnx requires onnxruntime (pip install onnxruntime)"
+            ) from e
+        
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.MODEL_NUM_THREADS:
+            options.intra_op_num_threads = settings.MODEL_NUM_THREADS
+        self.session = onnxruntime.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+        self._inputs = [model_input.name for model_input in self.session.get_inputs()]
+        self._output = self.session.get_outputs()[0].name
+    
+    def inference(self, person_batch, garment_batch, poses):
+        feeds = {
+            self._inputs[0]: np.ascontiguousarray(person_batch),
+            self._inputs[1]: np.ascontiguousarray(garment_batch),
+        }
+        if len(self._inputs) > 2:
+            feeds[self._inputs[2]] = pose_indices(poses)
+        return self.session.run([self._output], feeds)[0]
+
+
+class TorchScriptBackend(ModelBackend):
+    """TorchScript module run with PyTorch on the CPU."""
+    
+    name = "torchscript"
+    filename = "model.pt"
+    
+    def __init__(self, weights_dir: Optional[str] = None):
+        super().__init__(weights_dir)
+        self.module = None
+        self._torch = None
+        self._takes_pose = False
+    
+    def load(self):
+        path = self._require_weights()
+        try:
+            import torch
+        except ImportError as e:
+            raise RuntimeError(
+                "MODEL_BACKEND=torchscript requires torch (pip install torch)"
+            ) from e
+        
+        if settings.MODEL_NUM_THREADS:
+            torch.set_num_threads(settings.MODEL_NUM_THREADS)
+        self.module = torch.jit.load(path, map_location="cpu").eval()
+        # Arguments of forward() besides self
+        self._takes_pose = len(self.module.forward.schema.arguments) > 3
+        self._torch = torch
+    
+    def inference(self, person_batch, garment_batch, poses):
+        torch = self._torch
+        inputs = [torch.from_numpy(person_batch), torch.from_numpy(garment_batch)]
+        if self._takes_pose:
+            inputs.append(torch.from_numpy(pose_indices(poses)))
+        with torch.inference_mode():
+            output = self.module(*inputs)
+        return output.numpy()
+
+
+MODEL_BACKENDS: Dict[str, Type[ModelBackend]] = {
+    PlaceholderBackend.name: PlaceholderBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend,
+    TorchScriptBackend.name: TorchScriptBackend,
+}
+
+
+def resolve_backend_name(name: Optional[str] = None, weights_dir: Optional[str] = None) -> str:
+    """
+    Name of the backend to use.
+    
+    `auto` picks the first backend whose weights file is present in
+    `weights_dir`, and the placeholder if there is none.
+    """
+    name = name or settings.MODEL_BACKEND
+    if name != "auto":
+        if name not in MODEL_BACKENDS:
+            raise ValueError(f"Unknown model backend: {name}")
+        return name
+    
+    weights_dir = weights_dir or settings.MODEL_WEIGHTS_DIR
+    for backend in (OnnxRuntimeBackend, TorchScriptBackend):
+        if os.path.isfile(os.path.join(weights_dir, backend.filename)):
+            return backend.name
+    return PlaceholderBackend.name
+
+
+def create_model_backend(
+    name: Optional[str] = None,
+    weights_dir: Optional[str] = None
+) -> ModelBackend:
+    """Instantiate the configured backend without loading it."""
+    return MODEL_BACKENDS[resolve_backend_name(name, weights_dir)](weights_dir)
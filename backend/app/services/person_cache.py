@@ -0,0 +1,126 @@
+"""Session-scoped cache of per-person preprocessing results."""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+_PERSON_NAME = re.compile(r"^person_([0-9a-f]{64})\.jpg$")
+
+
+@dataclass
+class PersonFeatures:
+    """
+    Garment-independent work done for one person photo.
+    
+    Holds the model-ready tensor and pose validation results; parsing maps
+    and keypoints from a real model belong here as well.
+    """
+    tensor: np.ndarray  # read-only CHW float32 model input
+    pose_checks: Dict[str, bool] = field(default_factory=dict)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.tensor.nbytes
+
+
+class PersonFeatureCache:
+    """
+    Keeps person features for the length of a customer session.
+    
+    A kiosk reuses one customer photo for many garments, so features are
+    keyed by the photo's content hash and kept in an LRU bounded by
+    `max_bytes`. Entries expire `ttl` seconds after they were last used,
+    which ends a session once the customer stops trying things on.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_bytes = settings.PERSON_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttl = settings.PERSON_CACHE_TTL if ttl is None else ttl
+        
+        self._entries: "OrderedDict[str, Tuple[PersonFeatures, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+    
+    @staticmethod
+    def key_for_path(image_path: str) -> str:
+        """Cache key of a person photo: its content hash when stored by hash."""
+        match = _PERSON_NAME.match(os.path.basename(image_path))
+        return match.group(1) if match else os.path.abspath(image_path)
+    
+    def get(self, key: str) -> Optional[PersonFeatures]:
+        """Get live features for a person, extending their session."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            features, expires_at = entry
+            if expires_at <= now:
+                self._drop(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+            
+            self._entries[key] = (features, now + self.ttl)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return features
+    
+    def put(self, key: str, features: PersonFeatures):
+        """Remember features, evicting expired then least recently used entries."""
+        if features.nbytes > self.max_bytes:
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            self._drop(key)
+            
+            for stale in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+                self._drop(stale)
+                self.expired += 1
+            
+            while self._entries and self._bytes + features.nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+            
+            self._entries[key] = (features, now + self.ttl)
+            self._bytes += features.nbytes
+    
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0].nbytes
+    
+    def clear(self):
+        """Forget every cached person."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+        }
+
+
+person_cache = PersonFeatureCache()
@@ -0,0 +1,105 @@
+"""Per-API-key token bucket rate limiting."""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by API key.
+    
+    Each key may make `rate_per_minute` try-on requests per minute on
+    average and bursts of up to `burst`; no single call may cost more than
+    `burst`. Buckets live in this process, so
+    with several API processes behind a load balancer each one enforces
+    the quota separately; divide quotas accordingly.
+    """
+    
+    def __init__(self):
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._lock = threading.Lock()
+        
+        self.allowed = 0
+        self.limited = 0
+    
+    def acquire(
+        self,
+        key: Hashable,
+        rate_per_minute: float,
+        burst: Optional[int] = None,
+        cost: int = 1
+    ) -> float:
+        """
+        Take `cost` tokens from a key's bucket.
+        
+        A `rate_per_minute` of 0 or less means unlimited.
+        
+        Returns:
+            0 if allowed, else the seconds until enough tokens are available,
+            or infinity if `cost` exceeds the burst and can never be allowed
+        """
+        if rate_per_minute <= 0:
+            return 0.0
+        
+        capacity = self.capacity(burst)
+        if cost > capacity:
+            self.limited += 1
+            return math.inf
+        
+        rate = rate_per_minute / 60.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(capacity, now)
+            else:
+                bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * rate)
+                bucket.updated_at = now
+            
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                self.allowed += 1
+                return 0.0
+            
+            self.limited += 1
+            return (cost - bucket.tokens) / rate
+    
+    def refund(self, key: Hashable, burst: Optional[int] = None, cost: int = 1):
+        """Give back tokens taken for a request that was then rejected."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.tokens = min(self.capacity(burst), bucket.tokens + cost)
+    
+    @staticmethod
+    def capacity(burst: Optional[int]) -> int:
+        """Bucket size for a burst setting."""
+        return max(burst or 0, 1)
+    
+    def reset(self, key: Optional[Hashable] = None):
+        """Refill one key's bucket, or all of them."""
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Bucket count and decisions."""
+        return {
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+rate_limiter = RateLimiter()
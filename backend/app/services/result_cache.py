@@ -0,0 +1,236 @@
+"""Result deduplication cache for identical try-on inputs."""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.database import TryOnRequest
+from ..utils import content_hash
+from .result_delivery import result_delivery
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Maps (person hash, garment hash, pose, model version) to a result file.
+    
+    Completed `TryOnRequest` rows carry their `result_key`, so the database
+    is the shared index across API and worker processes; a small in-memory
+    LRU in front of it answers repeat lookups without a query. A periodic
+    sweep deletes result files past `RESULT_CACHE_TTL` and then the oldest
+    ones until `uploads/results` fits in `RESULT_CACHE_MAX_BYTES`, and
+    clears the result of the rows that pointed at them. A cache hit touches
+    the file, so a result that keeps being reused is not swept.
+    """
+    
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        results_dir: Optional[str] = None,
+        max_entries: int = 10000,
+        session_maker=None
+    ):
+        self.ttl = settings.RESULT_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = settings.RESULT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._results_dir = results_dir
+        self.max_entries = max_entries
+        self._session_maker = session_maker
+        
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._sweep_task: Optional[asyncio.Task] = None
+        
+        self.hits = 0
+        self.misses = 0
+        self.evicted_files = 0
+    
+    @property
+    def results_dir(self) -> str:
+        return self._results_dir or os.path.join(settings.UPLOAD_DIR, "results")
+    
+    @property
+    def session_maker(self):
+        if self._session_maker is None:
+            from .database_service import db_service
+            self._session_maker = db_service.async_session_maker
+        return self._session_maker
+    
+    @staticmethod
+    def _touch(path: str) -> bool:
+        """Mark a result as recently used; False if the file is gone."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+    
+    @staticmethod
+    def make_key(
+        person_hash: str,
+        garment_hash: str,
+        pose: str,
+        model_version: Optional[str] = None
+    ) -> str:
+        """Build the cache key for a set of try-on inputs."""
+        model_version = model_version or settings.MODEL_VERSION
+        return content_hash(
+            "|".join((person_hash, garment_hash, pose, model_version)).encode()
+        )
+    
+    def put(self, key: str, result_path: str):
+        """Remember a freshly produced result in the memory tier."""
+        self._entries.pop(key, None)
+        self._entries[key] = (result_path, time.monotonic() + self.ttl)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get(self, key: str, db: AsyncSession) -> Optional[str]:
+        """
+        Find an existing, unexpired result for `key`.
+        
+        Returns:
+            Path of the result image, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            path, expires_at = entry
+            if expires_at > time.monotonic() and self._touch(path):
+                self._entries[key] = (path, time.monotonic() + self.ttl)
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return path
+            del self._entries[key]
+        
+        result = await db.execute(
+            select(TryOnRequest.result_image_path, TryOnRequest.updated_at)
+            .where(TryOnRequest.result_key == key)
+            .where(TryOnRequest.status == "completed")
+            .where(TryOnRequest.updated_at >= datetime.utcnow() - timedelta(seconds=self.ttl))
+            .order_by(TryOnRequest.id.desc())
+            .limit(1)
+        )
+        row = result.first()
+        if row is not None and row.result_image_path and self._touch(row.result_image_path):
+            self.put(key, row.result_image_path)
+            self.hits += 1
+            return row.result_image_path
+        
+        self.misses += 1
+        return None
+    
+    async def sweep(self) -> int:
+        """
+        Delete expired result files, then the oldest until under budget.
+        
+        Rows that referenced a deleted file lose their `result_image_path`
+        and `result_key`, so neither the status API nor a later cache lookup
+        points at the missing file.
+        
+        Returns:
+            Number of files deleted
+        """
+        deleted = await asyncio.to_thread(self._delete_files)
+        if not deleted:
+            return 0
+        
+        gone = set(deleted)
+        for key in [key for key, (path, _) in self._entries.items() if path in gone]:
+            del self._entries[key]
+        for path in deleted:
+            result_delivery.evict(path)
+        
+        async with self.session_maker() as session:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(deleted), 500):
+                await session.execute(
+                    update(TryOnRequest)
+                    .where(TryOnRequest.result_image_path.in_(deleted[start:start + 500]))
+                    .values(result_image_path=None, result_key=None)
+                )
+            await session.commit()
+        
+        self.evicted_files += len(deleted)
+        return len(deleted)
+    
+    def _delete_files(self) -> List[str]:
+        """
+        Delete files from the results directory; returns their paths.
+        
+        A result and its renditions (`result_x.jpg`, `result_x.thumb.webp`,
+        ...) are kept or deleted together, aged by the most recently used
+        of them.
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.results_dir) if entry.is_file()]
+        except FileNotFoundError:
+            return []
+        
+        # result stem -> [latest mtime, total size, paths]
+        groups: Dict[str, list] = {}
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            group = groups.setdefault(entry.name.split(".", 1)[0], [0.0, 0, []])
+            group[0] = max(group[0], stat.st_mtime)
+            group[1] += stat.st_size
+            group[2].append(entry.path)
+        
+        total = sum(size for _, size, _ in groups.values())
+        cutoff = time.time() - self.ttl
+        deleted = []
+        for mtime, size, paths in sorted(groups.values(), key=lambda group: group[0]):
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                deleted.append(path)
+            total -= size
+        return deleted
+    
+    async def _sweep_loop(self):
+        while True:
+            try:
+                deleted = await self.sweep()
+                if deleted:
+                    logger.info("Evicted %d cached try-on results", deleted)
+            except Exception as e:
+                logger.warning("Result cache sweep failed: %s", e)
+            await asyncio.sleep(settings.RESULT_CACHE_SWEEP_INTERVAL)
+    
+    async def start(self):
+        """Start the periodic eviction sweep."""
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+    
+    async def shutdown(self):
+        """Stop the eviction sweep."""
+        task, self._sweep_task = self._sweep_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted_files": self.evicted_files,
+        }
+
+
+result_cache = ResultCache()
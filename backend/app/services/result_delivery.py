@@ -0,0 +1,284 @@
+"""Delivery of immutable try-on result files with HTTP caching."""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from ..core.config import settings
+
+# Result file names are random and never rewritten, so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header lies outside the file."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+    
+    Returns None when the whole file should be sent, including for
+    malformed or multi-part ranges, which servers may ignore.
+    
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the file
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = size - int(last), size - 1
+    except ValueError:
+        return None
+    
+    start = max(start, 0)
+    end = min(end, size - 1)
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, wildcard: bool = True) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag.
+    
+    `*` matches any ETag unless `wildcard` is False; callers that may not
+    have the resource must check it exists before honouring `*`.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if any(tag.removeprefix("W/") == etag for tag in candidates):
+        return True
+    return wildcard and "*" in candidates
+
+
+class ResultFileResponse(Response):
+    """
+    Send a file, or one byte range of it, without buffering it in memory.
+    
+    Uses the ASGI zero-copy send extension (sendfile) when the server
+    offers it and falls back to chunked reads otherwise.
+    """
+    
+    chunk_size = 256 * 1024
+    
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        media_type: str,
+        headers: Mapping[str, str],
+        byte_range: Optional[Tuple[int, int]] = None
+    ):
+        super().__init__(
+            status_code=206 if byte_range else 200,
+            headers=headers,
+            media_type=media_type
+        )
+        self.path = path
+        start, end = byte_range or (0, size - 1)
+        self.offset = start
+        self.count = end - start + 1
+        self.headers["content-length"] = str(self.count)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if scope.get("method") == "HEAD" or self.count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        
+        if ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": ZERO_COPY_EXTENSION,
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            return
+        
+        async with await anyio.open_file(self.path, "rb") as file:
+            await file.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class ResultDelivery:
+    """
+    Serves result files, answering what it can without touching the disk.
+    
+    Result names never get reused, so a file's name is a strong ETag and a
+    matching `If-None-Match` is answered with 304 straight away. Small,
+    recently served files are kept in an LRU memory tier bounded by
+    `max_bytes`; everything else is streamed from disk with range support.
+    Files deleted by the result cache sweep are dropped with `evict`.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None, max_file_bytes: Optional[int] = None):
+        self.max_bytes = settings.RESULT_HOT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_file_bytes = (
+            settings.RESULT_HOT_CACHE_MAX_FILE_BYTES if max_file_bytes is None else max_file_bytes
+        )
+        
+        self._files: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.not_modified = 0
+        self.memory_hits = 0
+        self.disk_reads = 0
+    
+    @staticmethod
+    def etag(path: str) -> str:
+        """Strong ETag of an immutable result file."""
+        return f'"{os.path.basename(path)}"'
+    
+    async def respond(
+        self,
+        request: Request,
+        path: str,
+        media_type: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Response]:
+        """
+        Build the response for a result file.
+        
+        Returns:
+            The response, or None if the file does not exist
+        """
+        headers = {
+            "ETag": self.etag(path),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+            **(headers or {}),
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if etag_matches(if_none_match, headers["ETag"]):
+            # An exact ETag names an immutable file the client already has;
+            # `*` only matches while the file exists
+            if not (
+                etag_matches(if_none_match, headers["ETag"], wildcard=False)
+                or self._exists(path)
+            ):
+                return None
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        
+        data = self._get(path)
+        if data is None:
+            try:
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                return None
+            if size <= self.max_file_bytes and size <= self.max_bytes:
+                data = await asyncio.to_thread(self._read, path)
+                if data is None:
+                    return None
+        else:
+            size = len(data)
+            self.memory_hits += 1
+        
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        
+        if data is None:
+            self.disk_reads += 1
+            return ResultFileResponse(path, size, media_type, headers, byte_range)
+        
+        if byte_range is None:
+            return Response(data, media_type=media_type, headers=headers)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return Response(
+            data[start:end + 1], status_code=206, media_type=media_type, headers=headers
+        )
+    
+    def evict(self, path: str):
+        """Forget a file that has been deleted."""
+        with self._lock:
+            data = self._files.pop(path, None)
+            if data is not None:
+                self._bytes -= len(data)
+    
+    def _exists(self, path: str) -> bool:
+        with self._lock:
+            if path in self._files:
+                return True
+        return os.path.exists(path)
+    
+    def _get(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._files.get(path)
+            if data is not None:
+                self._files.move_to_end(path)
+            return data
+    
+    def _read(self, path: str) -> Optional[bytes]:
+        """Read a small file and keep it in the memory tier."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        
+        self.disk_reads += 1
+        with self._lock:
+            previous = self._files.pop(path, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            while self._files and self._bytes + len(data) > self.max_bytes:
+                _, evicted = self._files.popitem(last=False)
+                self._bytes -= len(evicted)
+            self._files[path] = data
+            self._bytes += len(data)
+        return data
+    
+    def stats(self) -> Dict[str, Any]:
+        """Memory tier occupancy and response counters."""
+        return {
+            "entries": len(self._files),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "not_modified": self.not_modified,
+            "memory_hits": self.memory_hits,
+            "disk_reads": self.disk_reads,
+        }
+
+
+result_delivery = ResultDelivery()
@@ -0,0 +1,133 @@
+"""In-process pub/sub of try-on status transitions for streaming clients."""
+
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..models.database import TryOnRequest
+from ..models.schemas import TryOnStatusEvent
+from ..utils import result_image_url
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def status_event(request: TryOnRequest) -> TryOnStatusEvent:
+    """Build the streamed event for a try-on request row."""
+    return TryOnStatusEvent(
+        request_id=request.id,
+        status=request.status,
+        result_image_url=result_image_url(request.result_image_path),
+        error_message=request.error_message,
+        processing_time=request.processing_time
+    )
+
+
+class StatusBroker:
+    """
+    Fans status transitions out to clients waiting on a request.
+    
+    Workers publish each transition as it happens and every subscriber of
+    that request gets it on its own queue, so waiting clients cost no
+    database queries. The latest event per request is kept in a bounded
+    LRU so late subscribers start from the current state.
+    
+    When jobs run in separate worker processes (`JOB_QUEUE_MODE=worker`)
+    their transitions are not visible here; `start()` then runs a single
+    poll loop that reads the status of every watched request in one query
+    per `JOB_POLL_INTERVAL` and publishes the changes.
+    """
+    
+    def __init__(self, max_recent: int = 10000, queue_size: int = 8):
+        self.max_recent = max_recent
+        self.queue_size = queue_size
+        
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._recent: "OrderedDict[int, TryOnStatusEvent]" = OrderedDict()
+        self._poll_task: Optional[asyncio.Task] = None
+        
+        self.published = 0
+    
+    def subscribe(self, request_id: int) -> asyncio.Queue:
+        """Start receiving events for a request; pair with `unsubscribe`."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers[request_id].add(queue)
+        return queue
+    
+    def unsubscribe(self, request_id: int, queue: asyncio.Queue):
+        """Stop delivering events to a subscriber queue."""
+        queues = self._subscribers.get(request_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[request_id]
+    
+    def latest(self, request_id: int) -> Optional[TryOnStatusEvent]:
+        """Most recent event published for a request, if still remembered."""
+        return self._recent.get(request_id)
+    
+    def publish(self, event: TryOnStatusEvent):
+        """Deliver an event to every subscriber of its request."""
+        self._recent.pop(event.request_id, None)
+        self._recent[event.request_id] = event
+        while len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+        
+        self.published += 1
+        for queue in self._subscribers.get(event.request_id, ()):
+            if queue.full():
+                # A slow client only needs the newest status
+                queue.get_nowait()
+            queue.put_nowait(event)
+    
+    async def _poll_once(self):
+        request_ids = list(self._subscribers)
+        if not request_ids:
+            return
+        
+        from .database_service import db_service
+        async with db_service.async_session_maker() as session:
+            result = await session.execute(
+                select(TryOnRequest).where(TryOnRequest.id.in_(request_ids))
+            )
+            for request in result.scalars():
+                previous = self._recent.get(request.id)
+                if previous is None or previous.status.value != request.status:
+                    self.publish(status_event(request))
+    
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.warning("Status poll failed: %s", e)
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+    
+    async def start(self):
+        """Watch the database for transitions made by other processes."""
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll_loop())
+    
+    async def shutdown(self):
+        """Stop the poll loop."""
+        task, self._poll_task = self._poll_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Subscriber and event counters."""
+        return {
+            "watched_requests": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+        }
+
+
+status_broker = StatusBroker()
@@ -0,0 +1,137 @@
+"""Read-through cache of serialized try-on request details."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.database import TryOnRequest
+from ..models.schemas import TryOnRequestDetail
+from .status_broker import TERMINAL_STATUSES
+
+
+@dataclass
+class StatusEntry:
+    """A request's detail JSON, ready to send."""
+    etag: str
+    body: bytes
+    updated_at: Optional[datetime]
+    terminal: bool
+    checked_at: float  # monotonic time the entry was last known current
+
+
+def status_etag(request: TryOnRequest) -> str:
+    """ETag of a request's detail; changes whenever the row is updated."""
+    version = request.updated_at.isoformat() if request.updated_at else "0"
+    return f'"{request.id}-{version}"'
+
+
+class StatusCache:
+    """
+    Serves status polls from memory.
+    
+    Details are serialized once per row version and kept in an LRU of
+    `max_entries`. Finished requests never change again and are served
+    without touching the database. An unfinished entry is trusted for
+    `ttl` seconds; after that a single-column `updated_at` lookup decides
+    whether it is still current, which also catches transitions made by
+    other processes. Transitions made here invalidate entries directly.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = (
+            settings.STATUS_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.ttl = settings.STATUS_CACHE_TTL if ttl is None else ttl
+        
+        self._entries: "OrderedDict[int, StatusEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+    
+    def _lookup(self, request_id: int) -> Optional[StatusEntry]:
+        with self._lock:
+            entry = self._entries.get(request_id)
+            if entry is not None:
+                self._entries.move_to_end(request_id)
+            return entry
+    
+    async def get(self, request_id: int, db: AsyncSession) -> Optional[StatusEntry]:
+        """
+        Get the current detail of a request, loading it if needed.
+        
+        Returns:
+            The entry, or None if the request does not exist
+        """
+        entry = self._lookup(request_id)
+        now = time.monotonic()
+        if entry is not None:
+            if entry.terminal or now - entry.checked_at < self.ttl:
+                self.hits += 1
+                return entry
+            
+            result = await db.execute(
+                select(TryOnRequest.updated_at).where(TryOnRequest.id == request_id)
+            )
+            if result.scalar_one_or_none() == entry.updated_at:
+                entry.checked_at = now
+                self.revalidated += 1
+                return entry
+        
+        self.misses += 1
+        result = await db.execute(
+            select(TryOnRequest).where(TryOnRequest.id == request_id)
+        )
+        request = result.scalar_one_or_none()
+        if request is None:
+            self.invalidate(request_id)
+            return None
+        return self.put(request)
+    
+    def put(self, request: TryOnRequest) -> StatusEntry:
+        """Serialize a request row and remember it."""
+        entry = StatusEntry(
+            etag=status_etag(request),
+            body=TryOnRequestDetail.model_validate(request).model_dump_json().encode(),
+            updated_at=request.updated_at,
+            terminal=request.status in TERMINAL_STATUSES,
+            checked_at=time.monotonic()
+        )
+        with self._lock:
+            self._entries[request.id] = entry
+            self._entries.move_to_end(request.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+    
+    def invalidate(self, request_id: int):
+        """Forget a request after changing it."""
+        with self._lock:
+            self._entries.pop(request_id, None)
+    
+    def clear(self):
+        """Forget every cached request."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+status_cache = StatusCache()
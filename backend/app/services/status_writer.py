@@ -0,0 +1,209 @@
+"""Batched, write-coalescing persistence of try-on job transitions."""
+
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import case, update
+
+from ..core.config import settings
+from ..core.metrics import STAGE_SECONDS
+from ..models.database import TryOnRequest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Transition:
+    request_id: int
+    worker_id: str
+    values: Dict[str, Any]
+    waiter: asyncio.Future
+
+
+class StatusWriter:
+    """
+    Buffers the final transition of leased jobs and writes them in bulk.
+    
+    Transitions are flushed every `JOB_STATUS_FLUSH_INTERVAL_MS` or as soon
+    as `JOB_STATUS_FLUSH_BATCH` are waiting. Each flush is one transaction
+    with one `UPDATE ... WHERE id IN (...)` per worker and column set;
+    per-row values such as result paths are expressed as `CASE id`. Only
+    rows still leased by the writing worker are changed, as with a single
+    update.
+    
+    Writers wait until their transition is committed, so a job is never
+    reported done before it is durable. Flushes are serialized and a
+    request with a transition already buffered is flushed before the next
+    one is accepted, which keeps transitions of a request in order.
+    """
+    
+    def __init__(
+        self,
+        session_maker=None,
+        interval: Optional[float] = None,
+        max_batch: Optional[int] = None
+    ):
+        self._session_maker = session_maker
+        self.interval = (
+            settings.JOB_STATUS_FLUSH_INTERVAL_MS / 1000 if interval is None else interval
+        )
+        self.max_batch = settings.JOB_STATUS_FLUSH_BATCH if max_batch is None else max_batch
+        
+        self._pending: "OrderedDict[int, _Transition]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        
+        self.flushes = 0
+        self.written = 0
+    
+    @property
+    def session_maker(self):
+        if self._session_maker is None:
+            from .database_service import db_service
+            self._session_maker = db_service.async_session_maker
+        return self._session_maker
+    
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Bound to the loop that uses it, e.g. a new application lifespan
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._flush_task = None
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            # Runs only while transitions are waiting
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    def pending(self, request_id: int) -> bool:
+        """Whether a transition for the request is waiting to be written."""
+        return request_id in self._pending
+    
+    async def write(self, request_id: int, worker_id: str, **values) -> bool:
+        """
+        Release a job's lease and set column values in the next flush.
+        
+        Returns:
+            False if the worker no longer held the lease, so nothing changed
+        """
+        self._ensure_started()
+        if request_id in self._pending:
+            await self.flush()
+        
+        waiter = self._loop.create_future()
+        self._pending[request_id] = _Transition(request_id, worker_id, values, waiter)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        self._ensure_started()
+        return await waiter
+    
+    async def _flush_loop(self):
+        while self._pending and not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Status flush failed: %s", e)
+    
+    async def flush(self):
+        """Write every buffered transition in one transaction."""
+        if self._lock is None:
+            return
+        async with self._lock:
+            if not self._pending:
+                return
+            batch = list(self._pending.values())
+            self._pending.clear()
+            
+            try:
+                async with self.session_maker() as session:
+                    updated = await self._apply(session, batch)
+                    with STAGE_SECONDS.time(stage="db_commit"):
+                        await session.commit()
+            except Exception as e:
+                for transition in batch:
+                    if not transition.waiter.done():
+                        transition.waiter.set_exception(e)
+                raise
+            
+            self.flushes += 1
+            self.written += len(updated)
+            for transition in batch:
+                if not transition.waiter.done():
+                    transition.waiter.set_result(transition.request_id in updated)
+    
+    @staticmethod
+    async def _apply(session, batch: List[_Transition]) -> Set[int]:
+        """Issue the bulk updates; returns IDs of the rows that changed."""
+        now = datetime.utcnow()
+        returning = session.get_bind().dialect.update_returning
+        
+        groups: Dict[tuple, List[_Transition]] = defaultdict(list)
+        for transition in batch:
+            groups[(transition.worker_id, tuple(sorted(transition.values)))].append(transition)
+        
+        updated: Set[int] = set()
+        for (worker_id, columns), transitions in groups.items():
+            ids = [transition.request_id for transition in transitions]
+            values: Dict[str, Any] = {
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": now,
+            }
+            for column in columns:
+                by_id = {t.request_id: t.values[column] for t in transitions}
+                distinct = set(by_id.values())
+                if len(distinct) == 1:
+                    values[column] = distinct.pop()
+                else:
+                    values[column] = case(by_id, value=TryOnRequest.id)
+            
+            statement = (
+                update(TryOnRequest)
+                .where(TryOnRequest.id.in_(ids))
+                .where(TryOnRequest.status == "processing")
+                .where(TryOnRequest.lease_owner == worker_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if returning:
+                result = await session.execute(statement.returning(TryOnRequest.id))
+                updated.update(result.scalars())
+            else:
+                await session.execute(statement)
+                updated.update(ids)
+        return updated
+    
+    async def shutdown(self):
+        """Write everything still buffered and stop the flush loop."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            # Let the loop finish its current flush and run a final one
+            self._stopping = True
+            self._wakeup.set()
+            await asyncio.gather(task, return_exceptions=True)
+            self._stopping = False
+        if self._pending:
+            await self.flush()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Buffer and flush counters."""
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "written": self.written,
+        }
+
+
+status_writer = StatusWriter()
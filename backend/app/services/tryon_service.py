@@ -1,36 +1,100 @@
 """Virtual try-on service - core AI processing logic."""
 
 import os
+import threading
 import time
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from PIL import Image
 import numpy as np
 
-from ..utils.image_processing import ImageProcessor
+from ..utils.image_processing import ImageProcessor, MODEL_INPUT_SIZE
+from ..utils.renditions import save_renditions
 from ..core.config import settings
+from ..core.metrics import STAGE_SECONDS
+from .garment_cache import GarmentCache, garment_cache as default_garment_cache
+from .model_backends import ModelBackend, create_model_backend
+from .person_cache import PersonFeatureCache, PersonFeatures, person_cache as default_person_cache
+
+
+# (person_image_path, garment_image_path, pose, output_path)
+TryOnJob = Tuple[str, str, str, str]
+TryOnResult = Tuple[bool, Optional[str], Optional[float]]
 
 
 class VirtualTryOnService:
     """
     Service for virtual try-on processing.
     
-    This is a placeholder implementation. In production, this would integrate
-    with actual virtual try-on models like:
-    - HR-VITON (High-Resolution Virtual Try-On)
-    - VITON-HD
-    - TryOnGAN
-    - ClothFormer
+    Inference is delegated to a `ModelBackend` chosen by `MODEL_BACKEND`:
+    the placeholder compositor, or an exported model such as HR-VITON or
+    VITON-HD run with ONNX Runtime or TorchScript on the CPU. The model is
+    loaded on first use unless `load_model` is called ahead of time.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        garment_cache: Optional[GarmentCache] = None,
+        person_cache: Optional[PersonFeatureCache] = None
+    ):
         self.image_processor = ImageProcessor()
-        self.model = None  # Placeholder for actual model
+        self.garment_cache = garment_cache or default_garment_cache
+        self.person_cache = person_cache or default_person_cache
+        self.model: Optional[ModelBackend] = None
+        
+        # Seconds spent loading and warming up the model
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_runs = 0
+    
+    def load_model(self) -> ModelBackend:
+        """Load the configured model backend unless it is already loaded."""
+        if self.model is None:
+            start = time.perf_counter()
+            model = create_model_backend()
+            model.load()
+            self.load_seconds = time.perf_counter() - start
+            self.model = model
+        return self.model
+    
+    def warm_up(self, runs: Optional[int] = None, batch_size: Optional[int] = None) -> float:
+        """
+        Run the model on synthetic inputs ahead of real requests.
+        
+        The first customer then does not pay for lazy initialisation, JIT
+        compilation and first allocations.
+        
+        Args:
+            runs: Number of passes; defaults to `MODEL_WARMUP_RUNS`
+            batch_size: Batch size; defaults to `INFERENCE_BATCH_SIZE`
+        
+        Returns:
+            Seconds spent warming up
+        """
+        runs = settings.MODEL_WARMUP_RUNS if runs is None else runs
+        batch_size = batch_size or settings.INFERENCE_BATCH_SIZE
+        model = self.load_model()
+        
+        width, height = MODEL_INPUT_SIZE
+        batch = np.full((max(1, batch_size), 3, height, width), 0.5, dtype=np.float32)
+        poses = [settings.SUPPORTED_POSES[0]] * len(batch)
         
-    def load_model(self):
-        """Load the virtual try-on model."""
-        # Placeholder - in production, load actual model weights
-        # Example: self.model = load_viton_model(settings.MODEL_WEIGHTS_DIR)
-        pass
+        start = time.perf_counter()
+        for _ in range(runs):
+            self._to_uint8_nhwc(model.inference(batch, batch, poses))
+        self.warmup_seconds = time.perf_counter() - start
+        self.warmup_runs = runs
+        return self.warmup_seconds
+    
+    def model_info(self) -> Dict[str, Any]:
+        """Backend and load/warm-up timings of this service's model."""
+        return {
+            "worker": f"{os.getpid()}:{threading.get_ident()}",
+            "backend": self.model.name if self.model else None,
+            "weights": self.model.weights_path if self.model else None,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_runs": self.warmup_runs,
+        }
     
     def process_tryon(
         self,
@@ -38,7 +102,7 @@ class VirtualTryOnService:
         garment_image_path: str,
         pose: str,
         output_path: str
-    ) -> Tuple[bool, Optional[str], Optional[float]]:
+    ) -> TryOnResult:
         """
         Process virtual try-on request.
         
@@ -47,41 +111,140 @@ class VirtualTryOnService:
             garment_image_path: Path to the garment image
             pose: Pose type (front, side, three-quarter)
             output_path: Path to save the result
-            
+        
         Returns:
             Tuple of (success, error_message, processing_time)
         """
-        start_time = time.time()
+        return self.process_tryon_batch(
+            [(person_image_path, garment_image_path, pose, output_path)]
+        )[0]
+    
+    def process_tryon_batch(self, jobs: Sequence[TryOnJob]) -> List[TryOnResult]:
+        """
+        Process several try-on requests with one batched model call.
         
-        try:
-            # Load images
-            person_img = self.image_processor.load_image(person_image_path)
-            garment_img = self.image_processor.load_image(garment_image_path)
-            
-            if person_img is None or garment_img is None:
-                return False, "Failed to load images", None
-            
+        Inputs are prepared straight into slots of preallocated NCHW
+        float32 batch arrays and run through inference together. Person
+        features come from the session cache, so a customer photo reused
+        across garments is decoded and validated once. Failures are
+        reported per job and do not affect the rest of the batch.
+        
+        Args:
+            jobs: Sequence of (person_path, garment_path, pose, output_path)
+        
+        Returns:
+            List of (success, error_message, processing_time), one per job
+        """
+        start_time = time.perf_counter()
+        results: List[Optional[TryOnResult]] = [None] * len(jobs)
+        
+        width, height = MODEL_INPUT_SIZE
+        person_batch = np.empty((len(jobs), 3, height, width), dtype=np.float32)
+        garment_batch = np.empty_like(person_batch)
+        
+        ready = []
+        persons = {}
+        for index, (person_path, garment_path, pose, output_path) in enumerate(jobs):
             # Validate pose
             if pose not in settings.SUPPORTED_POSES:
-                return False, f"Unsupported pose: {pose}", None
-            
-            # Process images
-            result_image = self._generate_tryon(person_img, garment_img, pose)
-            
-            # Save result
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            result_image.save(
-                output_path,
-                settings.OUTPUT_IMAGE_FORMAT,
-                quality=settings.OUTPUT_IMAGE_QUALITY
-            )
+                results[index] = (False, f"Unsupported pose: {pose}", None)
+                continue
             
-            processing_time = time.time() - start_time
-            return True, None, processing_time
-            
-        except Exception as e:
-            processing_time = time.time() - start_time
-            return False, str(e), processing_time
+            try:
+                slot = len(ready)
+                with STAGE_SECONDS.time(stage="image_load"):
+                    if person_path not in persons:
+                        persons[person_path] = self._person_features(person_path)
+                    person = persons[person_path]
+                    garment_tensor = self._load_garment_tensor(garment_path)
+                
+                if person is None or garment_tensor is None:
+                    results[index] = (False, "Failed to load images", None)
+                    continue
+                
+                if not self._check_pose(person, person_path, pose):
+                    results[index] = (False, f"Person does not match pose: {pose}", None)
+                    continue
+                
+                np.copyto(person_batch[slot], person.tensor)
+                np.copyto(garment_batch[slot], garment_tensor)
+                ready.append(index)
+            except Exception as e:
+                results[index] = (False, str(e), time.perf_counter() - start_time)
+        
+        if ready:
+            try:
+                poses = [jobs[index][2] for index in ready]
+                
+                result_images = self._generate_tryon_batch(
+                    person_batch[:len(ready)], garment_batch[:len(ready)], poses
+                )
+                
+                for index, result_image in zip(ready, result_images):
+                    output_path = jobs[index][3]
+                    try:
+                        # Save result
+                        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                        with STAGE_SECONDS.time(stage="encode"):
+                            result_image.save(
+                                output_path,
+                                settings.OUTPUT_IMAGE_FORMAT,
+                                quality=settings.OUTPUT_IMAGE_QUALITY
+                            )
+                            save_renditions(result_image, output_path)
+                        results[index] = (True, None, time.perf_counter() - start_time)
+                    except Exception as e:
+                        results[index] = (False, str(e), time.perf_counter() - start_time)
+            except Exception as e:
+                for index in ready:
+                    results[index] = (False, str(e), time.perf_counter() - start_time)
+        
+        return results
+    
+    def _load_garment_tensor(self, garment_image_path: str) -> Optional[np.ndarray]:
+        """Get the model-ready garment tensor, from the cache when stored there."""
+        garment_hash = self.garment_cache.hash_from_path(garment_image_path)
+        if garment_hash is not None:
+            return self.garment_cache.get_tensor(garment_hash)
+        
+        return self._load_input_tensor(garment_image_path)
+    
+    def _person_features(self, person_image_path: str) -> Optional[PersonFeatures]:
+        """Get the garment-independent features of a person photo, cached per session."""
+        key = self.person_cache.key_for_path(person_image_path)
+        features = self.person_cache.get(key)
+        if features is None:
+            tensor = self._load_input_tensor(person_image_path)
+            if tensor is None:
+                return None
+            tensor.setflags(write=False)
+            features = PersonFeatures(tensor)
+            self.person_cache.put(key, features)
+        return features
+    
+    def _check_pose(self, person: PersonFeatures, person_image_path: str, pose: str) -> bool:
+        """Validate the pose of a person once per pose and remember the answer."""
+        valid = person.pose_checks.get(pose)
+        if valid is None:
+            valid = person.pose_checks[pose] = self.validate_person_pose(person_image_path, pose)
+        return valid
+    
+    def _load_input_tensor(
+        self,
+        image_path: str,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """Decode an image file straight into a model-ready tensor."""
+        try:
+            return self.image_processor.pipeline(image_path).to_model_input(out=out)
+        except ValueError:
+            return None
+    
+    def _prepare_input(self, image: Image.Image) -> np.ndarray:
+        """Convert a loaded image into a model-ready CHW float32 array."""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return self.image_processor.prepare_for_model(image)
     
     def _generate_tryon(
         self,
@@ -89,33 +252,59 @@ class VirtualTryOnService:
         garment_img: Image.Image,
         pose: str
     ) -> Image.Image:
+        """Generate a single virtual try-on result."""
+        person_batch = self._prepare_input(person_img)[np.newaxis]
+        garment_batch = self._prepare_input(garment_img)[np.newaxis]
+        return self._generate_tryon_batch(person_batch, garment_batch, [pose])[0]
+    
+    def _generate_tryon_batch(
+        self,
+        person_batch: np.ndarray,
+        garment_batch: np.ndarray,
+        poses: List[str]
+    ) -> List[Image.Image]:
         """
-        Generate virtual try-on result.
+        Generate virtual try-on results for a batch with the model backend.
         
-        THIS IS A PLACEHOLDER IMPLEMENTATION for MVP demonstration.
-        In production, this would use actual deep learning models.
-        
-        For now, we create a simple composite showing both images side by side
-        to demonstrate the API workflow.
+        Args:
+            person_batch: Person images as NCHW float32 in [0, 1]
+            garment_batch: Garment images as NCHW float32 in [0, 1]
+            poses: Pose per batch item
         """
-        # Resize images to consistent size
-        target_size = (384, 512)
-        person_resized = person_img.resize(target_size, Image.Resampling.LANCZOS)
-        garment_resized = garment_img.resize(target_size, Image.Resampling.LANCZOS)
+        model = self.load_model()
+        with STAGE_SECONDS.time(stage="inference"):
+            output = model.inference(person_batch, garment_batch, poses)
         
-        # Create composite image (side by side for demo)
-        result_width = target_size[0] * 2 + 20
-        result_height = target_size[1]
-        result = Image.new('RGB', (result_width, result_height), (255, 255, 255))
+        return [Image.fromarray(item) for item in self._to_uint8_nhwc(output)]
+    
+    @staticmethod
+    def _to_uint8_nhwc(output: np.ndarray) -> np.ndarray:
+        """Convert an NCHW float batch in [0, 1] to NHWC uint8, rounding."""
+        scaled = np.multiply(output, np.float32(255.0), dtype=np.float32)
+        scaled += np.float32(0.5)
+        np.clip(scaled, 0, 255, out=scaled)
         
-        # Paste images
-        result.paste(person_resized, (0, 0))
-        result.paste(garment_resized, (target_size[0] + 20, 0))
+        n, c, h, w = scaled.shape
+        pixels = np.empty((n, h, w, c), dtype=np.uint8)
+        np.copyto(pixels, scaled.transpose(0, 2, 3, 1), casting='unsafe')
+        return pixels
+    
+    def preprocess_garment(self, garment_hash: str) -> Optional[str]:
+        """
+        Run garment preprocessing ahead of any try-on request.
         
-        # In production, this would be:
-        # result = self.model.inference(person_img, garment_img, pose)
+        Currently this builds the cached model-ready tensor; garment
+        segmentation masks would be produced here as well.
         
-        return result
+        Returns:
+            Error message, or None on success
+        """
+        try:
+            if self.garment_cache.get_tensor(garment_hash) is None:
+                return "Failed to load garment image"
+        except Exception as e:
+            return str(e)
+        return None
     
     def validate_person_pose(self, image_path: str, expected_pose: str) -> bool:
         """
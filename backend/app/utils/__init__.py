@@ -1,6 +1,43 @@
 """Utils module initialization."""
 
-from .image_processing import ImageProcessor
-from .helpers import generate_api_key, generate_filename
+from .image_processing import ImageProcessor, ImagePipeline
+from .helpers import generate_api_key, generate_filename, content_hash, result_image_url
+from .pagination import decode_cursor, encode_cursor, keyset_page, next_cursor, set_next_page
+from .renditions import (
+    RENDITION_FORMATS,
+    ensure_rendition,
+    rendition_path,
+    rendition_sizes,
+    save_renditions,
+)
+from .upload import (
+    StagedUpload,
+    UploadTooLargeError,
+    UnsupportedImageError,
+    sniff_image_format,
+    stage_upload,
+)
 
-__all__ = ["ImageProcessor", "generate_api_key", "generate_filename"]
+__all__ = [
+    "ImageProcessor",
+    "ImagePipeline",
+    "generate_api_key",
+    "generate_filename",
+    "content_hash",
+    "result_image_url",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_page",
+    "next_cursor",
+    "set_next_page",
+    "RENDITION_FORMATS",
+    "ensure_rendition",
+    "rendition_path",
+    "rendition_sizes",
+    "save_renditions",
+    "StagedUpload",
+    "UploadTooLargeError",
+    "UnsupportedImageError",
+    "sniff_image_format",
+    "stage_upload",
+]
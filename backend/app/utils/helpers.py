@@ -1,5 +1,7 @@
 """Utility functions."""
 
+import hashlib
+import os
 import secrets
 import string
 from typing import Optional
@@ -17,3 +19,15 @@ def generate_filename(prefix: str = "", extension: str = "jpg") -> str:
     if prefix:
         return f"{prefix}_{random_string}.{extension}"
     return f"{random_string}.{extension}"
+
+
+def result_image_url(result_image_path: Optional[str]) -> Optional[str]:
+    """Public URL of a stored try-on result."""
+    if not result_image_path:
+        return None
+    return f"/uploads/results/{os.path.basename(result_image_path)}"
+
+
+def content_hash(data: bytes) -> str:
+    """Compute a hex SHA-256 digest used to content-address files."""
+    return hashlib.sha256(data).hexdigest()
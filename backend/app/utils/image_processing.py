@@ -1,11 +1,25 @@
 """Image processing utilities."""
 
 import os
+import shutil
+import threading
 from PIL import Image
 import numpy as np
-from typing import Tuple, Optional
+import cv2
+from typing import Tuple, Optional, Union
 import io
 
+from ..core.config import settings
+from ..core.metrics import STAGE_SECONDS
+
+# (width, height) the try-on model consumes
+MODEL_INPUT_SIZE = (768, 1024)
+
+IMAGE_BACKENDS = ("pil", "opencv")
+
+# Per-thread resize scratch buffers for the OpenCV backend
+_scratch = threading.local()
+
 
 class ImageProcessor:
     """Image processing utilities for virtual try-on."""
@@ -32,18 +46,39 @@ class ImageProcessor:
         """Save uploaded image to disk."""
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
         
-        img = Image.open(io.BytesIO(image_bytes))
-        
+        img = ImageProcessor.to_rgb(Image.open(io.BytesIO(image_bytes)))
+        img.save(save_path, 'JPEG', quality=95)
+        return save_path
+    
+    @staticmethod
+    def to_rgb(img: Image.Image) -> Image.Image:
+        """Flatten transparency onto white and convert to RGB."""
         # Convert RGBA to RGB if necessary
         if img.mode == 'RGBA':
             background = Image.new('RGB', img.size, (255, 255, 255))
             background.paste(img, mask=img.split()[3])
-            img = background
+            return background
         elif img.mode != 'RGB':
-            img = img.convert('RGB')
+            return img.convert('RGB')
+        return img
+    
+    @staticmethod
+    def normalize_image_file(source_path: str, save_path: str) -> str:
+        """
+        Store an image file as an RGB JPEG, decoding it at most once.
         
-        img.save(save_path, 'JPEG', quality=95)
-        return save_path
+        The decode doubles as validation, replacing a separate
+        `validate_image` pass. The result is written atomically.
+        
+        Raises:
+            ValueError: If the file is not a decodable image
+        """
+        return ImageProcessor.pipeline(source_path).store(save_path)
+    
+    @staticmethod
+    def pipeline(source: Union[str, bytes]) -> "ImagePipeline":
+        """Open an image for single-decode processing."""
+        return ImagePipeline(source)
     
     @staticmethod
     def load_image(image_path: str) -> Optional[Image.Image]:
@@ -54,15 +89,161 @@ class ImageProcessor:
             return None
     
     @staticmethod
-    def prepare_for_model(image: Image.Image) -> np.ndarray:
-        """Prepare image for model input."""
-        # Resize to model input size
-        img_resized = image.resize((768, 1024), Image.Resampling.LANCZOS)
+    def prepare_for_model(
+        image: Image.Image,
+        out: Optional[np.ndarray] = None,
+        backend: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Prepare image for model input.
+        
+        Args:
+            image: RGB image
+            out: Optional preallocated (3, H, W) float32 array, e.g. one
+                slot of a batch, written in place
+            backend: "pil" or "opencv"; defaults to `settings.IMAGE_BACKEND`
+        
+        Returns:
+            CHW float32 array in [0, 1]
+        """
+        backend = backend or settings.IMAGE_BACKEND
+        width, height = MODEL_INPUT_SIZE
+        if out is None:
+            out = np.empty((3, height, width), dtype=np.float32)
+        
+        if backend == "pil":
+            # Resize to model input size
+            pixels = np.asarray(image.resize(MODEL_INPUT_SIZE, Image.Resampling.LANCZOS))
+        elif backend == "opencv":
+            pixels = ImageProcessor._resize_opencv(np.asarray(image))
+        else:
+            raise ValueError(f"Unknown image backend: {backend}")
+        
+        # Normalize and transpose HWC -> CHW in a single pass into `out`
+        np.divide(pixels.transpose(2, 0, 1), np.float32(255.0), out=out)
+        return out
+    
+    @staticmethod
+    def _resize_opencv(pixels: np.ndarray) -> np.ndarray:
+        """Resize an HWC uint8 array to the model input size into a reused buffer."""
+        width, height = MODEL_INPUT_SIZE
+        buffer = getattr(_scratch, "resized", None)
+        if buffer is None:
+            buffer = _scratch.resized = np.empty((height, width, 3), dtype=np.uint8)
+        
+        # Area averaging anti-aliases downscales like PIL's LANCZOS does;
+        # upscales use the Lanczos kernel directly
+        src_height, src_width = pixels.shape[:2]
+        if src_width >= width and src_height >= height:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LANCZOS4
+        return cv2.resize(pixels, MODEL_INPUT_SIZE, dst=buffer, interpolation=interpolation)
+
+
+class ImagePipeline:
+    """
+    Decodes an image at most once and derives every representation from it.
+    
+    Opening only parses the header. JPEGs are decoded with `draft()`, which
+    lets libjpeg downscale in the DCT domain to the smallest power-of-two
+    reduction still at least as large as the requested size, so a large
+    photo is never fully decompressed just to be resized for the model.
+    Uploads that are already RGB JPEGs are stored byte-for-byte instead of
+    being re-encoded.
+    """
+    
+    def __init__(self, source: Union[str, bytes]):
+        self._source = source
+        self._image = self._open()
+        self.format = self._image.format
+        self.mode = self._image.mode
+        self.size = self._image.size
+        self._decoded: Optional[Image.Image] = None
+    
+    def _open(self) -> Image.Image:
+        source = self._source if isinstance(self._source, str) else io.BytesIO(self._source)
+        try:
+            return Image.open(source)
+        except Exception as e:
+            raise ValueError(f"Invalid image: {e}") from e
+    
+    @property
+    def needs_conversion(self) -> bool:
+        """Whether storing the image requires decoding and re-encoding it."""
+        return self.format != 'JPEG' or self.mode != 'RGB'
+    
+    def decode(self, min_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Decode the pixels as RGB, reusing an earlier decode when possible.
+        
+        Args:
+            min_size: Smallest (width, height) the caller needs; JPEGs may
+                be decoded at a reduced scale that still covers it. None
+                decodes at full resolution.
         
-        # Convert to numpy array and normalize
-        img_array = np.array(img_resized).astype(np.float32) / 255.0
+        Raises:
+            ValueError: If the image data cannot be decoded
+        """
+        wanted = self.size if min_size is None else min_size
+        if self._decoded is not None:
+            width, height = self._decoded.size
+            if self._decoded.size == self.size or (width >= wanted[0] and height >= wanted[1]):
+                return self._decoded
+            # Only a reduced-scale decode is cached; start over at full size
+            self._image.close()
+            self._image = self._open()
         
-        # Transpose to CHW format (channels first)
-        img_array = np.transpose(img_array, (2, 0, 1))
+        image = self._image
+        try:
+            if min_size is not None and self.format == 'JPEG':
+                image.draft('RGB', min_size)
+            image.load()
+        except Exception as e:
+            raise ValueError(f"Invalid image: {e}") from e
+        
+        self._decoded = ImageProcessor.to_rgb(image)
+        return self._decoded
+    
+    def to_array(self, min_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Decoded pixels as an HWC uint8 array."""
+        return np.asarray(self.decode(min_size))
+    
+    def to_model_input(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Model-ready CHW float32 array, decoded only as large as needed."""
+        return ImageProcessor.prepare_for_model(self.decode(MODEL_INPUT_SIZE), out=out)
+    
+    def store(self, save_path: str) -> str:
+        """
+        Write the image to `save_path` as an RGB JPEG, atomically.
+        
+        RGB JPEGs keep their original bytes; the reduced-scale decode used
+        to validate them is kept for a later `to_model_input`.
         
-        return img_array
+        Raises:
+            ValueError: If the image data cannot be decoded
+        """
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        tmp_path = f"{save_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            with STAGE_SECONDS.time(stage="validation"):
+                image = self.decode(None if self.needs_conversion else MODEL_INPUT_SIZE)
+            
+            with STAGE_SECONDS.time(stage="save"):
+                if self.needs_conversion:
+                    image.save(tmp_path, 'JPEG', quality=95)
+                elif isinstance(self._source, str):
+                    shutil.copyfile(self._source, tmp_path)
+                else:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(self._source)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if isinstance(e, ValueError):
+                raise
+            raise ValueError(f"Invalid image: {e}") from e
+        
+        os.replace(tmp_path, save_path)
+        return save_path
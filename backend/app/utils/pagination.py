@@ -0,0 +1,69 @@
+"""Keyset (cursor) pagination for newest-first listings."""
+
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past a row."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Read a cursor made by `encode_cursor`.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(statement: Select, model, after: Optional[str], limit: int) -> Select:
+    """
+    Restrict a query to one newest-first page.
+    
+    Rows are ordered by `(created_at, id)` descending and a page starts
+    strictly after the cursor's row, so with a matching index every page
+    costs the same however deep it is. One extra row is fetched to tell
+    whether another page follows; pass the rows to `next_cursor`.
+    
+    Raises:
+        ValueError: If `after` is not a valid cursor
+    """
+    if after:
+        created_at, row_id = decode_cursor(after)
+        statement = statement.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    return (
+        statement
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """Cursor of the page after `rows`, or None if it was the last page."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def set_next_page(request: Request, response: Response, cursor: Optional[str]):
+    """Advertise the next page in `X-Next-Cursor` and a `Link` header."""
+    if cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = cursor
+    next_url = request.url.remove_query_params("skip").include_query_params(after=cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -0,0 +1,114 @@
+"""Downscaled and alternate-format renditions of try-on results."""
+
+import os
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from ..core.config import settings
+
+FULL_SIZE = "full"
+
+# Rendition format name -> (Pillow format, file extension, media type)
+RENDITION_FORMATS = {
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "webp": ("WEBP", "webp", "image/webp"),
+}
+
+
+def rendition_sizes() -> Dict[str, Optional[int]]:
+    """Configured rendition names mapped to their longest edge (None = full)."""
+    sizes: Dict[str, Optional[int]] = {FULL_SIZE: None}
+    sizes.update(settings.RESULT_RENDITIONS)
+    return sizes
+
+
+def rendition_path(result_path: str, size: str = FULL_SIZE, image_format: str = "jpeg") -> str:
+    """
+    Path of a rendition next to its full-size JPEG result.
+    
+    `result_x.jpg` has renditions such as `result_x.thumb.jpg`,
+    `result_x.thumb.webp` and `result_x.webp`.
+    """
+    stem, _ = os.path.splitext(result_path)
+    extension = RENDITION_FORMATS[image_format][1]
+    if size == FULL_SIZE:
+        return f"{stem}.{extension}"
+    return f"{stem}.{size}.{extension}"
+
+
+def _save_atomic(image: Image.Image, path: str, image_format: str, quality: int):
+    pil_format, extension, _ = RENDITION_FORMATS[image_format]
+    tmp_path = f"{path}.{os.getpid()}.tmp.{extension}"
+    try:
+        image.save(tmp_path, pil_format, quality=quality)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_renditions(
+    image: Image.Image,
+    result_path: str,
+    formats: Optional[List[str]] = None,
+    quality: Optional[int] = None
+) -> List[str]:
+    """
+    Write every configured rendition of an in-memory result.
+    
+    Sizes are produced largest first, each one resized from the previous
+    rendition rather than from the full image, so the whole set costs
+    little more than its largest step. The full-size JPEG is the result
+    itself and is not written here.
+    
+    Returns:
+        Paths of the written files
+    """
+    formats = formats or settings.RESULT_RENDITION_FORMATS
+    quality = quality or settings.OUTPUT_IMAGE_QUALITY
+    
+    ordered = sorted(
+        rendition_sizes().items(),
+        key=lambda item: float("inf") if item[1] is None else item[1],
+        reverse=True
+    )
+    
+    written = []
+    current = image
+    for size, edge in ordered:
+        if edge is not None:
+            scale = edge / max(current.size)
+            if scale < 1:
+                target = (
+                    max(1, round(current.width * scale)),
+                    max(1, round(current.height * scale))
+                )
+                current = current.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        
+        for image_format in formats:
+            if size == FULL_SIZE and image_format == "jpeg":
+                continue
+            path = rendition_path(result_path, size, image_format)
+            _save_atomic(current, path, image_format, quality)
+            written.append(path)
+    return written
+
+
+def ensure_rendition(result_path: str, size: str, image_format: str) -> Optional[str]:
+    """
+    Get the path of a rendition, rendering it from the full result if missing.
+    
+    Returns:
+        Rendition path, or None if the full result no longer exists
+    """
+    path = rendition_path(result_path, size, image_format)
+    if os.path.exists(path):
+        return path
+    try:
+        with Image.open(result_path) as image:
+            save_renditions(image, result_path, formats=[image_format])
+    except FileNotFoundError:
+        return None
+    return path
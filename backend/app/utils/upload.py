@@ -0,0 +1,101 @@
+"""Streaming ingestion of uploaded images."""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Leading magic bytes of the accepted image formats
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+)
+_SNIFF_LENGTH = max(len(signature) for signature, _ in _SIGNATURES)
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class UnsupportedImageError(Exception):
+    """Raised when an upload does not look like a supported image."""
+
+
+@dataclass
+class StagedUpload:
+    """An upload written to a temporary file, with its digest and format."""
+    path: str
+    content_hash: str
+    size: int
+    image_format: str
+    
+    def discard(self):
+        """Remove the temporary file if it still exists."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """Identify an image format from its first bytes without decoding it."""
+    for signature, image_format in _SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    return None
+
+
+async def stage_upload(
+    upload: UploadFile,
+    max_size: int,
+    directory: str,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> StagedUpload:
+    """
+    Stream an upload into a temporary file in bounded-size chunks.
+    
+    The size limit is enforced while reading, the SHA-256 is computed
+    incrementally and the format is sniffed from the header, so the whole
+    file is never held in memory.
+    
+    Raises:
+        UploadTooLargeError: If the upload is larger than `max_size`
+        UnsupportedImageError: If the header is not a supported image format
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    os.close(fd)
+    
+    hasher = hashlib.sha256()
+    header = b""
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(f"Upload exceeds {max_size} bytes")
+                
+                if len(header) < _SNIFF_LENGTH:
+                    header += chunk[:_SNIFF_LENGTH - len(header)]
+                hasher.update(chunk)
+                await out.write(chunk)
+        
+        image_format = sniff_image_format(header)
+        if image_format is None:
+            raise UnsupportedImageError("Upload is not a supported image")
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    
+    return StagedUpload(tmp_path, hasher.hexdigest(), size, image_format)
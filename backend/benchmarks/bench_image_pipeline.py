@@ -0,0 +1,101 @@
+"""
+Compare per-request image CPU cost of the legacy and single-decode paths.
+
+The legacy path mirrors what a request used to cost: `validate_image`,
+`save_uploaded_image`, then `load_image` and `prepare_for_model` in the
+worker. The pipeline path stores the upload with `ImagePipeline.store`
+and prepares it with `ImagePipeline.to_model_input`.
+
+Usage (from backend/):
+    python -m benchmarks.bench_image_pipeline --width 3024 --height 4032
+    python -m benchmarks.bench_image_pipeline --backend opencv
+"""
+
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.utils.image_processing import IMAGE_BACKENDS, ImageProcessor, ImagePipeline
+
+
+def make_photo(width: int, height: int) -> bytes:
+    """Build a camera-sized JPEG with enough texture to compress realistically."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([x * 255 // width, y * 255 // height, (x ^ y) & 0xFF], axis=-1)
+    pixels = pixels + rng.integers(-12, 12, size=pixels.shape)
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, 'JPEG', quality=92)
+    return buffer.getvalue()
+
+
+def legacy_path(data: bytes, workdir: str):
+    """Four decodes: verify, re-encode, load and resize."""
+    if not ImageProcessor.validate_image(data):
+        raise ValueError("invalid image")
+    save_path = os.path.join(workdir, "legacy.jpg")
+    ImageProcessor.save_uploaded_image(data, save_path)
+    image = ImageProcessor.load_image(save_path)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return ImageProcessor.prepare_for_model(image)
+
+
+def pipeline_path(data: bytes, workdir: str):
+    """Staged upload stored as-is, then a draft decode for the model."""
+    staged_path = os.path.join(workdir, "staged.upload")
+    with open(staged_path, 'wb') as f:
+        f.write(data)
+    save_path = os.path.join(workdir, "pipeline.jpg")
+    ImagePipeline(staged_path).store(save_path)
+    return ImagePipeline(save_path).to_model_input()
+
+
+def measure(func, data: bytes, workdir: str, iterations: int):
+    """Return per-iteration CPU seconds after one warm-up run."""
+    func(data, workdir)
+    samples = []
+    for _ in range(iterations):
+        start = time.process_time()
+        func(data, workdir)
+        samples.append(time.process_time() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=3024)
+    parser.add_argument("--height", type=int, default=4032)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--backend", choices=IMAGE_BACKENDS, default=settings.IMAGE_BACKEND)
+    args = parser.parse_args()
+    settings.IMAGE_BACKEND = args.backend
+    
+    data = make_photo(args.width, args.height)
+    print(
+        f"Input: {args.width}x{args.height} JPEG, {len(data) / 1024:.0f} KB, "
+        f"{args.backend} backend"
+    )
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {
+            "legacy": measure(legacy_path, data, workdir, args.iterations),
+            "pipeline": measure(pipeline_path, data, workdir, args.iterations),
+        }
+    
+    for name, samples in results.items():
+        print(f"{name:>9}: median {statistics.median(samples) * 1000:8.1f} ms CPU")
+    
+    speedup = statistics.median(results["legacy"]) / statistics.median(results["pipeline"])
+    print(f"  speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Timing, memory and baseline comparison helpers for the benchmarks."""
+
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+
+@dataclass
+class BenchmarkResult:
+    """Latency distribution, throughput and peak memory of one benchmark."""
+    name: str
+    resolution: str
+    iterations: int
+    throughput: float  # operations per second
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_memory_bytes: int
+    
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.resolution}"
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than the baseline by more than the threshold."""
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline
+    
+    def __str__(self) -> str:
+        return (
+            f"{self.key} {self.metric}: {self.baseline:.2f} -> "
+            f"{self.current:.2f} ({self.change:+.0%})"
+        )
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(
+    name: str,
+    resolution: str,
+    samples: Sequence[float],
+    peak_memory_bytes: int
+) -> BenchmarkResult:
+    """Build a result from per-iteration wall times in seconds."""
+    total = sum(samples)
+    return BenchmarkResult(
+        name=name,
+        resolution=resolution,
+        iterations=len(samples),
+        throughput=len(samples) / total if total else 0.0,
+        mean_ms=total / len(samples) * 1000,
+        p50_ms=percentile(samples, 50) * 1000,
+        p95_ms=percentile(samples, 95) * 1000,
+        p99_ms=percentile(samples, 99) * 1000,
+        peak_memory_bytes=peak_memory_bytes,
+    )
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> int:
+    """Peak Python and NumPy heap allocation of a single call, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(
+    name: str,
+    resolution: str,
+    func: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 1
+) -> BenchmarkResult:
+    """
+    Time `func(i)` for each iteration with a monotonic clock.
+    
+    Peak memory is measured on a separate call so tracemalloc overhead does
+    not skew the latencies.
+    """
+    for i in range(warmup):
+        func(i)
+    
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(warmup + i)
+        samples.append(time.perf_counter() - start)
+    
+    peak = measure_peak_memory(lambda: func(warmup + iterations))
+    return summarize(name, resolution, samples, peak)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine so baselines are only compared like-for-like."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(path: str, results: List[BenchmarkResult], metadata: Dict[str, Any]):
+    """Write results as a JSON baseline."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    document = {
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": environment(),
+        "metadata": metadata,
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """Read results saved by `save_results`."""
+    with open(path) as f:
+        document = json.load(f)
+    return [BenchmarkResult(**result) for result in document["results"]]
+
+
+def compare(
+    current: List[BenchmarkResult],
+    baseline: List[BenchmarkResult],
+    threshold: float = 0.25,
+    min_delta_ms: float = 1.0
+) -> List[Regression]:
+    """
+    Find benchmarks that regressed against a baseline.
+    
+    Latency (p50, p95) regresses when it grows by more than `threshold`
+    and by at least `min_delta_ms`, so sub-millisecond jitter is ignored;
+    throughput regresses when it drops by more than `threshold`. Benchmarks
+    missing from either side are not compared.
+    """
+    previous = {result.key: result for result in baseline}
+    regressions = []
+    for result in current:
+        base = previous.get(result.key)
+        if base is None:
+            continue
+        
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = getattr(base, metric), getattr(result, metric)
+            if after > before * (1 + threshold) and after - before >= min_delta_ms:
+                regressions.append(Regression(result.key, metric, before, after))
+        
+        if base.throughput and result.throughput < base.throughput * (1 - threshold):
+            regressions.append(
+                Regression(result.key, "throughput", base.throughput, result.throughput)
+            )
+    return regressions
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """Render results as an aligned text table."""
+    header = (
+        f"{'benchmark':<32} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'peak MB':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.key:<32} {result.throughput:>9.1f} {result.p50_ms:>9.2f} "
+            f"{result.p95_ms:>9.2f} {result.p99_ms:>9.2f} "
+            f"{result.peak_memory_bytes / 2**20:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,183 @@
+"""
+Benchmark each try-on stage and the full API round trip.
+
+Stages run on synthetic photos at several resolutions:
+`validate_image`, `save_uploaded_image`, `prepare_for_model`,
+`_generate_tryon` and `POST /tryon/` through to a completed status via an
+in-process ASGI client. Results are written as JSON and, when a baseline
+is given, compared against it; the exit status is 1 on a regression.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmarks --output benchmarks/baselines/local.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baselines/local.json
+"""
+
+import argparse
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Isolated storage, and no result reuse between iterations
+_bench_root = tempfile.mkdtemp(prefix="tryon-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_bench_root}/bench.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_bench_root, "uploads")
+os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+from app.services.tryon_service import VirtualTryOnService
+from app.utils.image_processing import IMAGE_BACKENDS, ImageProcessor
+
+from .harness import compare, format_table, load_results, run_benchmark, save_results
+
+STAGES = (
+    "validate_image",
+    "save_uploaded_image",
+    "prepare_for_model",
+    "generate_tryon",
+    "roundtrip",
+)
+DEFAULT_RESOLUTIONS = ("512x768", "1080x1440", "3024x4032")
+
+
+def parse_resolution(value: str):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def synthetic_pixels(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """Gradients plus noise, so JPEG sizes resemble real photos."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([x * 255 // width, y * 255 // height, (x ^ y) & 0xFF], axis=-1)
+    pixels = pixels + rng.integers(-12, 12, size=pixels.shape)
+    return np.clip(pixels, 0, 255).astype(np.uint8)
+
+
+def encode_jpeg(pixels: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def unique_jpegs(pixels: np.ndarray, count: int):
+    """Encode `count` JPEGs that differ in one pixel, defeating content addressing."""
+    payloads = []
+    for i in range(count):
+        variant = pixels.copy()
+        variant[0, 0] = (i % 256, i // 256 % 256, 7)
+        payloads.append(encode_jpeg(variant))
+    return payloads
+
+
+def bench_stages(stages, resolution, iterations, workdir):
+    """Benchmark the in-process stages at one resolution."""
+    width, height = parse_resolution(resolution)
+    pixels = synthetic_pixels(width, height)
+    data = encode_jpeg(pixels)
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    garment = Image.fromarray(synthetic_pixels(width, height, seed=1))
+    service = VirtualTryOnService()
+    save_path = os.path.join(workdir, "saved.jpg")
+    
+    funcs = {
+        "validate_image": lambda i: ImageProcessor.validate_image(data),
+        "save_uploaded_image": lambda i: ImageProcessor.save_uploaded_image(data, save_path),
+        "prepare_for_model": lambda i: ImageProcessor.prepare_for_model(image),
+        "generate_tryon": lambda i: service._generate_tryon(image, garment, "front"),
+    }
+    return [
+        run_benchmark(stage, resolution, funcs[stage], iterations)
+        for stage in stages if stage in funcs
+    ]
+
+
+def bench_roundtrip(client, resolution, iterations, timeout=60.0):
+    """Benchmark POST /tryon/ until the request reports completed."""
+    width, height = parse_resolution(resolution)
+    # Warm-up, timed iterations and the memory pass each need fresh inputs
+    persons = unique_jpegs(synthetic_pixels(width, height), iterations + 2)
+    garment = encode_jpeg(synthetic_pixels(width, height, seed=1))
+    
+    def roundtrip(i):
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={
+                "person_image": ("person.jpg", persons[i], "image/jpeg"),
+                "garment_image": ("garment.jpg", garment, "image/jpeg"),
+            },
+            data={"pose": "front"},
+        )
+        response.raise_for_status()
+        request_id = response.json()["request_id"]
+        
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = client.get(f"{settings.API_V1_STR}/tryon/{request_id}").json()["status"]
+            if status == "completed":
+                return
+            if status == "failed":
+                raise RuntimeError(f"Request {request_id} failed")
+            time.sleep(0.002)
+        raise TimeoutError(f"Request {request_id} did not complete")
+    
+    return run_benchmark("roundtrip", resolution, roundtrip, iterations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the try-on request pipeline")
+    parser.add_argument("--resolutions", nargs="+", default=list(DEFAULT_RESOLUTIONS),
+                        help="WIDTHxHEIGHT of the synthetic inputs")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--backend", choices=IMAGE_BACKENDS, default=settings.IMAGE_BACKEND)
+    parser.add_argument("--output", default="benchmarks/results/latest.json",
+                        help="Where to write the results (use as a future baseline)")
+    parser.add_argument("--baseline", help="Results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown before flagging a regression")
+    args = parser.parse_args()
+    settings.IMAGE_BACKEND = args.backend
+    
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for resolution in args.resolutions:
+            results.extend(bench_stages(args.stages, resolution, args.iterations, workdir))
+    
+    if "roundtrip" in args.stages:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        
+        with TestClient(app) as client:
+            for resolution in args.resolutions:
+                results.append(bench_roundtrip(client, resolution, args.iterations))
+    
+    print(format_table(results))
+    save_results(args.output, results, {
+        "iterations": args.iterations,
+        "image_backend": args.backend,
+        "inference_workers": settings.INFERENCE_WORKERS,
+        "batch_size": settings.INFERENCE_BATCH_SIZE,
+        # Includes native (PIL/OpenCV) buffers that tracemalloc cannot see
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
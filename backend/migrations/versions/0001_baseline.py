@@ -0,0 +1,53 @@
+"""Baseline schema
+
+The `tryon_requests` and `api_keys` tables of the original application.
+Databases it created are brought under Alembic with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tryon_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_image_path", sa.String(), nullable=False),
+        sa.Column("garment_image_path", sa.String(), nullable=False),
+        sa.Column("result_image_path", sa.String(), nullable=True),
+        sa.Column("pose", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("processing_time", sa.Float(), nullable=True),
+    )
+    op.create_index("ix_tryon_requests_id", "tryon_requests", ["id"])
+    
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.Column("usage_count", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_api_keys_id", "api_keys", ["id"])
+    op.create_index("ix_api_keys_key", "api_keys", ["key"], unique=True)
+
+
+def downgrade():
+    op.drop_table("api_keys")
+    op.drop_table("tryon_requests")
@@ -0,0 +1,82 @@
+"""Job leases, result reuse, garment catalog and batch try-on
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tryon_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_image_path", sa.String(), nullable=False),
+        sa.Column("pose", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_tryon_batches_id", "tryon_batches", ["id"])
+    
+    op.create_table(
+        "garments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("sku", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("image_path", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column("preprocessed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_garments_id", "garments", ["id"])
+    op.create_index("ix_garments_sku", "garments", ["sku"])
+    op.create_index("ix_garments_content_hash", "garments", ["content_hash"])
+    
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.add_column(sa.Column("garment_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("batch_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("result_key", sa.String(), nullable=True))
+        # Existing rows have not been attempted by the job queue
+        batch.add_column(
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch.add_column(sa.Column("available_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("lease_owner", sa.String(), nullable=True))
+        batch.add_column(sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+        batch.create_foreign_key(
+            "fk_tryon_requests_garment_id", "garments", ["garment_id"], ["id"]
+        )
+        batch.create_foreign_key(
+            "fk_tryon_requests_batch_id", "tryon_batches", ["batch_id"], ["id"]
+        )
+        batch.create_index("ix_tryon_requests_batch_id", ["batch_id"])
+        batch.create_index("ix_tryon_requests_result_key", ["result_key"])
+
+
+def downgrade():
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.drop_index("ix_tryon_requests_result_key")
+        batch.drop_index("ix_tryon_requests_batch_id")
+        batch.drop_constraint("fk_tryon_requests_batch_id", type_="foreignkey")
+        batch.drop_constraint("fk_tryon_requests_garment_id", type_="foreignkey")
+        batch.drop_column("lease_expires_at")
+        batch.drop_column("lease_owner")
+        batch.drop_column("available_at")
+        batch.drop_column("attempts")
+        batch.drop_column("result_key")
+        batch.drop_column("batch_id")
+        batch.drop_column("garment_id")
+    
+    op.drop_table("garments")
+    op.drop_table("tryon_batches")
@@ -0,0 +1,32 @@
+"""Composite indexes for keyset pagination of listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tryon_requests_created_at_id", "tryon_requests", ["created_at", "id"])
+    op.create_index(
+        "ix_tryon_requests_status_created_at_id", "tryon_requests", ["status", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_tryon_requests_pose_created_at_id", "tryon_requests", ["pose", "created_at", "id"]
+    )
+    op.create_index("ix_api_keys_created_at_id", "api_keys", ["created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_api_keys_created_at_id", table_name="api_keys")
+    op.drop_index("ix_tryon_requests_pose_created_at_id", table_name="tryon_requests")
+    op.drop_index("ix_tryon_requests_status_created_at_id", table_name="tryon_requests")
+    op.drop_index("ix_tryon_requests_created_at_id", table_name="tryon_requests")
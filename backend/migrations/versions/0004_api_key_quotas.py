@@ -0,0 +1,43 @@
+"""Per-key quotas and fair-share flow of try-on jobs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("api_keys") as batch:
+        batch.add_column(sa.Column("rate_limit_per_minute", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("rate_limit_burst", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("weight", sa.Float(), nullable=True))
+
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.add_column(sa.Column("api_key_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_tryon_requests_api_key_id", "api_keys", ["api_key_id"], ["id"]
+        )
+        batch.create_index(
+            "ix_tryon_requests_status_api_key_id_id", ["status", "api_key_id", "id"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.drop_index("ix_tryon_requests_status_api_key_id_id")
+        batch.drop_constraint("fk_tryon_requests_api_key_id", type_="foreignkey")
+        batch.drop_column("api_key_id")
+
+    with op.batch_alter_table("api_keys") as batch:
+        batch.drop_column("weight")
+        batch.drop_column("rate_limit_burst")
+        batch.drop_column("rate_limit_per_minute")
@@ -0,0 +1,36 @@
+"""Priority classes for try-on jobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.add_column(
+            sa.Column("priority", sa.String(), nullable=False, server_default="standard")
+        )
+        batch.drop_index("ix_tryon_requests_status_api_key_id_id")
+        batch.create_index(
+            "ix_tryon_requests_status_priority_api_key_id_id",
+            ["status", "priority", "api_key_id", "id"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("tryon_requests") as batch:
+        batch.drop_index("ix_tryon_requests_status_priority_api_key_id_id")
+        batch.create_index(
+            "ix_tryon_requests_status_api_key_id_id", ["status", "api_key_id", "id"]
+        )
+        batch.drop_column("priority")
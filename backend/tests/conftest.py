@@ -2,9 +2,15 @@
 
 import pytest
 import os
+import tempfile
 from PIL import Image
 import io
 
+# Point the application at throwaway storage before it is imported
+_test_root = tempfile.mkdtemp(prefix="tryon-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_test_root}/test.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_test_root, "uploads"))
+
 
 @pytest.fixture
 def sample_person_image():
@@ -35,3 +41,29 @@ def test_upload_dir(tmp_path):
     (upload_dir / "garments").mkdir()
     (upload_dir / "results").mkdir()
     return str(upload_dir)
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    """Create an async session factory on a fresh SQLite database."""
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    from app.models.database import Base
+    
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    await engine.dispose()
+
+
+@pytest.fixture
+def client():
+    """Test client with the application lifespan running."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,124 @@
+"""Tests for API key authentication and usage accounting."""
+
+from app.core.config import settings
+from app.models.database import APIKey
+from app.services.api_key_index import APIKeyIndex
+
+
+async def _create_key(session_maker, key, is_active=True):
+    async with session_maker() as session:
+        api_key = APIKey(key=key, name=f"key {key}", is_active=is_active)
+        session.add(api_key)
+        await session.commit()
+        return api_key
+
+
+async def _get_key(session_maker, key_id):
+    async with session_maker() as session:
+        return await session.get(APIKey, key_id)
+
+
+class TestAPIKeyIndex:
+    """Test APIKeyIndex class."""
+    
+    async def test_load_indexes_active_keys(self, session_maker):
+        """Test that only active keys authenticate."""
+        active = await _create_key(session_maker, "sk_active")
+        await _create_key(session_maker, "sk_revoked", is_active=False)
+        index = APIKeyIndex(session_maker)
+        await index.load()
+        
+        assert index.authenticate("sk_active").id == active.id
+        assert index.authenticate("sk_revoked") is None
+        assert index.authenticate(None) is None
+        assert index.stats()["active_keys"] == 1
+        assert index.stats()["rejected"] == 2
+    
+    async def test_add_and_remove(self, session_maker):
+        """Test that created and deactivated keys take effect immediately."""
+        index = APIKeyIndex(session_maker)
+        await index.load()
+        api_key = await _create_key(session_maker, "sk_new")
+        
+        assert index.authenticate("sk_new") is None
+        index.add(api_key)
+        assert index.authenticate("sk_new").name == "key sk_new"
+        index.remove("sk_new")
+        assert index.authenticate("sk_new") is None
+    
+    async def test_usage_flushed_in_batches(self, session_maker):
+        """Test that usage accumulates in memory and is written on flush."""
+        first = await _create_key(session_maker, "sk_first")
+        second = await _create_key(session_maker, "sk_second")
+        index = APIKeyIndex(session_maker)
+        await index.load()
+        
+        for _ in range(3):
+            index.authenticate("sk_first")
+        index.authenticate("sk_second")
+        assert (await _get_key(session_maker, first.id)).usage_count == 0
+        assert index.stats()["pending_usage"] == 4
+        
+        await index.flush()
+        await index.flush()
+        
+        first_row = await _get_key(session_maker, first.id)
+        second_row = await _get_key(session_maker, second.id)
+        assert first_row.usage_count == 3
+        assert first_row.last_used_at is not None
+        assert second_row.usage_count == 1
+        assert index.stats()["pending_usage"] == 0
+
+
+class TestAPIKeyAuth:
+    """Test API key enforcement on the try-on routes."""
+    
+    def test_tryon_requires_key_when_enabled(self, client, monkeypatch):
+        """Test that try-on routes reject unknown keys and accept issued ones."""
+        monkeypatch.setattr(settings, "API_KEY_AUTH_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        admin = {"X-Admin-Key": "admin-secret"}
+        url = f"{settings.API_V1_STR}/tryon/"
+        
+        response = client.get(url)
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert client.get(url, headers={"X-API-Key": "sk_nope"}).status_code == 401
+        
+        created = client.post(
+            f"{settings.API_V1_STR}/api-keys/", json={"name": "kiosk"}, headers=admin
+        ).json()
+        key = created["key"]
+        assert client.get(url, headers={"X-API-Key": key}).status_code == 200
+        assert client.get(url, headers={"Authorization": f"Bearer {key}"}).status_code == 200
+        assert client.get(url, params={"api_key": key}).status_code == 200
+        
+        client.delete(f"{settings.API_V1_STR}/api-keys/{created['id']}", headers=admin)
+        assert client.get(url, headers={"X-API-Key": key}).status_code == 401
+    
+    def test_key_management_requires_admin_key(self, client, monkeypatch):
+        """Test that /api-keys rejects callers without the admin key."""
+        monkeypatch.setattr(settings, "API_KEY_AUTH_ENABLED", True)
+        url = f"{settings.API_V1_STR}/api-keys/"
+        
+        # Closed entirely until an admin key is configured
+        assert client.post(url, json={"name": "intruder"}).status_code == 403
+        
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        admin = {"X-Admin-Key": "admin-secret"}
+        created = client.post(url, json={"name": "kiosk"}, headers=admin).json()
+        
+        response = client.post(url, json={"name": "intruder"})
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert client.get(url).status_code == 401
+        # A client key is not an admin key
+        assert client.get(url, headers={"X-Admin-Key": created["key"]}).status_code == 401
+        assert client.get(url, headers={"X-API-Key": created["key"]}).status_code == 401
+        
+        listed = client.get(url, headers={"Authorization": "Bearer admin-secret"})
+        assert listed.status_code == 200
+        assert created["id"] in [item["id"] for item in listed.json()]
+        assert all("key" not in item for item in listed.json())
+        updated = client.patch(f"{url}{created['id']}", json={"weight": 2.0}, headers=admin)
+        assert "key" not in updated.json()
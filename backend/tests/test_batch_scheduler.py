@@ -0,0 +1,72 @@
+"""Tests for the micro-batching inference scheduler."""
+
+import asyncio
+import os
+
+import pytest
+
+from app.services.batch_scheduler import BatchScheduler
+from app.services.inference_executor import InferenceExecutor
+from app.utils.image_processing import ImageProcessor
+
+
+@pytest.fixture
+def saved_images(sample_person_image, sample_garment_image, test_upload_dir):
+    person_path = f"{test_upload_dir}/persons/person.jpg"
+    garment_path = f"{test_upload_dir}/garments/garment.jpg"
+    ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+    ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+    return person_path, garment_path
+
+
+class TestBatchScheduler:
+    """Test BatchScheduler class."""
+    
+    async def test_jobs_are_batched(self, saved_images, test_upload_dir):
+        """Test that concurrent jobs are grouped into one batch."""
+        person_path, garment_path = saved_images
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=8)
+        scheduler = BatchScheduler(executor, max_batch_size=4, max_wait_ms=2000)
+        
+        jobs = [
+            (person_path, garment_path, "front", f"{test_upload_dir}/results/r{i}.jpg")
+            for i in range(4)
+        ]
+        for _ in jobs:
+            executor.reserve()
+        
+        try:
+            results = await asyncio.gather(*(scheduler.submit(job) for job in jobs))
+        finally:
+            await scheduler.shutdown()
+            await executor.shutdown()
+        
+        assert all(success for success, _, _ in results)
+        assert all(os.path.exists(job[3]) for job in jobs)
+        
+        stats = scheduler.stats()
+        assert stats["batches"] == 1
+        assert stats["fill_ratio"] == 1.0
+        assert executor.stats()["admitted"] == 0
+    
+    async def test_partial_batch_flushes_after_wait(self, saved_images, test_upload_dir):
+        """Test that a lone job is dispatched once the wait window expires."""
+        person_path, garment_path = saved_images
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=8)
+        scheduler = BatchScheduler(executor, max_batch_size=8, max_wait_ms=20)
+        executor.reserve()
+        
+        try:
+            success, error_msg, _ = await asyncio.wait_for(
+                scheduler.submit((
+                    person_path, garment_path, "front",
+                    f"{test_upload_dir}/results/single.jpg"
+                )),
+                timeout=5
+            )
+        finally:
+            await scheduler.shutdown()
+            await executor.shutdown()
+        
+        assert success is True
+        assert scheduler.stats()["fill_ratio"] == pytest.approx(1 / 8)
@@ -0,0 +1,72 @@
+"""Tests for the benchmark harness statistics and regression checks."""
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    compare,
+    load_results,
+    percentile,
+    save_results,
+    summarize,
+)
+
+
+def _result(name="prepare_for_model", p50=10.0, p95=12.0, throughput=100.0):
+    return BenchmarkResult(
+        name=name,
+        resolution="512x768",
+        iterations=20,
+        throughput=throughput,
+        mean_ms=p50,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p95,
+        peak_memory_bytes=0,
+    )
+
+
+class TestBenchmarkHarness:
+    """Test benchmark harness helpers."""
+    
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        samples = list(range(1, 101))
+        
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+    
+    def test_summarize(self):
+        """Test throughput and latency summary of wall times."""
+        result = summarize("stage", "512x768", [0.01, 0.02, 0.03, 0.04], 1024)
+        
+        assert result.key == "stage@512x768"
+        assert result.throughput == 4 / 0.1
+        assert result.p50_ms == 20.0
+        assert result.p99_ms == 40.0
+    
+    def test_compare_flags_regressions(self):
+        """Test that slowdowns beyond the threshold are flagged."""
+        baseline = [_result(), _result("generate_tryon")]
+        current = [_result(p50=15.0, throughput=60.0), _result("generate_tryon", p50=11.0)]
+        
+        regressions = compare(current, baseline, threshold=0.25)
+        
+        assert {(r.key, r.metric) for r in regressions} == {
+            ("prepare_for_model@512x768", "p50_ms"),
+            ("prepare_for_model@512x768", "throughput"),
+        }
+    
+    def test_compare_ignores_small_absolute_changes(self):
+        """Test that sub-millisecond jitter is not a regression."""
+        baseline = [_result(p50=0.05, p95=0.06)]
+        current = [_result(p50=0.2, p95=0.2)]
+        
+        assert compare(current, baseline) == []
+    
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that saved results load back unchanged."""
+        path = str(tmp_path / "baseline.json")
+        save_results(path, [_result()], {"iterations": 20})
+        
+        assert load_results(path) == [_result()]
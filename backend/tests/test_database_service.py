@@ -0,0 +1,72 @@
+"""Tests for database engine configuration."""
+
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from app.core.config import settings
+from app.models.database import TryOnRequest
+from app.services.database_service import DatabaseService, async_database_url, engine_options
+
+
+class TestEngineOptions:
+    """Test URL and pool configuration."""
+    
+    def test_async_driver_is_selected(self):
+        """Test that plain URLs are switched to their async drivers."""
+        assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+        postgres = "postgresql+asyncpg://u:p@db/tryon"
+        assert async_database_url("postgresql://u:p@db/tryon") == postgres
+        assert async_database_url(postgres) == postgres
+    
+    def test_pool_options(self):
+        """Test pooling for SQLite files, in-memory SQLite and PostgreSQL."""
+        assert engine_options("sqlite+aiosqlite:///./x.db")["poolclass"] is AsyncAdaptedQueuePool
+        assert engine_options("sqlite+aiosqlite://")["poolclass"] is StaticPool
+        
+        options = engine_options("postgresql+asyncpg://u:p@db/tryon")
+        assert options["pool_size"] == settings.DATABASE_POOL_SIZE
+        assert options["max_overflow"] == settings.DATABASE_MAX_OVERFLOW
+        assert options["pool_pre_ping"] is True
+
+
+class TestDatabaseService:
+    """Test DatabaseService class."""
+    
+    async def test_sqlite_pragmas(self, tmp_path):
+        """Test that connections are tuned through the connect event."""
+        service = DatabaseService(f"sqlite+aiosqlite:///{tmp_path}/pragmas.db")
+        try:
+            async with service.engine.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+                busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+                assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+        finally:
+            await service.close()
+    
+    async def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent committing sessions wait for the lock instead of failing."""
+        service = DatabaseService(f"sqlite+aiosqlite:///{tmp_path}/writers.db")
+        await service.init_db()
+        
+        async def write(index):
+            async with service.async_session_maker() as session:
+                session.add(TryOnRequest(
+                    user_image_path=f"p{index}.jpg",
+                    garment_image_path="g.jpg",
+                    pose="front",
+                    status="pending"
+                ))
+                await session.commit()
+        
+        try:
+            await asyncio.gather(*(write(i) for i in range(20)))
+            async with service.async_session_maker() as session:
+                result = await session.execute(text("SELECT COUNT(*) FROM tryon_requests"))
+                count = result.scalar()
+            assert count == 20
+            assert service.stats()["pool"] == "AsyncAdaptedQueuePool"
+        finally:
+            await service.close()
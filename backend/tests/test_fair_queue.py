@@ -0,0 +1,205 @@
+"""Tests for weighted fair queuing."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.services.batch_scheduler import BatchScheduler
+from app.services.fair_queue import FairQueue, PriorityFairQueue
+from app.services.inference_executor import InferenceExecutor
+from app.services.job_queue import JobQueue
+from app.models.database import TryOnRequest
+from app.utils.image_processing import ImageProcessor
+
+
+def _drain(queue):
+    return [queue.pop() for _ in range(len(queue))]
+
+
+class TestFairQueue:
+    """Test FairQueue class."""
+    
+    def test_backlogged_flows_alternate(self):
+        """Test that a late flow is not stuck behind another's backlog."""
+        queue = FairQueue()
+        for i in range(4):
+            queue.push(f"bulk{i}", flow="bulk")
+        queue.push("kiosk0", flow="kiosk")
+        queue.push("kiosk1", flow="kiosk")
+        
+        assert _drain(queue) == ["bulk0", "kiosk0", "bulk1", "kiosk1", "bulk2", "bulk3"]
+    
+    def test_weights_set_the_share(self):
+        """Test that a flow with twice the weight gets twice the turns."""
+        queue = FairQueue()
+        for i in range(6):
+            queue.push(("heavy", i), flow="heavy", weight=2.0)
+            queue.push(("light", i), flow="light", weight=1.0)
+        
+        first_six = [flow for flow, _ in _drain(queue)[:6]]
+        assert first_six.count("heavy") == 4
+        assert first_six.count("light") == 2
+    
+    def test_idle_flow_gets_no_credit(self):
+        """Test that a flow returning from idle does not jump the whole backlog."""
+        queue = FairQueue()
+        for i in range(3):
+            queue.push(f"a{i}", flow="a")
+        assert queue.pop() == "a0"
+        assert queue.pop() == "a1"
+        
+        queue.push("b0", flow="b")
+        queue.push("b1", flow="b")
+        assert queue.backlog() == {"a": 1, "b": 2}
+        # b starts at the current virtual time, not at zero, so b1 waits for a2
+        assert _drain(queue) == ["b0", "a2", "b1"]
+
+
+class TestPriorityFairQueue:
+    """Test PriorityFairQueue class."""
+    
+    def test_higher_classes_first(self):
+        """Test that classes are served in priority order, FIFO within one."""
+        queue = PriorityFairQueue(["interactive", "standard", "bulk"])
+        queue.push("bulk0", "bulk")
+        queue.push("standard0", "standard")
+        queue.push("bulk1", "bulk")
+        queue.push("interactive0", "interactive")
+        
+        assert queue.depth() == {"interactive": 1, "standard": 1, "bulk": 2}
+        assert [queue.pop() for _ in range(4)] == ["interactive0", "standard0", "bulk0", "bulk1"]
+    
+    def test_waiting_jobs_age_up(self, monkeypatch):
+        """Test that a long-waiting bulk job is not starved by fresh interactive ones."""
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        queue = PriorityFairQueue(["interactive", "standard", "bulk"], aging=10.0)
+        queue.push("bulk0", "bulk")
+        
+        clock[0] += 15.0
+        queue.push("interactive0", "interactive")
+        assert queue.pop() == "interactive0"
+        
+        clock[0] += 10.0
+        queue.push("interactive1", "interactive")
+        assert queue.pop() == "bulk0"
+        assert queue.pop() == "interactive1"
+
+
+class TestFairScheduling:
+    """Test fair ordering where jobs actually wait."""
+    
+    async def test_scheduler_serves_flows_fairly(
+        self, sample_person_image, sample_garment_image, test_upload_dir
+    ):
+        """Test that a kiosk job overtakes a queued bulk backlog."""
+        person_path = f"{test_upload_dir}/persons/person.jpg"
+        garment_path = f"{test_upload_dir}/garments/garment.jpg"
+        ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+        ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+        
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=8)
+        scheduler = BatchScheduler(executor, max_batch_size=1)
+        finished = []
+        
+        async def submit(name, flow):
+            executor.reserve()
+            job = (person_path, garment_path, "front", f"{test_upload_dir}/results/{name}.jpg")
+            await scheduler.submit(job, flow=flow)
+            finished.append(name)
+        
+        # Keep the only worker busy while the jobs queue up
+        await executor.acquire_worker()
+        tasks = [asyncio.create_task(submit(f"bulk{i}", "bulk")) for i in range(3)]
+        tasks.append(asyncio.create_task(submit("kiosk", "kiosk")))
+        await asyncio.sleep(0.05)
+        executor.release_worker()
+        
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), 10)
+        finally:
+            await scheduler.shutdown()
+            await executor.shutdown()
+        
+        assert finished == ["bulk0", "kiosk", "bulk1", "bulk2"]
+    
+    async def test_scheduler_serves_interactive_first(
+        self, sample_person_image, sample_garment_image, test_upload_dir
+    ):
+        """Test that queued interactive jobs go ahead of bulk ones and are measured apart."""
+        person_path = f"{test_upload_dir}/persons/person.jpg"
+        garment_path = f"{test_upload_dir}/garments/garment.jpg"
+        ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+        ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+        
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=8)
+        scheduler = BatchScheduler(executor, max_batch_size=1)
+        finished = []
+        
+        async def submit(name, priority):
+            executor.reserve()
+            job = (person_path, garment_path, "front", f"{test_upload_dir}/results/{name}.jpg")
+            await scheduler.submit(job, priority=priority)
+            finished.append(name)
+        
+        await executor.acquire_worker()
+        tasks = [asyncio.create_task(submit(f"bulk{i}", "bulk")) for i in range(3)]
+        tasks.append(asyncio.create_task(submit("kiosk", "interactive")))
+        await asyncio.sleep(0.05)
+        assert scheduler.stats()["pending_by_priority"]["bulk"] == 3
+        executor.release_worker()
+        
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), 10)
+        finally:
+            await scheduler.shutdown()
+            await executor.shutdown()
+        
+        # Jobs are picked once a worker is free, so the kiosk job goes first
+        assert finished == ["kiosk", "bulk0", "bulk1", "bulk2"]
+        waits = scheduler.stats()["queue_wait_by_priority"]
+        assert waits["interactive"]["jobs"] == 1
+        assert waits["bulk"]["jobs"] == 3
+        assert waits["bulk"]["max_ms"] >= waits["bulk"]["p95_ms"] > 0
+    
+    async def test_claim_is_fair_across_keys(self, session_maker):
+        """Test that polling workers interleave API keys."""
+        async with session_maker() as session:
+            for api_key_id in (1, 1, 1, 2):
+                session.add(TryOnRequest(
+                    user_image_path="person.jpg",
+                    garment_image_path="garment.jpg",
+                    pose="front",
+                    status="pending",
+                    api_key_id=api_key_id
+                ))
+            await session.commit()
+        
+        queue = JobQueue(session_maker)
+        claimed = [(await queue.claim("w")).api_key_id for _ in range(4)]
+        
+        assert claimed == [1, 2, 1, 1]
+        assert await queue.claim("w") is None
+    
+    async def test_claim_by_priority_with_aging(self, session_maker, monkeypatch):
+        """Test that claims prefer interactive jobs unless bulk ones waited too long."""
+        monkeypatch.setattr(settings, "PRIORITY_AGING_SECONDS", 30.0)
+        now = datetime.utcnow()
+        async with session_maker() as session:
+            for priority, age in (("bulk", 120), ("standard", 0), ("interactive", 0), ("bulk", 0)):
+                session.add(TryOnRequest(
+                    user_image_path="person.jpg",
+                    garment_image_path="garment.jpg",
+                    pose="front",
+                    priority=priority,
+                    status="pending",
+                    created_at=now - timedelta(seconds=age)
+                ))
+            await session.commit()
+        
+        queue = JobQueue(session_maker)
+        first = await queue.claim("w")
+        assert (first.priority, first.id) == ("bulk", 1)
+        claimed = [(await queue.claim("w")).priority for _ in range(3)]
+        assert claimed == ["interactive", "standard", "bulk"]
@@ -0,0 +1,72 @@
+"""Tests for the content-addressed garment cache."""
+
+import os
+
+import numpy as np
+
+from app.services.garment_cache import GarmentCache
+from app.utils import ImageProcessor, content_hash
+
+
+def _store(cache, image_bytes):
+    """Store a garment the way registration does, under its content hash."""
+    garment_hash = content_hash(image_bytes)
+    ImageProcessor.pipeline(image_bytes).store(cache.image_path(garment_hash))
+    return garment_hash
+
+
+class TestGarmentCache:
+    """Test GarmentCache class."""
+    
+    def test_image_path_round_trip(self, test_upload_dir):
+        """Test that stored garment paths map back to their hash."""
+        cache = GarmentCache(root=f"{test_upload_dir}/garments")
+        garment_hash = "ab" * 32
+        
+        path = cache.image_path(garment_hash)
+        assert path.startswith(f"{test_upload_dir}/garments")
+        assert GarmentCache.hash_from_path(path) == garment_hash
+    
+    def test_hash_from_path_ignores_other_files(self):
+        """Test that non content-addressed paths are not treated as cached."""
+        assert GarmentCache.hash_from_path("/tmp/garment_1234.jpg") is None
+    
+    def test_tensor_tiers(self, sample_garment_image, test_upload_dir):
+        """Test memory, disk and miss paths for garment tensors."""
+        cache = GarmentCache(root=f"{test_upload_dir}/garments")
+        garment_hash = _store(cache, sample_garment_image.read())
+        
+        tensor = cache.get_tensor(garment_hash)
+        assert tensor.shape == (3, 1024, 768)
+        assert tensor.dtype == np.float32
+        assert os.path.exists(cache.tensor_path(garment_hash))
+        assert cache.misses == 1
+        
+        assert cache.get_tensor(garment_hash) is tensor
+        assert cache.memory_hits == 1
+        
+        # A fresh cache (e.g. another worker process) reads the disk tier
+        other = GarmentCache(root=f"{test_upload_dir}/garments")
+        np.testing.assert_array_equal(other.get_tensor(garment_hash), tensor)
+        assert other.disk_hits == 1
+    
+    def test_memory_budget_evicts_lru(
+        self, sample_garment_image, sample_person_image, test_upload_dir
+    ):
+        """Test that the memory tier stays within its byte budget."""
+        tensor_bytes = 3 * 1024 * 768 * 4
+        cache = GarmentCache(root=f"{test_upload_dir}/garments", max_bytes=tensor_bytes)
+        first = _store(cache, sample_garment_image.read())
+        second = _store(cache, sample_person_image.read())
+        
+        cache.get_tensor(first)
+        cache.get_tensor(second)
+        
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] <= tensor_bytes
+    
+    def test_missing_garment(self, test_upload_dir):
+        """Test that unknown hashes yield no tensor."""
+        cache = GarmentCache(root=f"{test_upload_dir}/garments")
+        assert cache.get_tensor("0" * 64) is None
@@ -0,0 +1,159 @@
+"""Tests for the garment catalog endpoints."""
+
+import time
+
+from app.core.config import settings
+from app.services import inference_executor
+
+
+def _wait_for_garment(client, garment_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        garment = client.get(f"{settings.API_V1_STR}/garments/{garment_id}").json()
+        if garment["status"] != "pending":
+            return garment
+        time.sleep(0.05)
+    raise AssertionError(f"Garment {garment_id} was not preprocessed")
+
+
+class TestGarmentsAPI:
+    """Test garment catalog endpoints."""
+    
+    def test_register_and_preprocess(self, client, sample_garment_image):
+        """Test that a registered garment is preprocessed in the background."""
+        response = client.post(
+            f"{settings.API_V1_STR}/garments/",
+            files={"image": ("shirt.jpg", sample_garment_image.getvalue(), "image/jpeg")},
+            data={"name": "Red shirt", "sku": "RS-1"}
+        )
+        assert response.status_code == 200
+        garment = response.json()
+        assert garment["name"] == "Red shirt"
+        
+        assert _wait_for_garment(client, garment["id"])["status"] == "ready"
+    
+    def test_requires_key_when_enabled(self, client, sample_garment_image, monkeypatch):
+        """Test that the catalog is closed to callers without an API key."""
+        monkeypatch.setattr(settings, "API_KEY_AUTH_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        url = f"{settings.API_V1_STR}/garments/"
+        files = {"image": ("shirt.jpg", sample_garment_image.getvalue(), "image/jpeg")}
+        
+        assert client.get(url).status_code == 401
+        assert client.post(url, files=files).status_code == 401
+        assert client.delete(f"{url}1").status_code == 401
+        
+        key = client.post(
+            f"{settings.API_V1_STR}/api-keys/",
+            json={"name": "catalog"},
+            headers={"X-Admin-Key": "admin-secret"}
+        ).json()["key"]
+        headers = {"X-API-Key": key}
+        assert client.post(url, files=files, headers=headers).status_code == 200
+        assert client.get(url, headers=headers).status_code == 200
+    
+    def test_bulk_register(self, client, sample_garment_image, sample_person_image):
+        """Test registering several garments in one request."""
+        response = client.post(
+            f"{settings.API_V1_STR}/garments/bulk",
+            files=[
+                ("images", ("a.jpg", sample_garment_image.getvalue(), "image/jpeg")),
+                ("images", ("b.jpg", sample_person_image.getvalue(), "image/jpeg")),
+            ],
+            data={"names": ["A", "B"]}
+        )
+        assert response.status_code == 200
+        garments = response.json()
+        assert [garment["name"] for garment in garments] == ["A", "B"]
+        
+        for garment in garments:
+            assert _wait_for_garment(client, garment["id"])["status"] == "ready"
+    
+    def test_bulk_register_preprocesses_in_chunks(self, client, sample_garment_image, monkeypatch):
+        """Test that a catalog import is split into several pool jobs."""
+        monkeypatch.setattr(settings, "GARMENT_PREPROCESS_CHUNK_SIZE", 2)
+        chunks = []
+        run = inference_executor.run
+        
+        async def spy(fn, *args, **kwargs):
+            chunks.append(len(args[0]))
+            return await run(fn, *args, **kwargs)
+        
+        monkeypatch.setattr(inference_executor, "run", spy)
+        response = client.post(
+            f"{settings.API_V1_STR}/garments/bulk",
+            files=[
+                ("images", (f"{index}.jpg", sample_garment_image.getvalue(), "image/jpeg"))
+                for index in range(5)
+            ]
+        )
+        assert response.status_code == 200
+        
+        for garment in response.json():
+            assert _wait_for_garment(client, garment["id"])["status"] == "ready"
+        assert chunks == [2, 2, 1]
+    
+    def test_tryon_with_garment_id(self, client, sample_person_image, sample_garment_image):
+        """Test that try-on requests can reference a catalog garment."""
+        garment = client.post(
+            f"{settings.API_V1_STR}/garments/",
+            files={"image": ("shirt.jpg", sample_garment_image.getvalue(), "image/jpeg")}
+        ).json()
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={"person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg")},
+            data={"garment_id": str(garment["id"])}
+        )
+        assert response.status_code == 200
+        
+        detail = client.get(
+            f"{settings.API_V1_STR}/tryon/{response.json()['request_id']}"
+        ).json()
+        assert detail["garment_id"] == garment["id"]
+    
+    def test_tryon_requires_one_garment_source(self, client, sample_person_image):
+        """Test that a garment image or garment_id is required."""
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={"person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg")}
+        )
+        assert response.status_code == 400
+    
+    def test_deleted_garment_unavailable(self, client, sample_person_image, sample_garment_image):
+        """Test that removed garments cannot be used for try-on."""
+        garment = client.post(
+            f"{settings.API_V1_STR}/garments/",
+            files={"image": ("shirt.jpg", sample_garment_image.getvalue(), "image/jpeg")}
+        ).json()
+        assert client.delete(f"{settings.API_V1_STR}/garments/{garment['id']}").status_code == 200
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={"person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg")},
+            data={"garment_id": str(garment["id"])}
+        )
+        assert response.status_code == 404
+    
+    def test_failed_garment_rejected(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that garments whose preprocessing failed are rejected with 409."""
+        async def fail(fn, garment_hashes, reserved):
+            inference_executor.release()
+            return ["unreadable image"] * len(garment_hashes)
+        
+        monkeypatch.setattr(inference_executor, "run", fail)
+        garment = client.post(
+            f"{settings.API_V1_STR}/garments/",
+            files={"image": ("shirt.jpg", sample_garment_image.getvalue(), "image/jpeg")}
+        ).json()
+        assert _wait_for_garment(client, garment["id"])["status"] == "failed"
+        monkeypatch.undo()
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={"person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg")},
+            data={"garment_id": str(garment["id"])}
+        )
+        assert response.status_code == 409
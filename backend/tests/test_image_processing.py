@@ -3,8 +3,10 @@
 import pytest
 from PIL import Image
 import io
+import os
+import numpy as np
 
-from app.utils.image_processing import ImageProcessor
+from app.utils.image_processing import ImageProcessor, ImagePipeline, MODEL_INPUT_SIZE
 
 
 class TestImageProcessor:
@@ -50,3 +52,132 @@ class TestImageProcessor:
         # Check normalization
         assert prepared.min() >= 0
         assert prepared.max() <= 1
+    
+    def test_normalize_image_file(self, test_upload_dir):
+        """Test single-pass decode and normalization of an image file."""
+        source_path = f"{test_upload_dir}/source.png"
+        Image.new('RGBA', (64, 48), color=(255, 0, 0, 0)).save(source_path)
+        save_path = f"{test_upload_dir}/persons/normalized.jpg"
+        
+        ImageProcessor.normalize_image_file(source_path, save_path)
+        
+        normalized = Image.open(save_path)
+        assert normalized.format == 'JPEG'
+        assert normalized.mode == 'RGB'
+        assert normalized.size == (64, 48)
+    
+    def test_normalize_invalid_image_file(self, test_upload_dir):
+        """Test that undecodable files raise ValueError."""
+        source_path = f"{test_upload_dir}/broken.jpg"
+        with open(source_path, 'wb') as f:
+            f.write(b'\xff\xd8\xff' + b'garbage')
+        
+        with pytest.raises(ValueError):
+            ImageProcessor.normalize_image_file(source_path, f"{test_upload_dir}/out.jpg")
+        assert not os.path.exists(f"{test_upload_dir}/out.jpg")
+
+
+class TestImagePipeline:
+    """Test ImagePipeline class."""
+    
+    def test_rgb_jpeg_keeps_original_bytes(self, test_upload_dir):
+        """Test that RGB JPEGs are stored without re-encoding."""
+        source_path = f"{test_upload_dir}/original.jpg"
+        Image.new('RGB', (64, 48), color='red').save(source_path, 'JPEG', quality=70)
+        save_path = f"{test_upload_dir}/persons/kept.jpg"
+        
+        pipeline = ImagePipeline(source_path)
+        assert not pipeline.needs_conversion
+        pipeline.store(save_path)
+        
+        with open(source_path, 'rb') as original, open(save_path, 'rb') as stored:
+            assert original.read() == stored.read()
+    
+    def test_draft_decodes_large_jpeg_at_reduced_scale(self):
+        """Test that model prep decodes large JPEGs at a reduced scale."""
+        buffer = io.BytesIO()
+        Image.new('RGB', (3072, 4096), color='blue').save(buffer, 'JPEG')
+        
+        pipeline = ImagePipeline(buffer.getvalue())
+        tensor = pipeline.to_model_input()
+        
+        assert tensor.shape == (3, 1024, 768)
+        assert pipeline.decode(MODEL_INPUT_SIZE).size == (768, 1024)
+    
+    def test_model_input_matches_full_decode(self):
+        """Test that the draft path stays close to the full-resolution path."""
+        y, x = np.mgrid[0:2048, 0:1536]
+        pixels = np.stack([x % 256, y % 256, (x + y) // 16 % 256], axis=-1).astype(np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, 'JPEG', quality=90)
+        data = buffer.getvalue()
+        
+        expected = ImageProcessor.prepare_for_model(Image.open(io.BytesIO(data)).convert('RGB'))
+        actual = ImagePipeline(data).to_model_input()
+        
+        assert np.abs(actual - expected).mean() < 0.02
+    
+    def test_full_decode_after_draft(self):
+        """Test that a full-size decode is still available after a draft."""
+        buffer = io.BytesIO()
+        Image.new('RGB', (3072, 4096), color='blue').save(buffer, 'JPEG')
+        
+        pipeline = ImagePipeline(buffer.getvalue())
+        pipeline.decode(MODEL_INPUT_SIZE)
+        
+        assert pipeline.decode().size == (3072, 4096)
+    
+    def test_invalid_source(self):
+        """Test that non-images raise ValueError on open."""
+        with pytest.raises(ValueError):
+            ImagePipeline(b"not an image")
+
+
+def _textured_image(width, height):
+    """Smooth gradients with mild noise, like a downscaled photo."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack(
+        [x * 255 // width, y * 255 // height, (x + y) * 127 // (width + height)], axis=-1
+    )
+    pixels = pixels + rng.integers(-6, 6, size=pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+class TestOpenCVBackend:
+    """Test parity of the OpenCV preprocessing backend with the PIL one."""
+    
+    @pytest.mark.parametrize("size", [(1536, 2048), (512, 768), (1000, 900)])
+    def test_parity_with_pil(self, size):
+        """Test that both backends produce nearly identical model input."""
+        img = _textured_image(*size)
+        
+        expected = ImageProcessor.prepare_for_model(img, backend="pil")
+        actual = ImageProcessor.prepare_for_model(img, backend="opencv")
+        
+        assert actual.shape == expected.shape == (3, 1024, 768)
+        assert actual.dtype == np.float32
+        assert np.abs(actual - expected).mean() < 0.01
+        assert np.abs(actual - expected).max() < 0.1
+    
+    def test_writes_into_preallocated_buffer(self):
+        """Test that the output buffer is filled in place and returned."""
+        img = _textured_image(768, 1024)
+        batch = np.zeros((2, 3, 1024, 768), dtype=np.float32)
+        
+        result = ImageProcessor.prepare_for_model(img, out=batch[1], backend="opencv")
+        
+        assert np.shares_memory(result, batch)
+        np.testing.assert_allclose(batch[1], np.asarray(img).transpose(2, 0, 1) / 255.0, atol=1e-6)
+        assert not batch[0].any()
+    
+    def test_backend_selected_from_settings(self, monkeypatch):
+        """Test that IMAGE_BACKEND picks the backend and bad values fail."""
+        from app.core.config import settings
+        
+        monkeypatch.setattr(settings, "IMAGE_BACKEND", "opencv")
+        assert ImageProcessor.prepare_for_model(_textured_image(64, 64)).shape == (3, 1024, 768)
+        
+        monkeypatch.setattr(settings, "IMAGE_BACKEND", "gpu")
+        with pytest.raises(ValueError):
+            ImageProcessor.prepare_for_model(_textured_image(64, 64))
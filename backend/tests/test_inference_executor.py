@@ -0,0 +1,96 @@
+"""Tests for the bounded inference executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.inference_executor import (
+    InferenceExecutor,
+    QueueFullError,
+    get_worker_service,
+)
+
+
+def _slow_identity(value, delay=0.05):
+    time.sleep(delay)
+    return value
+
+
+def _worker_service():
+    return get_worker_service()
+
+
+class TestInferenceExecutor:
+    """Test InferenceExecutor class."""
+
+    async def test_run_returns_result(self):
+        """Test that jobs run on the pool and return their result."""
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=1)
+        executor.start()
+
+        try:
+            assert await executor.run(_slow_identity, 42, 0) == 42
+            assert executor.stats()["admitted"] == 0
+        finally:
+            await executor.shutdown()
+
+    async def test_concurrency_limited_to_workers(self):
+        """Test that no more than max_workers jobs run at once."""
+        executor = InferenceExecutor(mode="thread", max_workers=2, max_queue_size=10)
+        executor.start()
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def tracked():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        try:
+            await asyncio.gather(*(executor.run(tracked) for _ in range(6)))
+        finally:
+            await executor.shutdown()
+
+        assert peak <= 2
+
+    async def test_queue_full_raises(self):
+        """Test backpressure once running plus queued jobs reach capacity."""
+        executor = InferenceExecutor(
+            mode="thread", max_workers=1, max_queue_size=1, retry_after=7
+        )
+        executor.reserve()
+        executor.reserve()
+
+        with pytest.raises(QueueFullError) as exc_info:
+            executor.reserve()
+        assert exc_info.value.retry_after == 7
+
+        executor.release()
+        executor.reserve()
+
+    async def test_worker_loads_own_service(self):
+        """Test that each worker thread gets its own service instance."""
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=1)
+        executor.start()
+
+        try:
+            first = await executor.run(_worker_service)
+            second = await executor.run(_worker_service)
+        finally:
+            await executor.shutdown()
+
+        assert first is second
+        assert first is not get_worker_service()
+
+    def test_invalid_mode(self):
+        """Test that unknown executor modes are rejected."""
+        with pytest.raises(ValueError):
+            InferenceExecutor(mode="gpu")
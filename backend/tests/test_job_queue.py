@@ -0,0 +1,147 @@
+"""Tests for the durable try-on job queue."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.database import TryOnRequest
+from app.services.job_queue import JobQueue
+
+
+async def _create_job(session_maker, **values):
+    async with session_maker() as session:
+        job = TryOnRequest(
+            user_image_path="person.jpg",
+            garment_image_path="garment.jpg",
+            pose="front",
+            status="pending",
+            **values
+        )
+        session.add(job)
+        await session.commit()
+        return job.id
+
+
+async def _get_job(session_maker, job_id):
+    async with session_maker() as session:
+        return await session.get(TryOnRequest, job_id)
+
+
+class TestJobQueue:
+    """Test JobQueue class."""
+    
+    async def test_claim_is_exclusive(self, session_maker):
+        """Test that a job can only be claimed by one worker."""
+        queue = JobQueue(session_maker)
+        job_id = await _create_job(session_maker)
+        
+        job = await queue.claim("worker-a")
+        assert job.id == job_id
+        assert job.status == "processing"
+        assert job.lease_owner == "worker-a"
+        assert job.attempts == 1
+        
+        assert await queue.claim("worker-b") is None
+        assert await queue.claim("worker-b", job_id) is None
+    
+    async def test_claim_oldest_first(self, session_maker):
+        """Test that jobs are claimed in creation order."""
+        queue = JobQueue(session_maker)
+        first = await _create_job(session_maker)
+        second = await _create_job(session_maker)
+        
+        assert (await queue.claim("w")).id == first
+        assert (await queue.claim("w")).id == second
+    
+    async def test_complete(self, session_maker):
+        """Test completing a claimed job."""
+        queue = JobQueue(session_maker)
+        job_id = await _create_job(session_maker)
+        await queue.claim("w")
+        
+        assert await queue.heartbeat(job_id, "w")
+        assert not await queue.heartbeat(job_id, "other")
+        assert await queue.complete(job_id, "w", "result.jpg", 0.5)
+        
+        job = await _get_job(session_maker, job_id)
+        assert job.status == "completed"
+        assert job.result_image_path == "result.jpg"
+        assert job.lease_owner is None
+    
+    async def test_fail_with_retry_requeues(self, session_maker):
+        """Test that transient failures are retried with backoff."""
+        queue = JobQueue(session_maker)
+        job_id = await _create_job(session_maker)
+        await queue.claim("w")
+        
+        assert await queue.fail(job_id, "w", "pool crashed", retry=True)
+        
+        job = await _get_job(session_maker, job_id)
+        assert job.status == "pending"
+        assert job.available_at > datetime.utcnow()
+        
+        # Not claimable until the backoff has elapsed
+        assert await queue.claim("w") is None
+    
+    async def test_fail_after_max_attempts(self, session_maker):
+        """Test that jobs fail permanently once attempts are exhausted."""
+        queue = JobQueue(session_maker)
+        job_id = await _create_job(
+            session_maker, attempts=settings.JOB_MAX_ATTEMPTS - 1
+        )
+        await queue.claim("w")
+        
+        assert not await queue.fail(job_id, "w", "pool crashed", retry=True)
+        
+        job = await _get_job(session_maker, job_id)
+        assert job.status == "failed"
+        assert job.error_message == "pool crashed"
+    
+    async def test_recover_stale_leases(self, session_maker):
+        """Test that expired leases are returned to the queue."""
+        queue = JobQueue(session_maker)
+        stale_id = await _create_job(
+            session_maker,
+            lease_owner="dead-worker",
+            lease_expires_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+        live_id = await _create_job(
+            session_maker,
+            lease_owner="live-worker",
+            lease_expires_at=datetime.utcnow() + timedelta(minutes=5)
+        )
+        async with session_maker() as session:
+            for job_id in (stale_id, live_id):
+                (await session.get(TryOnRequest, job_id)).status = "processing"
+            await session.commit()
+        
+        assert await queue.recover_stale_leases() == 1
+        assert (await _get_job(session_maker, stale_id)).status == "pending"
+        assert (await _get_job(session_maker, live_id)).status == "processing"
+        assert await queue.ready_job_ids() == [stale_id]
+    
+    async def test_recover_stale_lease_fails_exhausted_job(self, session_maker):
+        """Test that an expired lease on a job out of attempts fails it."""
+        queue = JobQueue(session_maker)
+        job_id = await _create_job(
+            session_maker,
+            attempts=settings.JOB_MAX_ATTEMPTS,
+            lease_owner="dead-worker",
+            lease_expires_at=datetime.utcnow() - timedelta(seconds=1)
+        )
+        async with session_maker() as session:
+            (await session.get(TryOnRequest, job_id)).status = "processing"
+            await session.commit()
+        
+        assert await queue.recover_stale_leases() == 1
+        job = await _get_job(session_maker, job_id)
+        assert job.status == "failed"
+        assert job.error_message
+        assert job.lease_owner is None
+        assert await queue.ready_job_ids() == []
+    
+    def test_retry_delay_is_capped(self):
+        """Test exponential backoff growth and cap."""
+        assert JobQueue.retry_delay(1) == settings.JOB_RETRY_BACKOFF
+        assert JobQueue.retry_delay(2) == settings.JOB_RETRY_BACKOFF * 2
+        assert JobQueue.retry_delay(50) == settings.JOB_RETRY_BACKOFF_MAX
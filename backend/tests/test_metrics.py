@@ -0,0 +1,101 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import Metric, MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test MetricsRegistry rendering."""
+    
+    def test_counter_render(self):
+        """Test counters render one sample per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ["status"])
+        counter.inc(status="completed")
+        counter.inc(2, status="failed")
+        
+        text = registry.render()
+        
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="completed"} 1' in text
+        assert 'jobs_total{status="failed"} 2' in text
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket, count and sum samples."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("stage_seconds", "Stage", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value, stage="inference")
+        
+        text = registry.render()
+        
+        assert 'stage_seconds_bucket{stage="inference",le="0.1"} 1' in text
+        assert 'stage_seconds_bucket{stage="inference",le="1"} 3' in text
+        assert 'stage_seconds_bucket{stage="inference",le="+Inf"} 4' in text
+        assert 'stage_seconds_count{stage="inference"} 4' in text
+        assert 'stage_seconds_sum{stage="inference"} 4.05' in text
+    
+    def test_histogram_time(self):
+        """Test timing a block records one observation."""
+        histogram = MetricsRegistry().histogram("block_seconds", "Block", ["stage"])
+        
+        with histogram.time(stage="save"):
+            pass
+        
+        assert histogram.count(stage="save") == 1
+    
+    def test_callback_gauge(self):
+        """Test gauges bound to a callback are evaluated at render time."""
+        registry = MetricsRegistry()
+        depth = [3]
+        registry.gauge("queue_depth", "Depth").set_function(lambda: depth[0])
+        depth[0] = 5
+        
+        assert "queue_depth 5" in registry.render()
+    
+    def test_label_mismatch_and_duplicates(self):
+        """Test wrong labels and duplicate names are rejected."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ["pose"])
+        
+        with pytest.raises(ValueError):
+            counter.inc(status="failed")
+        with pytest.raises(ValueError):
+            registry.counter("requests_total", "Requests again")
+    
+    def test_metric_requires_samples(self):
+        """Test the base class cannot be used as a metric on its own."""
+        with pytest.raises(TypeError):
+            Metric("bare", "No samples")
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint."""
+    
+    def test_metrics_after_request(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test pipeline stages and counters appear after a try-on request."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={
+                "person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg"),
+                "garment_image": ("garment.jpg", sample_garment_image.getvalue(), "image/jpeg"),
+            },
+            data={"pose": "side"}
+        )
+        assert response.status_code == 200
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        for stage in ("upload_read", "db_commit"):
+            assert f'tryon_stage_seconds_count{{stage="{stage}"}}' in text
+        assert 'tryon_requests_total{status="pending",pose="side"}' in text
+        assert "tryon_queue_depth " in text
+        assert "tryon_worker_utilization " in text
@@ -0,0 +1,125 @@
+"""Tests for model backends, loading and warm-up."""
+
+import importlib.util
+
+import pytest
+
+from app.core.config import settings
+from app.services.inference_executor import InferenceExecutor, run_model_info
+from app.services.model_backends import (
+    ModelBackend,
+    OnnxRuntimeBackend,
+    create_model_backend,
+    resolve_backend_name,
+)
+from app.services.tryon_service import VirtualTryOnService
+
+
+class TestModelBackends:
+    """Test backend selection."""
+    
+    def test_auto_selects_from_weights_dir(self, tmp_path):
+        """Test that `auto` follows the weights present on disk."""
+        assert resolve_backend_name("auto", str(tmp_path)) == "placeholder"
+        
+        (tmp_path / "model.pt").write_bytes(b"")
+        assert resolve_backend_name("auto", str(tmp_path)) == "torchscript"
+        
+        (tmp_path / "model.onnx").write_bytes(b"")
+        assert resolve_backend_name("auto", str(tmp_path)) == "onnx"
+        assert resolve_backend_name("placeholder", str(tmp_path)) == "placeholder"
+    
+    def test_unknown_backend_rejected(self):
+        """Test that a misspelled backend fails loudly."""
+        with pytest.raises(ValueError):
+            resolve_backend_name("tensorrt")
+    
+    def test_backends_must_implement_inference(self):
+        """Test that a backend without `inference` cannot be instantiated."""
+        class Incomplete(ModelBackend):
+            name = "incomplete"
+        
+        with pytest.raises(TypeError):
+            Incomplete()
+    
+    def test_missing_weights_or_runtime(self, tmp_path):
+        """Test that load errors name what is missing."""
+        backend = create_model_backend("onnx", str(tmp_path))
+        assert isinstance(backend, OnnxRuntimeBackend)
+        with pytest.raises(FileNotFoundError):
+            backend.load()
+        
+        if importlib.util.find_spec("onnxruntime") is None:
+            (tmp_path / "model.onnx").write_bytes(b"")
+            with pytest.raises(RuntimeError, match="onnxruntime"):
+                backend.load()
+
+
+class TestModelWarmUp:
+    """Test model loading and warm-up."""
+    
+    def test_service_warm_up(self):
+        """Test that warm-up loads the model and records timings."""
+        service = VirtualTryOnService()
+        assert service.model is None
+        
+        service.warm_up(runs=2, batch_size=2)
+        info = service.model_info()
+        assert info["backend"] == "placeholder"
+        assert info["load_seconds"] is not None
+        assert info["warmup_seconds"] > 0
+        assert info["warmup_runs"] == 2
+    
+    async def test_executor_reports_warmed_workers(self):
+        """Test that preloading reports each distinct, warmed-up pool worker."""
+        executor = InferenceExecutor(
+            mode="thread", max_workers=2, max_queue_size=1, warmup_runs=1
+        )
+        assert executor.model_stats()["preloaded"] is False
+        try:
+            reports = await executor.load_models()
+            stats = executor.model_stats()
+        finally:
+            await executor.shutdown()
+        
+        assert 1 <= len(reports) <= 2
+        assert len({report["worker"] for report in reports}) == len(reports)
+        assert all(report["warmup_runs"] == 1 for report in reports)
+        assert stats["preloaded"] is True
+        assert stats["workers_ready"] == len(reports)
+        assert stats["backend"] == "placeholder"
+        assert stats["warmup_seconds"] > 0
+        assert executor.stats()["running"] == 0
+    
+    async def test_worker_warms_up_before_first_job(self):
+        """Test that a worker started by a job warms up in the pool initializer."""
+        executor = InferenceExecutor(
+            mode="thread", max_workers=1, max_queue_size=1, warmup_runs=2
+        )
+        try:
+            report = await executor.run(run_model_info)
+        finally:
+            await executor.shutdown()
+        
+        assert report["warmup_runs"] == 2
+        assert report["warmup_seconds"] > 0
+    
+    async def test_executor_load_failure_surfaces(self, tmp_path, monkeypatch):
+        """Test that a broken model configuration fails startup with its cause."""
+        monkeypatch.setattr(settings, "MODEL_BACKEND", "onnx")
+        monkeypatch.setattr(settings, "MODEL_WEIGHTS_DIR", str(tmp_path))
+        executor = InferenceExecutor(mode="thread", max_workers=1, max_queue_size=1)
+        try:
+            with pytest.raises(FileNotFoundError):
+                await executor.load_models()
+        finally:
+            await executor.shutdown()
+    
+    def test_health_reports_model(self, client):
+        """Test that /health reports the preloaded model."""
+        model = client.get(f"{settings.API_V1_STR}/health").json()["model"]
+        assert model["backend"] == "placeholder"
+        assert model["preloaded"] is True
+        assert 1 <= model["workers_ready"] <= settings.INFERENCE_WORKERS
+        assert model["load_seconds"] is not None
+        assert model["warmup_seconds"] is not None
@@ -0,0 +1,148 @@
+"""Tests for keyset pagination and the migrations behind it."""
+
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, select, text
+
+from app.models.database import TryOnRequest
+from app.services.database_service import DatabaseService
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page, next_cursor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _alembic_config(path):
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{path}")
+    config.attributes["configure_logger"] = False
+    return config
+
+
+async def _create_jobs(session_maker, statuses):
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    async with session_maker() as session:
+        # Identical timestamps make the id tie-breaker matter
+        session.add_all(
+            TryOnRequest(
+                user_image_path="person.jpg",
+                garment_image_path="garment.jpg",
+                pose="front",
+                status=status,
+                created_at=created_at
+            )
+            for status in statuses
+        )
+        await session.commit()
+
+
+async def _pages(session_maker, limit, status=None):
+    pages, after = [], None
+    async with session_maker() as session:
+        while True:
+            statement = select(TryOnRequest)
+            if status:
+                statement = statement.where(TryOnRequest.status == status)
+            result = await session.execute(keyset_page(statement, TryOnRequest, after, limit))
+            rows = result.scalars().all()
+            pages.append([row.id for row in rows[:limit]])
+            after = next_cursor(rows, limit)
+            if after is None:
+                return pages
+
+
+class TestKeysetPagination:
+    """Test cursor pagination helpers."""
+    
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the row it was made from."""
+        created_at = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    
+    def test_invalid_cursor(self):
+        """Test that garbage cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+    
+    async def test_pages_cover_every_row_once(self, session_maker):
+        """Test that walking the cursor visits all rows newest first."""
+        await _create_jobs(session_maker, ["pending"] * 7)
+        
+        pages = await _pages(session_maker, limit=3)
+        
+        assert [len(page) for page in pages] == [3, 3, 1]
+        ids = [row_id for page in pages for row_id in page]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 7
+    
+    async def test_filtered_pages(self, session_maker):
+        """Test paging over a filtered listing."""
+        await _create_jobs(session_maker, ["completed", "failed"] * 3)
+        
+        pages = await _pages(session_maker, limit=2, status="failed")
+        
+        assert [len(page) for page in pages] == [2, 1]
+
+
+class TestMigrations:
+    """Test the Alembic migrations."""
+    
+    def test_upgrade_matches_models(self, tmp_path):
+        """Test that migrating an empty database yields the models' schema."""
+        config = _alembic_config(tmp_path / "migrated.db")
+        
+        command.upgrade(config, "head")
+        # Raises if the models have drifted from the migrations
+        command.check(config)
+        command.downgrade(config, "base")
+    
+    async def test_stamp_database_created_by_init_db(self, tmp_path):
+        """Test that a database from `init_db` is stamped at head and upgrades cleanly."""
+        path = tmp_path / "created.db"
+        service = DatabaseService(f"sqlite+aiosqlite:///{path}")
+        try:
+            await service.init_db()
+        finally:
+            await service.close()
+        
+        # Alembic's env.py runs its own event loop
+        config = _alembic_config(path)
+        await asyncio.to_thread(command.stamp, config, "head")
+        await asyncio.to_thread(command.upgrade, config, "head")
+        await asyncio.to_thread(command.check, config)
+    
+    async def test_upgrade_baseline_database(self, tmp_path):
+        """Test the upgrade of a database created before migrations existed."""
+        path = tmp_path / "baseline.db"
+        config = _alembic_config(path)
+        await asyncio.to_thread(command.upgrade, config, "0001")
+        
+        service = DatabaseService(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with service.engine.begin() as conn:
+                await conn.execute(text(
+                    "INSERT INTO tryon_requests (user_image_path, garment_image_path, pose, status) "
+                    "VALUES ('person.jpg', 'garment.jpg', 'front', 'completed')"
+                ))
+            # Starting the application must not half-create the new schema
+            await service.init_db()
+            async with service.engine.connect() as conn:
+                tables = await conn.run_sync(
+                    lambda sync_conn: inspect(sync_conn).get_table_names()
+                )
+            assert "garments" not in tables
+            
+            await asyncio.to_thread(command.upgrade, config, "head")
+            await asyncio.to_thread(command.check, config)
+            
+            async with service.async_session_maker() as session:
+                job = (await session.execute(select(TryOnRequest))).scalar_one()
+            assert job.attempts == 0
+            assert job.priority == "standard"
+        finally:
+            await service.close()
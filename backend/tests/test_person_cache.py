@@ -0,0 +1,67 @@
+"""Tests for the session-scoped person feature cache."""
+
+import time
+
+import numpy as np
+
+from app.services.person_cache import PersonFeatureCache, PersonFeatures
+
+
+def _features(nbytes: int) -> PersonFeatures:
+    return PersonFeatures(np.zeros(nbytes // 4, dtype=np.float32))
+
+
+class TestPersonFeatureCache:
+    """Test PersonFeatureCache class."""
+    
+    def test_key_for_path(self):
+        """Test that stored person photos are keyed by content hash."""
+        digest = "ab" * 32
+        assert PersonFeatureCache.key_for_path(f"/data/persons/person_{digest}.jpg") == digest
+        assert PersonFeatureCache.key_for_path("/tmp/person.jpg") == "/tmp/person.jpg"
+    
+    def test_hit_and_miss(self):
+        """Test that remembered features are returned and counted."""
+        cache = PersonFeatureCache(max_bytes=1024, ttl=60)
+        features = _features(64)
+        
+        assert cache.get("a") is None
+        cache.put("a", features)
+        assert cache.get("a") is features
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_ttl_expires_idle_sessions(self, monkeypatch):
+        """Test that entries expire after TTL seconds without use."""
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache = PersonFeatureCache(max_bytes=1024, ttl=10)
+        cache.put("a", _features(64))
+        
+        # Each use extends the session
+        now[0] += 8
+        assert cache.get("a") is not None
+        now[0] += 8
+        assert cache.get("a") is not None
+        
+        now[0] += 11
+        assert cache.get("a") is None
+        assert cache.stats()["expired"] == 1
+        assert cache.stats()["bytes"] == 0
+    
+    def test_memory_budget_evicts_least_recently_used(self):
+        """Test that the byte budget evicts the least recently used person."""
+        cache = PersonFeatureCache(max_bytes=256, ttl=60)
+        cache.put("a", _features(128))
+        cache.put("b", _features(128))
+        cache.get("a")
+        cache.put("c", _features(128))
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] == 256
+        
+        # Features larger than the whole budget are not cached
+        cache.put("d", _features(512))
+        assert cache.get("d") is None
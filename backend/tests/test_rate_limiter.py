@@ -0,0 +1,148 @@
+"""Tests for per-API-key rate limiting."""
+
+import math
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Test RateLimiter class."""
+    
+    def test_burst_then_limited(self, monkeypatch):
+        """Test that a key gets its burst, then waits for refills."""
+        clock = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+        limiter = RateLimiter()
+        
+        assert all(limiter.acquire("k", 60, burst=3) == 0 for _ in range(3))
+        assert limiter.acquire("k", 60, burst=3) == pytest.approx(1.0)
+        
+        clock[0] += 1.0
+        assert limiter.acquire("k", 60, burst=3) == 0
+        assert limiter.stats() == {"keys": 1, "allowed": 4, "limited": 1}
+    
+    def test_keys_are_independent(self):
+        """Test that one key's usage does not limit another."""
+        limiter = RateLimiter()
+        assert limiter.acquire("a", 60, burst=1) == 0
+        assert limiter.acquire("a", 60, burst=1) > 0
+        assert limiter.acquire("b", 60, burst=1) == 0
+    
+    def test_cost_and_unlimited(self):
+        """Test batch costs and that a zero rate means no limit."""
+        limiter = RateLimiter()
+        assert limiter.acquire("k", 60, burst=5, cost=5) == 0
+        assert limiter.acquire("k", 60, burst=5, cost=2) > 0
+        assert all(limiter.acquire("free", 0) == 0 for _ in range(100))
+    
+    def test_cost_above_burst_rejected(self):
+        """Test that one call cannot take more than the burst."""
+        limiter = RateLimiter()
+        assert limiter.acquire("k", 60, burst=3, cost=4) == math.inf
+        assert limiter.acquire("k", 60, burst=3, cost=3) == 0
+    
+    def test_refund(self):
+        """Test that refunded tokens can be used again, up to the burst."""
+        limiter = RateLimiter()
+        assert limiter.acquire("k", 60, burst=2, cost=2) == 0
+        limiter.refund("k", burst=2, cost=5)
+        assert limiter.acquire("k", 60, burst=2, cost=2) == 0
+        assert limiter.acquire("k", 60, burst=2) > 0
+
+
+class TestRateLimitAPI:
+    """Test rate limits on the try-on routes."""
+    
+    def test_key_quota_enforced(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that a key over its quota gets 429 with Retry-After."""
+        monkeypatch.setattr(settings, "API_KEY_AUTH_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        admin = {"X-Admin-Key": "admin-secret"}
+        created = client.post(
+            f"{settings.API_V1_STR}/api-keys/",
+            json={"name": "bulk importer", "rate_limit_per_minute": 1, "rate_limit_burst": 1},
+            headers=admin
+        ).json()
+        assert created["rate_limit_per_minute"] == 1
+        headers = {"X-API-Key": created["key"]}
+        
+        def post():
+            return client.post(
+                f"{settings.API_V1_STR}/tryon/",
+                headers=headers,
+                files={
+                    "person_image": ("person.jpg", sample_person_image.getvalue(), "image/jpeg"),
+                    "garment_image": ("garment.jpg", sample_garment_image.getvalue(), "image/jpeg"),
+                }
+            )
+        
+        assert post().status_code == 200
+        limited = post()
+        assert limited.status_code == 429
+        assert int(limited.headers["Retry-After"]) >= 1
+        
+        updated = client.patch(
+            f"{settings.API_V1_STR}/api-keys/{created['id']}",
+            json={"rate_limit_per_minute": 0},
+            headers=admin
+        )
+        assert updated.json()["rate_limit_per_minute"] == 0
+        assert post().status_code == 200
+    
+    def test_rejected_requests_keep_quota(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that invalid requests are refunded and oversized batches rejected."""
+        monkeypatch.setattr(settings, "API_KEY_AUTH_ENABLED", True)
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "admin-secret")
+        created = client.post(
+            f"{settings.API_V1_STR}/api-keys/",
+            json={"name": "kiosk", "rate_limit_per_minute": 1, "rate_limit_burst": 1},
+            headers={"X-Admin-Key": "admin-secret"}
+        ).json()
+        headers = {"X-API-Key": created["key"]}
+        person = ("person.jpg", sample_person_image.getvalue(), "image/jpeg")
+        garment = ("garment.jpg", sample_garment_image.getvalue(), "image/jpeg")
+        
+        unknown_garment = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            headers=headers,
+            files={"person_image": person},
+            data={"garment_id": "999999"}
+        )
+        assert unknown_garment.status_code == 404
+        invalid_image = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            headers=headers,
+            files={
+                "person_image": person,
+                "garment_image": ("g.jpg", b"not an image", "image/jpeg"),
+            }
+        )
+        assert invalid_image.status_code == 400
+        
+        batch = client.post(
+            f"{settings.API_V1_STR}/tryon/batch",
+            headers=headers,
+            files=[
+                ("person_image", person),
+                ("garment_images", garment),
+                ("garment_images", garment),
+            ]
+        )
+        assert batch.status_code == 429
+        assert "Retry-After" not in batch.headers
+        
+        # None of the above used up the single token
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            headers=headers,
+            files={"person_image": person, "garment_image": garment}
+        )
+        assert response.status_code == 200
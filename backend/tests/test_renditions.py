@@ -0,0 +1,48 @@
+"""Tests for result renditions."""
+
+import os
+
+from PIL import Image
+
+from app.core.config import settings
+from app.utils.renditions import ensure_rendition, rendition_path, save_renditions
+
+
+class TestRenditions:
+    """Test rendition generation."""
+    
+    def test_rendition_path(self):
+        """Test rendition file naming next to the full result."""
+        assert rendition_path("/r/result_ab.jpg") == "/r/result_ab.jpg"
+        assert rendition_path("/r/result_ab.jpg", "thumb") == "/r/result_ab.thumb.jpg"
+        assert rendition_path("/r/result_ab.jpg", "full", "webp") == "/r/result_ab.webp"
+    
+    def test_save_renditions(self, test_upload_dir, monkeypatch):
+        """Test that every size and format is written with the right dimensions."""
+        monkeypatch.setattr(settings, "RESULT_RENDITIONS", {"thumb": 100, "preview": 400})
+        result_path = f"{test_upload_dir}/results/result.jpg"
+        image = Image.new("RGB", (800, 500), color="green")
+        image.save(result_path)
+        
+        written = save_renditions(image, result_path, formats=["jpeg", "webp"])
+        
+        assert len(written) == 5
+        assert result_path not in written
+        with Image.open(rendition_path(result_path, "preview")) as preview:
+            assert preview.size == (400, 250)
+        with Image.open(rendition_path(result_path, "thumb", "webp")) as thumb:
+            assert thumb.format == "WEBP"
+            assert thumb.size == (100, 62)
+        with Image.open(rendition_path(result_path, "full", "webp")) as full:
+            assert full.size == (800, 500)
+    
+    def test_ensure_rendition_renders_missing(self, test_upload_dir):
+        """Test on-demand rendering for results without renditions."""
+        result_path = f"{test_upload_dir}/results/result.jpg"
+        Image.new("RGB", (800, 500)).save(result_path)
+        
+        path = ensure_rendition(result_path, "thumb", "jpeg")
+        assert path == rendition_path(result_path, "thumb")
+        assert os.path.exists(path)
+        
+        assert ensure_rendition(f"{test_upload_dir}/results/gone.jpg", "thumb", "jpeg") is None
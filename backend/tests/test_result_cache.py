@@ -0,0 +1,118 @@
+"""Tests for the try-on result cache."""
+
+import os
+import time
+
+from app.models.database import TryOnRequest
+from app.services.result_cache import ResultCache
+from app.services.result_delivery import result_delivery
+
+
+def _write(path, size, age=0):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+class TestResultCache:
+    """Test ResultCache class."""
+    
+    def test_key_depends_on_all_inputs(self):
+        """Test that every input participates in the cache key."""
+        base = ResultCache.make_key("p", "g", "front", "v1")
+        assert base == ResultCache.make_key("p", "g", "front", "v1")
+        assert base != ResultCache.make_key("p2", "g", "front", "v1")
+        assert base != ResultCache.make_key("p", "g2", "front", "v1")
+        assert base != ResultCache.make_key("p", "g", "side", "v1")
+        assert base != ResultCache.make_key("p", "g", "front", "v2")
+    
+    async def test_memory_hit(self, session_maker, test_upload_dir):
+        """Test that remembered results are returned without a database row."""
+        cache = ResultCache(results_dir=f"{test_upload_dir}/results")
+        path = f"{test_upload_dir}/results/result.jpg"
+        _write(path, 10)
+        
+        cache.put("key", path)
+        async with session_maker() as session:
+            assert await cache.get("key", session) == path
+            assert await cache.get("other", session) is None
+        
+        os.remove(path)
+        async with session_maker() as session:
+            assert await cache.get("key", session) is None
+    
+    async def test_sweep_enforces_ttl_and_size(self, session_maker, test_upload_dir):
+        """Test eviction of expired files and then the oldest files."""
+        results_dir = f"{test_upload_dir}/results"
+        cache = ResultCache(
+            ttl=3600, max_bytes=250, results_dir=results_dir, session_maker=session_maker
+        )
+        _write(f"{results_dir}/expired.jpg", 10, age=7200)
+        _write(f"{results_dir}/old.jpg", 100, age=600)
+        _write(f"{results_dir}/mid.jpg", 100, age=300)
+        _write(f"{results_dir}/new.jpg", 100, age=0)
+        
+        assert await cache.sweep() == 2
+        assert sorted(os.listdir(results_dir)) == ["mid.jpg", "new.jpg"]
+    
+    async def test_sweep_keeps_renditions_with_their_result(self, session_maker, test_upload_dir):
+        """Test that a result and its renditions are evicted together."""
+        results_dir = f"{test_upload_dir}/results"
+        cache = ResultCache(
+            ttl=3600, max_bytes=250, results_dir=results_dir, session_maker=session_maker
+        )
+        _write(f"{results_dir}/result_old.jpg", 100, age=600)
+        _write(f"{results_dir}/result_old.thumb.jpg", 10, age=300)
+        _write(f"{results_dir}/result_new.jpg", 100, age=60)
+        # Renditions written before the result was last reused
+        _write(f"{results_dir}/result_new.thumb.jpg", 10, age=1200)
+        _write(f"{results_dir}/result_new.webp", 50, age=1200)
+        
+        assert await cache.sweep() == 2
+        assert sorted(os.listdir(results_dir)) == [
+            "result_new.jpg", "result_new.thumb.jpg", "result_new.webp"
+        ]
+    
+    async def test_sweep_spares_reused_results_and_clears_rows(
+        self, session_maker, test_upload_dir, monkeypatch
+    ):
+        """Test that a cache hit keeps a file and swept files are unlinked from rows."""
+        results_dir = f"{test_upload_dir}/results"
+        cache = ResultCache(ttl=3600, results_dir=results_dir, session_maker=session_maker)
+        reused = f"{results_dir}/reused.jpg"
+        stale = f"{results_dir}/stale.jpg"
+        _write(reused, 10, age=7200)
+        _write(stale, 10, age=7200)
+        
+        async with session_maker() as session:
+            rows = [
+                TryOnRequest(
+                    user_image_path="person.jpg",
+                    garment_image_path="garment.jpg",
+                    pose="front",
+                    status="completed",
+                    result_image_path=path,
+                    result_key=key
+                )
+                for path, key in ((reused, "reused"), (stale, "stale"))
+            ]
+            session.add_all(rows)
+            await session.commit()
+        
+        # A dedup hit on a file written long ago refreshes it
+        cache.put("reused", reused)
+        async with session_maker() as session:
+            assert await cache.get("reused", session) == reused
+        
+        evicted = []
+        monkeypatch.setattr(result_delivery, "evict", evicted.append)
+        assert await cache.sweep() == 1
+        assert os.listdir(results_dir) == ["reused.jpg"]
+        assert evicted == [stale]
+        async with session_maker() as session:
+            kept = await session.get(TryOnRequest, rows[0].id)
+            swept = await session.get(TryOnRequest, rows[1].id)
+        assert kept.result_image_path == reused
+        assert swept.result_image_path is None
+        assert swept.result_key is None
@@ -0,0 +1,108 @@
+"""Tests for immutable result delivery."""
+
+import pytest
+from starlette.requests import Request
+
+from app.services.result_delivery import (
+    IMMUTABLE_CACHE_CONTROL,
+    RangeNotSatisfiable,
+    ResultDelivery,
+    ResultFileResponse,
+    parse_range,
+)
+
+
+def _request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+    
+    def test_ranges(self):
+        """Test explicit, open-ended and suffix ranges."""
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+    
+    def test_ignored_ranges(self):
+        """Test that missing, malformed and multi-part ranges send the whole file."""
+        assert parse_range(None, 100) is None
+        assert parse_range("items=0-1", 100) is None
+        assert parse_range("bytes=a-b", 100) is None
+        assert parse_range("bytes=0-1,5-6", 100) is None
+    
+    def test_unsatisfiable(self):
+        """Test ranges past the end of the file."""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=100-", 100)
+
+
+class TestResultDelivery:
+    """Test ResultDelivery class."""
+    
+    async def test_not_modified_without_disk(self, tmp_path):
+        """Test that a matching ETag is answered even if the file is gone."""
+        delivery = ResultDelivery(max_bytes=1024, max_file_bytes=1024)
+        path = str(tmp_path / "result_missing.jpg")
+        
+        response = await delivery.respond(
+            _request({"If-None-Match": delivery.etag(path)}), path, "image/jpeg"
+        )
+        
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert await delivery.respond(_request(), path, "image/jpeg") is None
+    
+    async def test_wildcard_requires_file(self, tmp_path):
+        """Test that If-None-Match: * only matches an existing file."""
+        delivery = ResultDelivery(max_bytes=1024, max_file_bytes=1024)
+        path = str(tmp_path / "result_wildcard.jpg")
+        wildcard = _request({"If-None-Match": "*"})
+        
+        assert await delivery.respond(wildcard, path, "image/jpeg") is None
+        
+        with open(path, "wb") as f:
+            f.write(b"0123456789")
+        assert (await delivery.respond(wildcard, path, "image/jpeg")).status_code == 304
+    
+    async def test_hot_cache_and_ranges(self, tmp_path):
+        """Test that small files are served from memory after the first read."""
+        delivery = ResultDelivery(max_bytes=1024, max_file_bytes=1024)
+        path = tmp_path / "result_small.jpg"
+        path.write_bytes(b"0123456789")
+        
+        first = await delivery.respond(_request(), str(path), "image/jpeg")
+        assert first.body == b"0123456789"
+        
+        path.unlink()
+        partial = await delivery.respond(_request({"Range": "bytes=2-4"}), str(path), "image/jpeg")
+        assert partial.status_code == 206
+        assert partial.body == b"234"
+        assert partial.headers["content-range"] == "bytes 2-4/10"
+        assert delivery.stats()["memory_hits"] == 1
+        
+        # Once the sweep deletes the file, the memory tier stops serving it
+        delivery.evict(str(path))
+        assert await delivery.respond(_request(), str(path), "image/jpeg") is None
+        assert delivery.stats()["bytes"] == 0
+    
+    async def test_large_files_are_streamed(self, tmp_path):
+        """Test that files above the per-file limit bypass the memory tier."""
+        delivery = ResultDelivery(max_bytes=1024, max_file_bytes=4)
+        path = tmp_path / "result_large.jpg"
+        path.write_bytes(b"0123456789")
+        
+        response = await delivery.respond(_request({"Range": "bytes=-3"}), str(path), "image/jpeg")
+        
+        assert isinstance(response, ResultFileResponse)
+        assert response.status_code == 206
+        assert (response.offset, response.count) == (7, 3)
+        assert delivery.stats()["entries"] == 0
+        
+        unsatisfiable = await delivery.respond(
+            _request({"Range": "bytes=50-"}), str(path), "image/jpeg"
+        )
+        assert unsatisfiable.status_code == 416
@@ -0,0 +1,58 @@
+"""Tests for the in-process status broker."""
+
+from app.models.schemas import TryOnStatus, TryOnStatusEvent
+from app.services.status_broker import StatusBroker
+
+
+def _event(request_id, status):
+    return TryOnStatusEvent(request_id=request_id, status=status)
+
+
+class TestStatusBroker:
+    """Test StatusBroker class."""
+    
+    async def test_publish_reaches_subscribers_of_request(self):
+        """Test events go to every subscriber of their request only."""
+        broker = StatusBroker()
+        first = broker.subscribe(1)
+        second = broker.subscribe(1)
+        other = broker.subscribe(2)
+        
+        broker.publish(_event(1, TryOnStatus.PROCESSING))
+        
+        assert (await first.get()).status == TryOnStatus.PROCESSING
+        assert (await second.get()).status == TryOnStatus.PROCESSING
+        assert other.empty()
+    
+    async def test_latest_remembers_last_event(self):
+        """Test late subscribers can start from the latest event."""
+        broker = StatusBroker(max_recent=1)
+        broker.publish(_event(1, TryOnStatus.PROCESSING))
+        broker.publish(_event(1, TryOnStatus.COMPLETED))
+        
+        assert broker.latest(1).status == TryOnStatus.COMPLETED
+        
+        broker.publish(_event(2, TryOnStatus.PROCESSING))
+        assert broker.latest(1) is None
+    
+    async def test_slow_subscriber_keeps_newest(self):
+        """Test a full queue drops its oldest event rather than blocking."""
+        broker = StatusBroker(queue_size=1)
+        queue = broker.subscribe(1)
+        
+        broker.publish(_event(1, TryOnStatus.PROCESSING))
+        broker.publish(_event(1, TryOnStatus.FAILED))
+        
+        assert queue.qsize() == 1
+        assert (await queue.get()).status == TryOnStatus.FAILED
+    
+    async def test_unsubscribe(self):
+        """Test unsubscribed queues no longer receive events."""
+        broker = StatusBroker()
+        queue = broker.subscribe(1)
+        broker.unsubscribe(1, queue)
+        
+        broker.publish(_event(1, TryOnStatus.COMPLETED))
+        
+        assert queue.empty()
+        assert broker.stats()["subscribers"] == 0
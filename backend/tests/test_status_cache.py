@@ -0,0 +1,111 @@
+"""Tests for the try-on status cache."""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.models.database import TryOnRequest
+from app.services.status_cache import StatusCache
+
+
+async def _create_job(session_maker, status="pending"):
+    async with session_maker() as session:
+        job = TryOnRequest(
+            user_image_path="person.jpg",
+            garment_image_path="garment.jpg",
+            pose="front",
+            status=status
+        )
+        session.add(job)
+        await session.commit()
+        return job.id
+
+
+async def _set_status(session_maker, job_id, status):
+    async with session_maker() as session:
+        await session.execute(
+            update(TryOnRequest)
+            .where(TryOnRequest.id == job_id)
+            .values(status=status, updated_at=datetime.utcnow())
+        )
+        await session.commit()
+
+
+class TestStatusCache:
+    """Test StatusCache class."""
+    
+    async def test_read_through(self, session_maker):
+        """Test that a second poll is served from memory."""
+        cache = StatusCache(ttl=60)
+        job_id = await _create_job(session_maker)
+        
+        async with session_maker() as session:
+            first = await cache.get(job_id, session)
+            second = await cache.get(job_id, session)
+        
+        assert second is first
+        assert json.loads(first.body)["status"] == "pending"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    async def test_missing_request(self, session_maker):
+        """Test that unknown requests are not cached."""
+        cache = StatusCache()
+        async with session_maker() as session:
+            assert await cache.get(12345, session) is None
+        assert cache.stats()["entries"] == 0
+    
+    async def test_revalidates_unfinished_after_ttl(self, session_maker):
+        """Test that stale unfinished entries are checked against updated_at."""
+        cache = StatusCache(ttl=0)
+        job_id = await _create_job(session_maker)
+        
+        async with session_maker() as session:
+            first = await cache.get(job_id, session)
+            assert await cache.get(job_id, session) is first
+            assert cache.revalidated == 1
+        
+        await _set_status(session_maker, job_id, "processing")
+        async with session_maker() as session:
+            changed = await cache.get(job_id, session)
+        
+        assert changed.etag != first.etag
+        assert json.loads(changed.body)["status"] == "processing"
+    
+    async def test_finished_entries_skip_the_database(self, session_maker):
+        """Test that completed requests are never revalidated."""
+        cache = StatusCache(ttl=0)
+        job_id = await _create_job(session_maker, status="completed")
+        
+        async with session_maker() as session:
+            first = await cache.get(job_id, session)
+            assert await cache.get(job_id, session) is first
+        assert cache.revalidated == 0
+        assert cache.hits == 1
+    
+    async def test_invalidate(self, session_maker):
+        """Test that invalidated requests are loaded again."""
+        cache = StatusCache(ttl=60)
+        job_id = await _create_job(session_maker)
+        
+        async with session_maker() as session:
+            await cache.get(job_id, session)
+            await _set_status(session_maker, job_id, "completed")
+            cache.invalidate(job_id)
+            entry = await cache.get(job_id, session)
+        
+        assert json.loads(entry.body)["status"] == "completed"
+        assert entry.terminal
+    
+    async def test_lru_bound(self, session_maker):
+        """Test that the least recently polled request is evicted."""
+        cache = StatusCache(max_entries=2, ttl=60)
+        ids = [await _create_job(session_maker) for _ in range(3)]
+        
+        async with session_maker() as session:
+            for job_id in ids:
+                await cache.get(job_id, session)
+        
+        assert cache.stats()["entries"] == 2
+        assert cache._lookup(ids[0]) is None
@@ -0,0 +1,116 @@
+"""Tests for batched job status writes."""
+
+import asyncio
+
+from app.core.config import settings
+from app.models.database import TryOnRequest
+from app.services.job_queue import JobQueue
+from app.services.status_writer import StatusWriter
+
+
+async def _claimed_jobs(session_maker, queue, count, worker_id="w"):
+    async with session_maker() as session:
+        jobs = [
+            TryOnRequest(
+                user_image_path="person.jpg",
+                garment_image_path="garment.jpg",
+                pose="front",
+                status="pending"
+            )
+            for _ in range(count)
+        ]
+        session.add_all(jobs)
+        await session.commit()
+        ids = [job.id for job in jobs]
+    for job_id in ids:
+        await queue.claim(worker_id, job_id)
+    return ids
+
+
+async def _get_job(session_maker, job_id):
+    async with session_maker() as session:
+        return await session.get(TryOnRequest, job_id)
+
+
+class TestStatusWriter:
+    """Test StatusWriter class."""
+    
+    async def test_concurrent_transitions_share_a_flush(self, session_maker):
+        """Test that transitions arriving together are written in one transaction."""
+        writer = StatusWriter(session_maker, interval=0.05)
+        queue = JobQueue(session_maker, writer=writer)
+        ids = await _claimed_jobs(session_maker, queue, 3)
+        
+        results = await asyncio.gather(
+            queue.complete(ids[0], "w", "a.jpg", 1.0),
+            queue.complete(ids[1], "w", "b.jpg", 2.0),
+            queue.fail(ids[2], "w", "bad pose", 0.5),
+        )
+        
+        assert list(results) == [True, True, False]
+        assert writer.stats() == {"pending": 0, "flushes": 1, "written": 3}
+        
+        first = await _get_job(session_maker, ids[0])
+        second = await _get_job(session_maker, ids[1])
+        failed = await _get_job(session_maker, ids[2])
+        assert (first.status, first.result_image_path, first.processing_time) == (
+            "completed", "a.jpg", 1.0
+        )
+        assert (second.status, second.result_image_path, second.processing_time) == (
+            "completed", "b.jpg", 2.0
+        )
+        assert failed.status == "failed"
+        assert failed.error_message == "bad pose"
+        assert first.lease_owner is None
+    
+    async def test_lost_lease_is_not_written(self, session_maker):
+        """Test that a worker that lost its lease cannot finish the job."""
+        writer = StatusWriter(session_maker, interval=0.01)
+        queue = JobQueue(session_maker, writer=writer)
+        (job_id,) = await _claimed_jobs(session_maker, queue, 1, worker_id="owner")
+        
+        assert await queue.complete(job_id, "other", "x.jpg", 1.0) is False
+        assert (await _get_job(session_maker, job_id)).status == "processing"
+    
+    async def test_full_batch_flushes_early(self, session_maker):
+        """Test that reaching the batch size does not wait for the interval."""
+        writer = StatusWriter(session_maker, interval=60, max_batch=2)
+        queue = JobQueue(session_maker, writer=writer)
+        ids = await _claimed_jobs(session_maker, queue, 2)
+        
+        await asyncio.wait_for(
+            asyncio.gather(*(queue.complete(i, "w", "r.jpg", 1.0) for i in ids)), 5
+        )
+        assert writer.flushes == 1
+    
+    async def test_shutdown_flushes_pending(self, session_maker):
+        """Test that shutdown writes transitions still in the buffer."""
+        writer = StatusWriter(session_maker, interval=60)
+        queue = JobQueue(session_maker, writer=writer)
+        (job_id,) = await _claimed_jobs(session_maker, queue, 1)
+        
+        pending = asyncio.create_task(queue.complete(job_id, "w", "r.jpg", 1.0))
+        await asyncio.sleep(0)
+        assert writer.pending(job_id)
+        
+        await writer.shutdown()
+        assert await pending is True
+        assert (await _get_job(session_maker, job_id)).status == "completed"
+    
+    async def test_buffered_requeue_lands_before_reclaim(self, session_maker, monkeypatch):
+        """Test that a job requeued in the buffer can be claimed again."""
+        monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF", 0)
+        writer = StatusWriter(session_maker, interval=60)
+        queue = JobQueue(session_maker, writer=writer)
+        (job_id,) = await _claimed_jobs(session_maker, queue, 1)
+        
+        requeue = asyncio.create_task(
+            queue.fail(job_id, "w", "pool died", retry=True, attempts=0)
+        )
+        await asyncio.sleep(0)
+        
+        job = await queue.claim("w2", job_id)
+        assert await requeue is True
+        assert job is not None
+        assert job.lease_owner == "w2"
+        await writer.shutdown()
@@ -0,0 +1,381 @@
+"""Tests for the try-on API endpoints."""
+
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import inference_executor
+
+
+def _wait_for_status(client, request_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        detail = client.get(f"{settings.API_V1_STR}/tryon/{request_id}").json()
+        if detail["status"] in ("completed", "failed"):
+            return detail
+        time.sleep(0.05)
+    raise AssertionError(f"Request {request_id} did not finish")
+
+
+def _files(person, garment):
+    return {
+        "person_image": ("person.jpg", person.getvalue(), "image/jpeg"),
+        "garment_image": ("garment.jpg", garment.getvalue(), "image/jpeg"),
+    }
+
+
+class TestTryOnAPI:
+    """Test try-on endpoints."""
+    
+    def test_create_and_complete(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that a created request is processed to completion."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "front"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "pending"
+        
+        detail = _wait_for_status(client, body["request_id"])
+        assert detail["status"] == "completed"
+        assert detail["result_image_path"]
+        assert detail["priority"] == "standard"
+    
+    def test_priority_recorded(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that the requested priority is stored and measured."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"priority": "interactive"}
+        )
+        detail = _wait_for_status(client, response.json()["request_id"])
+        assert detail["priority"] == "interactive"
+        
+        stats = client.get(f"{settings.API_V1_STR}/health/inference").json()
+        assert stats["batching"]["queue_wait_by_priority"]["interactive"]["jobs"] >= 1
+        
+        invalid = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"priority": "urgent"}
+        )
+        assert invalid.status_code == 422
+    
+    def test_queue_full_returns_429(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test backpressure when the inference queue is full."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        monkeypatch.setattr(inference_executor, "_admitted", inference_executor.capacity)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image)
+        )
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == str(settings.INFERENCE_RETRY_AFTER)
+    
+    def test_identical_request_reuses_result(
+        self, client, sample_person_image, sample_garment_image
+    ):
+        """Test that repeating a completed try-on returns the cached result."""
+        first = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "side"}
+        ).json()
+        first_detail = _wait_for_status(client, first["request_id"])
+        
+        second = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "side"}
+        ).json()
+        assert second["status"] == "completed"
+        assert second["request_id"] != first["request_id"]
+        
+        second_detail = client.get(
+            f"{settings.API_V1_STR}/tryon/{second['request_id']}"
+        ).json()
+        assert second_detail["result_image_path"] == first_detail["result_image_path"]
+    
+    def test_invalid_image_rejected(self, client, sample_garment_image):
+        """Test that non-image uploads are rejected."""
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files={
+                "person_image": ("person.jpg", b"not an image", "image/jpeg"),
+                "garment_image": ("garment.jpg", sample_garment_image.getvalue(), "image/jpeg"),
+            }
+        )
+        assert response.status_code == 400
+    
+    def test_get_missing_request(self, client):
+        """Test 404 for unknown request IDs."""
+        response = client.get(f"{settings.API_V1_STR}/tryon/999999")
+        assert response.status_code == 404
+    
+    def test_status_poll_etag(self, client, sample_person_image, sample_garment_image):
+        """Test that unchanged polls are answered with 304."""
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image)
+        )
+        request_id = response.json()["request_id"]
+        _wait_for_status(client, request_id)
+        
+        url = f"{settings.API_V1_STR}/tryon/{request_id}"
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.json()["status"] == "completed"
+        etag = first.headers["etag"]
+        
+        unchanged = client.get(url, headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.headers["etag"] == etag
+        
+        assert client.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
+    
+    def test_status_stream_sse(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that the SSE stream ends with the terminal status."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "front"}
+        )
+        request_id = response.json()["request_id"]
+        
+        events = []
+        with client.stream("GET", f"{settings.API_V1_STR}/tryon/{request_id}/events") as stream:
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            for line in stream.iter_lines():
+                if line.startswith("data: "):
+                    events.append(json.loads(line[len("data: "):]))
+        
+        assert events[-1]["status"] == "completed"
+        assert events[-1]["request_id"] == request_id
+        assert events[-1]["result_image_url"].startswith("/uploads/results/")
+    
+    def test_status_stream_websocket(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that the WebSocket pushes events until completion."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "side"}
+        )
+        request_id = response.json()["request_id"]
+        
+        with client.websocket_connect(f"{settings.API_V1_STR}/tryon/{request_id}/ws") as ws:
+            event = ws.receive_json()
+            while event["status"] not in ("completed", "failed"):
+                event = ws.receive_json()
+        
+        assert event["status"] == "completed"
+    
+    def test_status_stream_not_found(self, client):
+        """Test streaming an unknown request returns 404."""
+        response = client.get(f"{settings.API_V1_STR}/tryon/999999/events")
+        assert response.status_code == 404
+    
+    def test_sync_returns_image(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that a fast sync request returns the result image itself."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/sync",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "front"}
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert response.content.startswith(b"\xff\xd8")
+        request_id = int(response.headers["x-request-id"])
+        assert _wait_for_status(client, request_id)["status"] == "completed"
+    
+    def test_sync_falls_back_after_deadline(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that a sync request past its deadline returns 202 and keeps running."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/sync",
+            files=_files(sample_person_image, sample_garment_image),
+            data={"pose": "front", "timeout": "0.001"}
+        )
+        
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] in ("pending", "processing")
+        assert _wait_for_status(client, body["request_id"])["status"] == "completed"
+    
+    def test_batch_tryon_reports_aggregate_progress(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test that a batch runs one child per garment and aggregates their progress."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        garment = sample_garment_image.getvalue()
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/batch",
+            files=[
+                ("person_image", ("person.jpg", sample_person_image.getvalue(), "image/jpeg")),
+                ("garment_images", ("a.jpg", garment, "image/jpeg")),
+                ("garment_images", ("b.jpg", garment, "image/jpeg")),
+            ],
+            data={"pose": "front"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 2
+        assert len({item["request_id"] for item in body["items"]}) == 2
+        
+        deadline = time.monotonic() + 10.0
+        while body["progress"] < 1.0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            body = client.get(f"{settings.API_V1_STR}/tryon/batch/{body['batch_id']}").json()
+        
+        assert body["status"] == "completed"
+        assert body["completed"] == 2
+        assert all(item["result_image_url"] for item in body["items"])
+    
+    def test_batch_tryon_validation(self, client, sample_person_image, monkeypatch):
+        """Test batch limits and unknown catalog garments."""
+        person = ("person.jpg", sample_person_image.getvalue(), "image/jpeg")
+        
+        response = client.post(f"{settings.API_V1_STR}/tryon/batch", files={"person_image": person})
+        assert response.status_code == 400
+        
+        monkeypatch.setattr(settings, "BATCH_TRYON_MAX_ITEMS", 1)
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/batch",
+            files={"person_image": person},
+            data={"garment_ids": ["1", "2"]}
+        )
+        assert response.status_code == 400
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/batch",
+            files={"person_image": person},
+            data={"garment_ids": ["999999"]}
+        )
+        assert response.status_code == 404
+        
+        assert client.get(f"{settings.API_V1_STR}/tryon/batch/999999").status_code == 404
+    
+    def test_result_image_renditions(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test sized result downloads with ETag revalidation."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image)
+        )
+        request_id = response.json()["request_id"]
+        assert _wait_for_status(client, request_id)["status"] == "completed"
+        
+        url = f"{settings.API_V1_STR}/tryon/{request_id}/image"
+        thumb = client.get(url, params={"size": "thumb"})
+        assert thumb.status_code == 200
+        assert thumb.headers["content-type"] == "image/jpeg"
+        assert "max-age" in thumb.headers["cache-control"]
+        full = client.get(url)
+        assert len(thumb.content) < len(full.content)
+        
+        etag = thumb.headers["etag"]
+        revalidated = client.get(url, params={"size": "thumb"}, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        
+        webp = client.get(url, params={"size": "preview", "format": "webp"})
+        assert webp.status_code == 200
+        assert webp.headers["content-type"] == "image/webp"
+        
+        assert client.get(url, params={"size": "huge"}).status_code == 400
+        assert client.get(f"{settings.API_V1_STR}/tryon/999999/image").status_code == 404
+    
+    def test_result_url_is_immutable(
+        self, client, sample_person_image, sample_garment_image, monkeypatch
+    ):
+        """Test result delivery headers, conditional and range requests."""
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        
+        response = client.post(
+            f"{settings.API_V1_STR}/tryon/",
+            files=_files(sample_person_image, sample_garment_image)
+        )
+        detail = _wait_for_status(client, response.json()["request_id"])
+        url = f"/uploads/results/{detail['result_image_path'].rsplit('/', 1)[-1]}"
+        
+        full = client.get(url)
+        assert full.status_code == 200
+        assert "immutable" in full.headers["cache-control"]
+        assert full.content.startswith(b"\xff\xd8")
+        
+        assert client.get(url, headers={"If-None-Match": full.headers["etag"]}).status_code == 304
+        
+        partial = client.get(url, headers={"Range": "bytes=0-1"})
+        assert partial.status_code == 206
+        assert partial.content == b"\xff\xd8"
+        
+        # Only results are public
+        person = detail["user_image_path"].rsplit("/", 1)[-1]
+        assert client.get(f"/uploads/persons/{person}").status_code == 404
+        assert client.get("/uploads/results/..%2Fpersons%2Fx.jpg").status_code == 404
+    
+    def test_list_pages_by_cursor(self, client, sample_person_image, sample_garment_image):
+        """Test that listings chain pages through the next cursor."""
+        for _ in range(3):
+            client.post(
+                f"{settings.API_V1_STR}/tryon/",
+                files=_files(sample_person_image, sample_garment_image),
+                data={"pose": "front"}
+            )
+        
+        seen = []
+        url = f"{settings.API_V1_STR}/tryon/?limit=2&pose=front"
+        while True:
+            response = client.get(url)
+            assert response.status_code == 200
+            page = response.json()
+            assert all(item["pose"] == "front" for item in page)
+            seen.extend(item["id"] for item in page)
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+            assert 'rel="next"' in response.headers["link"]
+            url = f"{settings.API_V1_STR}/tryon/?limit=2&pose=front&after={cursor}"
+        
+        assert len(seen) >= 3
+        assert seen == sorted(set(seen), reverse=True)
+        
+        assert client.get(f"{settings.API_V1_STR}/tryon/?after=bogus").status_code == 400
+        assert client.get(f"{settings.API_V1_STR}/tryon/?status=nope").status_code == 422
+        
+        # An offset on top of a cursor would silently skip rows
+        first = client.get(f"{settings.API_V1_STR}/tryon/?limit=1").headers["x-next-cursor"]
+        response = client.get(f"{settings.API_V1_STR}/tryon/?skip=1&after={first}")
+        assert response.status_code == 400
+        assert client.get(f"{settings.API_V1_STR}/api-keys/?skip=1&after={first}").status_code == 400
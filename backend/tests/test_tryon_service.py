@@ -3,7 +3,10 @@
 import pytest
 from PIL import Image
 import os
+import numpy as np
 
+from app.services.model_backends import PlaceholderBackend
+from app.services.person_cache import PersonFeatureCache
 from app.services.tryon_service import VirtualTryOnService
 from app.utils.image_processing import ImageProcessor
 
@@ -63,3 +66,119 @@ class TestVirtualTryOnService:
         
         # For MVP, this always returns True
         assert service.validate_person_pose("dummy_path.jpg", "front") is True
+    
+    def test_process_tryon_batch_isolates_failures(
+        self, sample_person_image, sample_garment_image, test_upload_dir
+    ):
+        """Test that one bad job does not fail the rest of the batch."""
+        service = VirtualTryOnService()
+        
+        person_path = f"{test_upload_dir}/persons/person.jpg"
+        garment_path = f"{test_upload_dir}/garments/garment.jpg"
+        
+        ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+        ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+        
+        results = service.process_tryon_batch([
+            (person_path, garment_path, "front", f"{test_upload_dir}/results/a.jpg"),
+            (person_path, garment_path, "invalid_pose", f"{test_upload_dir}/results/b.jpg"),
+            (person_path, garment_path, "side", f"{test_upload_dir}/results/c.jpg"),
+        ])
+        
+        assert [success for success, _, _ in results] == [True, False, True]
+        assert "Unsupported pose" in results[1][1]
+        
+        result_img = Image.open(f"{test_upload_dir}/results/a.jpg")
+        assert result_img.size == (384 * 2 + 20, 512)
+    
+    def test_process_tryon_batch_decodes_shared_person_once(
+        self, sample_person_image, sample_garment_image, test_upload_dir
+    ):
+        """Test that a person photo shared across a batch is decoded once."""
+        service = VirtualTryOnService()
+        
+        person_path = f"{test_upload_dir}/persons/person.jpg"
+        garment_path = f"{test_upload_dir}/garments/garment.jpg"
+        
+        ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+        ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+        
+        loaded = []
+        load_input_tensor = service._load_input_tensor
+        
+        def counting_load(path, out=None):
+            loaded.append(path)
+            return load_input_tensor(path, out=out)
+        
+        service._load_input_tensor = counting_load
+        results = service.process_tryon_batch([
+            (person_path, garment_path, "front", f"{test_upload_dir}/results/{i}.jpg")
+            for i in range(3)
+        ])
+        
+        assert all(success for success, _, _ in results)
+        assert loaded.count(person_path) == 1
+        
+        first = np.asarray(Image.open(f"{test_upload_dir}/results/0.jpg"))
+        last = np.asarray(Image.open(f"{test_upload_dir}/results/2.jpg"))
+        np.testing.assert_array_equal(first, last)
+    
+    def test_person_features_reused_across_requests(
+        self, sample_person_image, sample_garment_image, test_upload_dir
+    ):
+        """Test that later requests for the same person skip decoding and pose checks."""
+        person_cache = PersonFeatureCache(max_bytes=64 * 1024 * 1024, ttl=60)
+        service = VirtualTryOnService(person_cache=person_cache)
+        
+        person_path = f"{test_upload_dir}/persons/person.jpg"
+        garment_path = f"{test_upload_dir}/garments/garment.jpg"
+        
+        ImageProcessor.save_uploaded_image(sample_person_image.read(), person_path)
+        ImageProcessor.save_uploaded_image(sample_garment_image.read(), garment_path)
+        
+        loaded = []
+        pose_checks = []
+        load_input_tensor = service._load_input_tensor
+        validate_person_pose = service.validate_person_pose
+        
+        def counting_load(path, out=None):
+            loaded.append(path)
+            return load_input_tensor(path, out=out)
+        
+        def counting_validate(path, pose):
+            pose_checks.append(pose)
+            return validate_person_pose(path, pose)
+        
+        service._load_input_tensor = counting_load
+        service.validate_person_pose = counting_validate
+        for i, pose in enumerate(["front", "front", "side"]):
+            success, _, _ = service.process_tryon(
+                person_path, garment_path, pose, f"{test_upload_dir}/results/{i}.jpg"
+            )
+            assert success is True
+        
+        assert loaded.count(person_path) == 1
+        assert pose_checks == ["front", "side"]
+        assert service.person_cache.stats()["hits"] == 2
+    
+    def test_placeholder_composite_matches_reference(self):
+        """Test the in-place composite against the straightforward NumPy version."""
+        rng = np.random.default_rng(0)
+        person = rng.random((2, 3, 1024, 768), dtype=np.float32)
+        garment = rng.random((2, 3, 1024, 768), dtype=np.float32)
+        
+        expected = np.ones((2, 3, 512, 788), dtype=np.float32)
+        expected[:, :, :, :384] = person.reshape(2, 3, 512, 2, 384, 2).mean(axis=(3, 5))
+        expected[:, :, :, 404:] = garment.reshape(2, 3, 512, 2, 384, 2).mean(axis=(3, 5))
+        
+        actual = PlaceholderBackend.composite(person, garment)
+        
+        np.testing.assert_allclose(actual, expected, atol=1e-6)
+    
+    def test_to_uint8_nhwc_matches_reference(self):
+        """Test the fused output conversion against clip/astype/transpose."""
+        output = np.random.default_rng(1).uniform(-0.1, 1.1, (2, 3, 8, 6)).astype(np.float32)
+        
+        expected = np.clip(output * 255.0 + 0.5, 0, 255).astype(np.uint8).transpose(0, 2, 3, 1)
+        
+        np.testing.assert_array_equal(VirtualTryOnService._to_uint8_nhwc(output), expected)
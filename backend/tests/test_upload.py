@@ -0,0 +1,58 @@
+"""Tests for streaming upload ingestion."""
+
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils.upload import (
+    UploadTooLargeError,
+    UnsupportedImageError,
+    sniff_image_format,
+    stage_upload,
+)
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="upload.jpg")
+
+
+class TestStageUpload:
+    """Test streaming upload staging."""
+    
+    def test_sniff_image_format(self, sample_person_image):
+        """Test header-based format detection."""
+        assert sniff_image_format(sample_person_image.read(16)) == "JPEG"
+        assert sniff_image_format(b"\x89PNG\r\n\x1a\n....") == "PNG"
+        assert sniff_image_format(b"GIF89a") is None
+    
+    async def test_stage_upload(self, sample_person_image, tmp_path):
+        """Test that uploads are written to disk with their hash."""
+        data = sample_person_image.read()
+        
+        staged = await stage_upload(_upload(data), len(data), str(tmp_path), chunk_size=1024)
+        
+        assert staged.size == len(data)
+        assert staged.content_hash == hashlib.sha256(data).hexdigest()
+        assert staged.image_format == "JPEG"
+        with open(staged.path, "rb") as f:
+            assert f.read() == data
+        
+        staged.discard()
+        assert not os.path.exists(staged.path)
+    
+    async def test_size_limit_enforced_while_streaming(self, sample_person_image, tmp_path):
+        """Test that oversized uploads are rejected and cleaned up."""
+        data = sample_person_image.read()
+        
+        with pytest.raises(UploadTooLargeError):
+            await stage_upload(_upload(data), len(data) - 1, str(tmp_path), chunk_size=1024)
+        assert os.listdir(tmp_path) == []
+    
+    async def test_non_image_rejected(self, tmp_path):
+        """Test that non-image uploads are rejected from their header."""
+        with pytest.raises(UnsupportedImageError):
+            await stage_upload(_upload(b"not an image"), 1024, str(tmp_path))
+        assert os.listdir(tmp_path) == []
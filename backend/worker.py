@@ -0,0 +1,48 @@
+"""Entry point for running a standalone try-on worker process."""
+
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.services import (
+    api_key_index,
+    db_service,
+    inference_executor,
+    status_writer,
+    TryOnWorker,
+)
+
+
+async def main():
+    """Claim and process try-on jobs until interrupted."""
+    await db_service.init_db()
+    inference_executor.start()
+    if settings.MODEL_PRELOAD:
+        await inference_executor.load_models()
+    # Fair-share weights of API keys
+    await api_key_index.start()
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    
+    worker = TryOnWorker()
+    try:
+        await worker.run_forever(stop)
+    finally:
+        await inference_executor.shutdown()
+        await status_writer.shutdown()
+        await api_key_index.shutdown()
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if settings.JOB_QUEUE_MODE != "worker":
+        logging.warning(
+            "JOB_QUEUE_MODE is %r; set it to 'worker' for the API as well "
+            "so jobs are left for worker processes", settings.JOB_QUEUE_MODE
+        )
+    asyncio.run(main())
@@ -2,38 +2,44 @@
 
 import { useEffect, useState } from 'react'
 import styles from './ResultDisplay.module.css'
-import { getTryOnRequest } from '@/services/api'
+import {
+  getTryOnRequest,
+  resultImageSrc,
+  subscribeToTryOnStatus,
+  TryOnStatusEvent,
+} from '@/services/api'
 
 interface ResultDisplayProps {
   requestId: number
 }
 
-interface TryOnResult {
-  id: number
-  status: string
-  result_image_path: string | null
-  error_message: string | null
-  processing_time: number | null
-}
-
 export default function ResultDisplay({ requestId }: ResultDisplayProps) {
-  const [result, setResult] = useState<TryOnResult | null>(null)
+  const [result, setResult] = useState<TryOnStatusEvent | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    let interval: NodeJS.Timeout
+    let interval: NodeJS.Timeout | undefined
+
+    const handleEvent = (event: TryOnStatusEvent) => {
+      setResult(event)
+      if (event.status === 'completed' || event.status === 'failed') {
+        setLoading(false)
+        if (interval) clearInterval(interval)
+      }
+    }
 
     const fetchResult = async () => {
       try {
         const data = await getTryOnRequest(requestId)
-        setResult(data)
-        
-        // If completed or failed, stop polling
-        if (data.status === 'completed' || data.status === 'failed') {
-          setLoading(false)
-          if (interval) clearInterval(interval)
-        }
+        const fileName = data.result_image_path?.split('/').pop()
+        handleEvent({
+          request_id: data.id,
+          status: data.status,
+          result_image_url: fileName ? `/uploads/results/${fileName}` : null,
+          error_message: data.error_message,
+          processing_time: data.processing_time,
+        })
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to fetch result')
         setLoading(false)
@@ -41,13 +47,14 @@ export default function ResultDisplay({ requestId }: ResultDisplayProps) {
       }
     }
 
-    // Initial fetch
-    fetchResult()
-
-    // Poll every 2 seconds while processing
-    interval = setInterval(fetchResult, 2000)
+    // Status changes are pushed by the server; poll only if streaming fails
+    const unsubscribe = subscribeToTryOnStatus(requestId, handleEvent, () => {
+      fetchResult()
+      interval = setInterval(fetchResult, 2000)
+    })
 
     return () => {
+      unsubscribe()
       if (interval) clearInterval(interval)
     }
   }, [requestId])
@@ -83,10 +90,10 @@ export default function ResultDisplay({ requestId }: ResultDisplayProps) {
         </div>
       )}
 
-      {result.status === 'completed' && result.result_image_path && (
+      {result.status === 'completed' && result.result_image_url && (
         <div className={styles.resultImage}>
           <img
-            src={`http://localhost:8000/${result.result_image_path}`}
+            src={resultImageSrc(result.result_image_url)}
             alt="Try-on result"
           />
           {result.processing_time && (
@@ -2,6 +2,8 @@ import axios from 'axios'
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1'
 
+export type TryOnPriority = 'interactive' | 'standard' | 'bulk'
+
 export interface TryOnResponse {
   request_id: number
   status: string
@@ -16,6 +18,7 @@ export interface TryOnRequestDetail {
   garment_image_path: string
   result_image_path: string | null
   pose: string
+  priority: TryOnPriority
   status: string
   created_at: string
   updated_at: string
@@ -23,15 +26,62 @@ export interface TryOnRequestDetail {
   processing_time: number | null
 }
 
+export interface TryOnStatusEvent {
+  request_id: number
+  status: string
+  result_image_url: string | null
+  error_message: string | null
+  processing_time: number | null
+}
+
+const TERMINAL_STATUSES = ['completed', 'failed']
+
+/**
+ * Receive status changes of a try-on request as they happen.
+ *
+ * The server sends the current status first and closes the stream after
+ * `completed` or `failed`. Returns a function that stops listening.
+ */
+export function subscribeToTryOnStatus(
+  requestId: number,
+  onEvent: (event: TryOnStatusEvent) => void,
+  onError?: (error: Event) => void
+): () => void {
+  const source = new EventSource(`${API_BASE_URL}/tryon/${requestId}/events`)
+
+  source.addEventListener('status', (message) => {
+    const event: TryOnStatusEvent = JSON.parse((message as MessageEvent).data)
+    onEvent(event)
+    if (TERMINAL_STATUSES.includes(event.status)) {
+      source.close()
+    }
+  })
+
+  source.onerror = (error) => {
+    source.close()
+    onError?.(error)
+  }
+
+  return () => source.close()
+}
+
+/** Absolute URL for a `result_image_url` returned by the API. */
+export function resultImageSrc(resultImageUrl: string): string {
+  return `${new URL(API_BASE_URL).origin}${resultImageUrl}`
+}
+
 export async function createTryOnRequest(
   personImage: File,
   garmentImage: File,
-  pose: string
+  pose: string,
+  // The shopper is waiting on this result
+  priority: TryOnPriority = 'interactive'
 ): Promise<TryOnResponse> {
   const formData = new FormData()
   formData.append('person_image', personImage)
   formData.append('garment_image', garmentImage)
   formData.append('pose', pose)
+  formData.append('priority', priority)
 
   const response = await axios.post<TryOnResponse>(
     `${API_BASE_URL}/tryon/`,